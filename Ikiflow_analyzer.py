@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QFrame, QScrollArea, QPushButton, QApplication)
 from PySide6.QtCore import Qt, Signal, QRectF
 from PySide6.QtGui import QColor, QPainter, QPen, QFont
+from Ikiflow_session import fold_events
+from Ikiflow_theme import apply_theme
 
 # --- 0. DESIGN SYSTEM CONSTANTS ---
 ACCENT       = "#0984E3"  # Ikiflow Blue
@@ -52,9 +54,11 @@ class AnalyzerData:
 
     def get_stats(self):
         data = self.load_data()
-        if not data: return {"streak": 0, "total_hours": 0.0, "daily_avg": 0, "consistency": 0}
+        if not data: return {"streak": 0, "total_hours": 0.0, "daily_avg": 0, "consistency": 0,
+                          "paused_hours": 0.0, "extended_mins": 0}
 
-        total_mins = sum(entry.get("focus_actual", 0) for entry in data)
+        totals = self.get_focus_totals(data)
+        total_mins = totals["focus_s"] / 60
         dates = set(entry.get("date") for entry in data)
         avg = total_mins / len(dates) if dates else 0
 
@@ -73,9 +77,28 @@ class AnalyzerData:
             "streak": streak,
             "total_hours": round(total_mins / 60, 1),
             "daily_avg": int(avg),
-            "consistency": consistency
+            "consistency": consistency,
+            "paused_hours": round(totals["paused_s"] / 3600, 1),
+            "extended_mins": int(totals["extended_s"] // 60),
         }
 
+    def get_focus_totals(self, data=None):
+        """
+        Focus / pause / extension totals in one pass over history.
+        Sessions with an event log are folded; older entries only have minutes.
+        """
+        if data is None: data = self.load_data()
+        totals = {"focus_s": 0.0, "paused_s": 0.0, "extended_s": 0, "pauses": 0, "extensions": 0}
+        for entry in data:
+            events = entry.get("events")
+            if not events:
+                totals["focus_s"] += entry.get("focus_actual", 0) * 60
+                continue
+            folded = fold_events(events)
+            for key in totals:
+                totals[key] += folded[key]
+        return totals
+
     def get_month_map(self, year, month):
         data = self.load_data()
         prefix = f"{year}-{month:02d}"
@@ -119,24 +142,24 @@ class StatCard(QFrame):
     def __init__(self, title, value, icon_char):
         super().__init__()
         self.setFixedSize(160, 80)
-        self.setStyleSheet(f"QFrame {{ background-color: {BG_CARD}; border-radius: 12px; border: 1px solid {BORDER_SOFT}; }}")
+        self.setObjectName("StatCard")  # Styles live in Ikiflow_theme
         
         l = QVBoxLayout(self)
         l.setContentsMargins(15, 10, 15, 10)
         
         h = QHBoxLayout()
         t = QLabel(title.upper())
-        t.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 9px; font-weight: 700; letter-spacing: 1px; border: none;")
+        t.setObjectName("StatTitle")
         
         i = QLabel(icon_char)
-        i.setStyleSheet(f"color: {ACCENT_FADE}; font-size: 28px; border: none;")
+        i.setObjectName("StatIcon")
         
         h.addWidget(t)
         h.addStretch()
         h.addWidget(i)
         
         v = QLabel(str(value))
-        v.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 24px; font-weight: 900; border: none; background: transparent;")
+        v.setObjectName("StatValue")
         
         l.addLayout(h)
         l.addWidget(v)
@@ -147,10 +170,8 @@ class ExpandableSessionItem(QFrame):
         self.session = session
         self.is_expanded = False
         
-        self.setStyleSheet(f"""
-            QFrame {{ background: {BG_CARD}; border: 1px solid {BORDER_SOFT}; border-radius: 8px; }}
-            QFrame:hover {{ border: 1px solid {ACCENT}; }}
-        """)
+        self.setObjectName("SessionItem")
+        self.setProperty("expanded", False)
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(15, 12, 15, 12)
@@ -158,32 +179,32 @@ class ExpandableSessionItem(QFrame):
 
         # --- A. HEADER ---
         self.header = QWidget()
-        self.header.setStyleSheet("border:none;")
         hl = QHBoxLayout(self.header)
         hl.setContentsMargins(0, 0, 0, 0)
         
         ts = datetime.fromisoformat(self.session["timestamp"])
         lbl_time = QLabel(ts.strftime("%I:%M %p"))
-        lbl_time.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 13px; font-weight: 800; border: none;")
+        lbl_time.setObjectName("SessionTime")
         
         planned = self.session.get("focus_planned", 1)
         actual = self.session.get("focus_actual", 0)
         ratio = actual / planned if planned > 0 else 0
         
         status_text = "GOOD"
-        status_col = SUCCESS
+        status_key = "good"
         if ratio < 0.6: 
             status_text = "DISTRACTED"
-            status_col = WARNING
+            status_key = "distracted"
         elif ratio >= 1.0:
             status_text = "DEEP FOCUS"
-            status_col = ACCENT
+            status_key = "deep"
 
         lbl_stat = QLabel(status_text)
-        lbl_stat.setStyleSheet(f"color: {status_col}; font-size: 9px; font-weight: 800; border: 1px solid {status_col}; border-radius: 4px; padding: 2px 6px;")
+        lbl_stat.setObjectName("SessionStatus")
+        lbl_stat.setProperty("status", status_key)
         
         self.arrow = QLabel("▼")
-        self.arrow.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 10px; border: none;")
+        self.arrow.setObjectName("SessionArrow")
         
         hl.addWidget(lbl_time)
         hl.addSpacing(10)
@@ -194,12 +215,11 @@ class ExpandableSessionItem(QFrame):
 
         # --- B. DETAILS ---
         self.details = QWidget()
-        self.details.setStyleSheet("border:none;")
         dl = QVBoxLayout(self.details)
         dl.setContentsMargins(0, 10, 0, 0)
         
         gf = QFrame()
-        gf.setStyleSheet(f"background: {BG_SOFT}; border-radius: 6px; border: none;")
+        gf.setObjectName("SessionStats")
         g = QHBoxLayout(gf)
         g.setContentsMargins(10, 10, 10, 10)
         
@@ -212,9 +232,9 @@ class ExpandableSessionItem(QFrame):
             vl = QVBoxLayout(c)
             vl.setContentsMargins(0,0,0,0)
             t = QLabel(l)
-            t.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 9px; border: none;")
+            t.setObjectName("SessionStatCaption")
             val = QLabel(v)
-            val.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 12px; font-weight: bold; border: none;")
+            val.setObjectName("SessionStatValue")
             vl.addWidget(t)
             vl.addWidget(val)
             return c
@@ -229,7 +249,7 @@ class ExpandableSessionItem(QFrame):
         apps = self.session.get("app_usage", {})
         if apps:
             la = QLabel("APP USAGE & IDLE TIME")
-            la.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 9px; font-weight: bold; margin-top: 5px;")
+            la.setObjectName("UsageCaption")
             dl.addWidget(la)
 
             cleaned_apps = {}
@@ -260,24 +280,23 @@ class ExpandableSessionItem(QFrame):
                 row = QHBoxLayout()
                 nl = QLabel(n[:22])
                 nl.setFixedWidth(110)
-                nl.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+                nl.setObjectName("UsageName")
                 
                 bar_bg = QFrame()
                 bar_bg.setFixedHeight(4)
-                bar_bg.setStyleSheet(f"background: {BORDER_SOFT}; border-radius: 2px;")
+                bar_bg.setObjectName("UsageTrack")
                 
                 bar_fill = QFrame(bar_bg)
                 bar_fill.setFixedHeight(4)
-                
-                bar_col = "rgba(100, 100, 100, 0.4)" if "Idle" in n else f"rgba(9, 132, 227, 0.6)"
-                bar_fill.setStyleSheet(f"background: {bar_col}; border-radius: 2px;")
+                bar_fill.setObjectName("UsageFill")
+                bar_fill.setProperty("idle", "Idle" in n)
                 
                 width_pct = (sec / max_v)
                 bar_fill.setFixedWidth(int(width_pct * 100))
                 
                 mins = sec // 60
                 tl = QLabel(f"{mins}m")
-                tl.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 10px;")
+                tl.setObjectName("UsageTime")
                 
                 row.addWidget(nl)
                 row.addWidget(bar_bg, 1)
@@ -291,15 +310,17 @@ class ExpandableSessionItem(QFrame):
         if self.is_expanded:
             self.details.hide()
             self.arrow.setText("▼")
-            self.setStyleSheet(f"QFrame {{ background: {BG_CARD}; border: 1px solid {BORDER_SOFT}; border-radius: 8px; }} QFrame:hover {{ border: 1px solid {ACCENT}; }}")
             self.layout.setSpacing(0)
         else:
             self.details.show()
             self.arrow.setText("▲")
-            self.setStyleSheet(f"QFrame {{ background: {BG_CARD}; border: 1px solid {ACCENT}; border-radius: 8px; }}")
             self.layout.setSpacing(8)
             
         self.is_expanded = not self.is_expanded
+        # Border follows the [expanded] property; re-polish just this row
+        self.setProperty("expanded", self.is_expanded)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
 class MonthGrid(QWidget):
     dayClicked = Signal(str)
@@ -459,7 +480,7 @@ class Timeline(QWidget):
         sessions = self.engine.get_sessions_for_date(date_str)
         if not sessions:
             lbl = QLabel("No sessions for this day.")
-            lbl.setStyleSheet(f"color: {TEXT_QUIET}; font-style: italic; margin-top: 20px; border: none;")
+            lbl.setObjectName("EmptyNote")
             lbl.setAlignment(Qt.AlignCenter)
             self.layout.addWidget(lbl)
             return
@@ -476,8 +497,8 @@ class AnalyzerWindow(QWidget):
         # USE DEFAULT WINDOW FLAGS (Native Title Bar)
         self.setWindowFlags(Qt.Window) 
         
-        # Set background color for the whole window
-        self.setStyleSheet(f"background-color: {BG_SOFT};")
+        # Background (and every other rule) comes from the app-level theme
+        self.setObjectName("AnalyzerWindow")
 
         self.engine = AnalyzerData()
         self.current_month_date = datetime.now()
@@ -492,26 +513,13 @@ class AnalyzerWindow(QWidget):
         # --- HEADER ROW ---
         h_row = QHBoxLayout()
         title = QLabel("Reflection")
-        title.setStyleSheet(f"font-size: 24px; font-weight: 800; color: {TEXT_MAIN};")
+        title.setObjectName("AnalyzerTitle")
         
         # Toggle Button (Floating vs Full)
         self.btn_toggle = QPushButton("⧉ Restore")
         self.btn_toggle.setFixedSize(90, 30)
         self.btn_toggle.setCursor(Qt.PointingHandCursor)
-        self.btn_toggle.setStyleSheet(f"""
-            QPushButton {{
-                background: {BG_CARD};
-                color: {TEXT_DIM};
-                font-size: 11px;
-                font-weight: bold;
-                border: 1px solid {BORDER_SOFT};
-                border-radius: 6px;
-            }}
-            QPushButton:hover {{
-                border: 1px solid {ACCENT};
-                color: {ACCENT};
-            }}
-        """)
+        self.btn_toggle.setObjectName("ModeToggle")
         self.btn_toggle.clicked.connect(self.toggle_mode)
 
         h_row.addWidget(title)
@@ -527,10 +535,15 @@ class AnalyzerWindow(QWidget):
         stat_row.addWidget(StatCard("Consistency", f"{stats['consistency']}%", "⚡"))
         stat_row.addStretch()
         self.layout.addLayout(stat_row)
+
+        # From the session event logs: time the timer wasn't counting as focus
+        pauses = QLabel(f"⏸ {stats['paused_hours']}h paused   ·   +{stats['extended_mins']}m extended")
+        pauses.setObjectName("StatFootnote")
+        self.layout.addWidget(pauses)
         
         line = QFrame()
         line.setFixedHeight(1)
-        line.setStyleSheet(f"background: {BORDER_SOFT}; margin: 5px 0;")
+        line.setObjectName("Divider")
         self.layout.addWidget(line)
 
         # --- MAIN CONTENT ---
@@ -542,7 +555,7 @@ class AnalyzerWindow(QWidget):
         month_nav = QHBoxLayout()
         self.btn_prev_m = self.create_nav_btn("<", self.prev_month)
         self.lbl_month = QLabel()
-        self.lbl_month.setStyleSheet(f"font-weight: bold; font-size: 14px; color: {TEXT_MAIN};")
+        self.lbl_month.setObjectName("MonthLabel")
         self.btn_next_m = self.create_nav_btn(">", self.next_month)
         month_nav.addWidget(self.btn_prev_m)
         month_nav.addStretch()
@@ -559,14 +572,14 @@ class AnalyzerWindow(QWidget):
         week_container.setSpacing(5)
         
         lbl_w_title = QLabel("WEEKLY FLOW")
-        lbl_w_title.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 10px; font-weight: bold; letter-spacing: 1px;")
+        lbl_w_title.setObjectName("SectionCaption")
         week_container.addWidget(lbl_w_title)
         
         week_nav = QHBoxLayout()
         self.btn_prev_w = self.create_nav_btn("<", self.prev_week)
         
         self.lbl_week_range = QLabel()
-        self.lbl_week_range.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 12px; font-weight: bold;")
+        self.lbl_week_range.setObjectName("WeekRange")
         self.lbl_week_range.setAlignment(Qt.AlignCenter)
 
         self.btn_next_w = self.create_nav_btn(">", self.next_week)
@@ -580,7 +593,7 @@ class AnalyzerWindow(QWidget):
         week_container.addWidget(self.chart)
         
         self.lbl_insight = QLabel("Loading...")
-        self.lbl_insight.setStyleSheet(f"color: {ACCENT}; font-size: 10px; font-weight: bold; margin-top: 5px;")
+        self.lbl_insight.setObjectName("Insight")
         self.lbl_insight.setAlignment(Qt.AlignCenter)
         week_container.addWidget(self.lbl_insight)
         
@@ -592,16 +605,16 @@ class AnalyzerWindow(QWidget):
         right_col = QVBoxLayout()
         
         self.lbl_day_header = QLabel("SESSION DETAIL")
-        self.lbl_day_header.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 14px; font-weight: 800; letter-spacing: 0.5px;")
+        self.lbl_day_header.setObjectName("DayHeader")
         right_col.addWidget(self.lbl_day_header)
         
         self.lbl_day_sub = QLabel("Select a day to view sessions")
-        self.lbl_day_sub.setStyleSheet(f"color: {TEXT_QUIET}; font-size: 11px; font-weight: bold; margin-bottom: 5px;")
+        self.lbl_day_sub.setObjectName("DaySub")
         right_col.addWidget(self.lbl_day_sub)
         
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background: transparent; border: none;")
+        scroll.setObjectName("SessionScroll")
         self.timeline = Timeline(self.engine)
         scroll.setWidget(self.timeline)
         right_col.addWidget(scroll)
@@ -645,10 +658,7 @@ class AnalyzerWindow(QWidget):
         b = QPushButton(text)
         b.setFixedSize(24, 24)
         b.setCursor(Qt.PointingHandCursor)
-        b.setStyleSheet(f"""
-            QPushButton {{ background: {BG_CARD}; border-radius: 12px; font-weight: bold; color: {TEXT_DIM}; border: 1px solid {BORDER_SOFT};}}
-            QPushButton:hover {{ background: #DFE6E9; color: {TEXT_MAIN}; }}
-        """)
+        b.setObjectName("NavButton")
         b.clicked.connect(func)
         return b
 
@@ -710,6 +720,7 @@ class AnalyzerWindow(QWidget):
 # --- 4. EXECUTION ---
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    apply_theme(app)
     window = AnalyzerWindow()
     window.show() # showMaximized is called inside init
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,23 +1,293 @@
 import os
-from PySide6.QtCore import QUrl
-from PySide6.QtMultimedia import QSoundEffect
-from Ikiflow_utils import resource_path       # Import the helper
+import math
+import time
+import wave
+from array import array
+from PySide6.QtCore import QObject, QTimer, QUrl
+from PySide6.QtMultimedia import (QSoundEffect, QMediaPlayer, QAudioOutput,
+                                  QAudioFormat, QAudioSink, QMediaDevices)
+from Ikiflow_utils import resource_path, data_dir       # Import the helper
+from Ikiflow_config import get_config
+
+try:
+    from Ikiflow_noise import NoiseGenerator, RingBuffer, COLORS as NOISE_COLORS
+except ImportError:  # No NumPy: fall back to the bundled noise.wav
+    NoiseGenerator = None
+    NOISE_COLORS = ("brown",)
+
+# --- Cue Sounds ---
+# Short chimes, synthesized once into Ikiflow_Data/cues (no assets to ship).
+# Each cue: [(frequency Hz, start ms, length ms)], mixed with a soft decay.
+
+CUE_VERSION = 1
+CUE_RATE = 22050
+CUES = {
+    "start":   [(523.25, 0, 260), (783.99, 120, 380)],                  # C5 -> G5, up
+    "checkin": [(659.25, 0, 220), (659.25, 260, 220), (880.0, 520, 420)],
+    "break":   [(783.99, 0, 300), (659.25, 140, 300), (523.25, 280, 520)],  # down, relax
+    "end":     [(392.0, 0, 600)],                                       # single low G4
+}
+
+def synth_cue(notes, rate=CUE_RATE, volume=0.35):
+    """16-bit mono PCM for a list of (freq, start_ms, length_ms) notes."""
+    total = max(start + length for _, start, length in notes) * rate // 1000
+    mix = [0.0] * total
+    for freq, start, length in notes:
+        first = start * rate // 1000
+        count = length * rate // 1000
+        step = 2 * math.pi * freq / rate
+        for i in range(count):
+            attack = min(1.0, i / (0.005 * rate))            # 5 ms fade-in, no click
+            decay = math.exp(-4.0 * i / count)
+            tail = min(1.0, (count - i) / (0.01 * rate))     # 10 ms fade-out
+            mix[first + i] += math.sin(step * i) * attack * decay * tail
+    peak = max(1.0, max(abs(v) for v in mix))
+    return array("h", (int(v / peak * volume * 32767) for v in mix))
+
+def cue_path(name):
+    folder = data_dir() / "cues"
+    folder.mkdir(exist_ok=True)
+    path = folder / f"{name}_v{CUE_VERSION}.wav"
+    if not path.exists():
+        tmp = path.with_suffix(".tmp")
+        with wave.open(str(tmp), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(CUE_RATE)
+            f.writeframes(synth_cue(CUES[name]).tobytes())
+        os.replace(tmp, path)
+    return path
+
+class CueBank(QObject):
+    """
+    Named cues (start/checkin/break/end), each preloaded into POOL
+    QSoundEffects at warm-up so a cue can overlap the ambient loop and
+    itself. play() never waits on a decode (or on the first-run synthesis):
+    a cue that isn't loaded yet plays as soon as it is (if that's within
+    LATE_S), else it's dropped.
+    """
+    POOL = 2
+    LATE_S = 0.25
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.effects = {}     # {name: [QSoundEffect]}
+        self.next = {}        # {name: round-robin index}
+        self.waiting = {}     # {name: asked-at}, cues asked for before they loaded
+        self.warm_pending = False
+        self.played = 0
+        self.late = 0
+        self.dropped = 0
+
+    def warm(self):
+        self.warm_pending = False
+        if self.effects: return
+        for name in CUES:
+            url = QUrl.fromLocalFile(str(cue_path(name)))
+            pool = []
+            for _ in range(self.POOL):
+                effect = QSoundEffect(self)
+                effect.setVolume(0.8)
+                effect.statusChanged.connect(lambda n=name: self.on_loaded(n))
+                effect.setSource(url)  # decodes in the background
+                pool.append(effect)
+            self.effects[name] = pool
+            self.next[name] = 0
+
+    def play(self, name):
+        if not get_config().get("sound_enabled"): return
+        if not self.effects:
+            # Cold (before the warmup queue): warm on the next loop turn, play when ready
+            self.waiting[name] = time.monotonic()
+            if not self.warm_pending:
+                self.warm_pending = True
+                QTimer.singleShot(0, self.warm)
+            return
+        pool = self.effects[name]
+        for _ in range(len(pool)):
+            effect = pool[self.next[name]]
+            self.next[name] = (self.next[name] + 1) % len(pool)
+            if effect.status() == QSoundEffect.Ready and not effect.isPlaying():
+                effect.play()
+                self.played += 1
+                return
+        if any(e.status() == QSoundEffect.Ready for e in pool):
+            # All busy: restart the oldest rather than stack up
+            effect = pool[self.next[name]]
+            effect.stop()
+            effect.play()
+            self.played += 1
+            return
+        self.waiting[name] = time.monotonic()
+
+    def on_loaded(self, name):
+        if name not in self.waiting: return
+        if not any(e.status() == QSoundEffect.Ready for e in self.effects[name]): return
+        asked = self.waiting.pop(name)
+        if time.monotonic() - asked > self.LATE_S:
+            self.dropped += 1  # a chime seconds after the fact is worse than none
+            return
+        self.late += 1
+        self.play(name)
+
+    def stats(self):
+        return {"cues": len(self.effects), "played": self.played,
+                "late": self.late, "dropped": self.dropped}
+
+# --- Ambient Player ---
+
+# What the browse dialog offers (whatever the platform's decoder handles)
+AMBIENT_FILTER = "Audio Files (*.wav *.mp3 *.ogg *.oga *.opus *.flac *.m4a *.aac *.wma)"
+
+class AmbientPlayer(QObject):
+    """
+    Looping background audio, streamed. QSoundEffect decoded the whole file
+    into memory (and only PCM WAV); QMediaPlayer decodes as it plays, so an
+    hour of compressed rain costs a few buffers, not hundreds of MB.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.output = QAudioOutput(self)
+        self.output.setVolume(0.5) # 50% volume
+        self.player = QMediaPlayer(self)
+        self.player.setAudioOutput(self.output)
+        self.player.setLoops(QMediaPlayer.Infinite)
+        self.player.errorOccurred.connect(self.on_error)
+        self.source = None
+
+    def load(self, path):
+        self.source = path
+        self.player.setSource(QUrl.fromLocalFile(path))
+
+    def play(self):
+        if self.source is None: return
+        self.player.play()
+
+    def stop(self):
+        self.player.stop()
+
+    def on_error(self, error, message=""):
+        print(f"Warning: ambient playback failed ({self.source}): {message or error}")
+
+# --- Generated Noise ---
+
+class NoiseStream(QObject):
+    """
+    Procedural noise (Ikiflow_noise) pushed into a QAudioSink: no file, no
+    loop point. The generator tops up a RING_MS ring buffer in BLOCK-sized
+    steps; every FEED_MS the sink gets whatever it has room for.
+    """
+    RATE = 44100
+    BLOCK = 1024
+    RING_MS = 500
+    FEED_MS = 20
+
+    def __init__(self, color="brown", parent=None):
+        super().__init__(parent)
+        self.color = color
+        self.generator = None
+        self.ring = RingBuffer(self.RATE * self.RING_MS // 1000)
+
+        self.format = QAudioFormat()
+        self.format.setSampleRate(self.RATE)
+        self.format.setChannelCount(1)
+        self.format.setSampleFormat(QAudioFormat.Int16)
+        self.sink = None
+        self.device = None
+
+        self.feed_timer = QTimer(self)
+        self.feed_timer.setInterval(self.FEED_MS)
+        self.feed_timer.timeout.connect(self.feed)
+
+        self.blocks = 0
+        self.gen_seconds = 0.0   # CPU spent in the generator
+
+    def start(self, color=None):
+        self.color = color or self.color
+        if self.generator is None or self.generator.color != self.color:
+            self.generator = NoiseGenerator(self.color, self.BLOCK)
+            self.ring.clear()  # don't play out the old colour first
+        if self.sink is None:
+            self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), self.format, self)
+            self.sink.setVolume(0.5) # 50% volume
+        self.fill()
+        self.device = self.sink.start()
+        self.feed()
+        self.feed_timer.start()
+
+    def stop(self):
+        self.feed_timer.stop()
+        if self.sink is not None:
+            self.sink.stop()
+        self.device = None
+
+    def fill(self):
+        while self.ring.free() >= self.BLOCK:
+            began = time.perf_counter()
+            self.ring.write(self.generator.block(self.BLOCK))
+            self.gen_seconds += time.perf_counter() - began
+            self.blocks += 1
+
+    def feed(self):
+        if self.device is None: return
+        room = self.sink.bytesFree() // 2   # int16 mono
+        if room:
+            self.device.write(self.ring.read(room))
+        self.fill()
+
+    def stats(self):
+        audio_s = self.blocks * self.BLOCK / self.RATE
+        return {"color": self.color, "audio_s": round(audio_s, 1),
+                "cpu_ms_per_audio_s": round(self.gen_seconds * 1000 / audio_s, 3) if audio_s else None,
+                "ring_bytes": self.ring.data.nbytes}
 
 # --- Sound Engine ---
 
 class SoundEngine:
     def __init__(self):
-        self.effect = QSoundEffect()
-        # FIX: Use -2 directly instead of QSoundEffect.Infinite
-        self.effect.setLoopCount(-2) 
-        self.effect.setVolume(0.5) # 50% volume
+        self.ambient = AmbientPlayer()
+
+        # Built-in noise is generated (NumPy) until the user picks a file
+        self.noise = NoiseStream() if NoiseGenerator else None
+        self.use_noise = self.noise is not None
+        self.builtin = "brown" if self.use_noise else None  # built-in colour, None for a file
+
+        # Cues have their own effects so they never cut the ambient loop
+        self.cues = CueBank()
+
+    def warm(self):
+        self.cues.warm()
 
     def load_sound(self, filename):
         path = resource_path(filename)
-        self.effect.setSource(QUrl.fromLocalFile(path))
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.ambient.load(path)
+        self.use_noise = False
+        self.builtin = None
+
+    def load_noise(self, color="brown"):
+        """Back to built-in noise: generated in that colour, or noise.wav (brown) without NumPy."""
+        if color not in NOISE_COLORS:
+            color = "brown"
+        if self.noise is None:
+            self.load_sound("noise.wav")
+        else:
+            self.noise.color = color  # new generator on the next start()
+            self.use_noise = True
+        self.builtin = color
 
     def play(self):
-        self.effect.play()
+        if self.use_noise:
+            self.noise.start()
+        else:
+            self.ambient.play()
 
     def stop(self):
-        self.effect.stop()
\ No newline at end of file
+        self.ambient.stop()
+        if self.noise is not None:
+            self.noise.stop()
+
+    def play_sound(self, name):
+        """One-shot cue on top of whatever ambient is playing."""
+        self.cues.play(name)
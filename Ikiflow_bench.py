@@ -0,0 +1,682 @@
+"""
+Ikiflow benchmarks / simulation harnesses.
+
+    python Ikiflow_bench.py drift --hours 8 [--tolerance 1e-6]
+    python Ikiflow_bench.py lifecycle --count 50000 [--min-rate 2000]
+    python Ikiflow_bench.py construct --repeat 20
+    python Ikiflow_bench.py paint --ticks 300
+    python Ikiflow_bench.py startup --repeat 5 [--silent] --out startup.json
+    python Ikiflow_bench.py noise --seconds 60
+    python Ikiflow_bench.py check
+
+drift, lifecycle and check exit non-zero when something is off, so they can gate a build.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from Ikiflow_timer import DeadlineTimer
+from Ikiflow_session import SessionMachine, fold_events, IDLE, FOCUS, CHECKIN, BREAK, START
+
+# --- 1. HELPERS ---
+
+class FakeClock:
+    """Manually advanced clock for deterministic simulations."""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def draw_stall(rng):
+    """Event-loop delay on one wakeup: usually a few ms, sometimes a dialog or sleep."""
+    roll = rng.random()
+    if roll < 0.0002: return rng.uniform(300, 3600)   # laptop lid closed
+    if roll < 0.003:  return rng.uniform(0.5, 8.0)    # modal dialog / save I/O
+    return rng.expovariate(1 / 0.004)
+
+def report(result, out=None):
+    text = json.dumps(result, indent=4)
+    print(text)
+    if out:
+        with open(out, "w") as f:
+            f.write(text)
+
+def speedup(before, after):
+    return round(before["median_ms"] / after["median_ms"], 2) if after["median_ms"] else None
+
+# --- 2. TIMER DRIFT ---
+
+def bench_drift(hours=8.0, seed=1):
+    """
+    Runs a multi-hour countdown through random stalls, sleeps, pauses and
+    extensions, and checks the remaining time against the ideal schedule on
+    every wakeup. The old "time_left -= 1 per tick" engine is simulated
+    with the same stall model for comparison.
+    """
+    rng = random.Random(seed)
+    clock = FakeClock()
+    timer = DeadlineTimer(clock)
+
+    total = hours * 3600
+    timer.start(total)
+    ideal_deadline = total
+    wakes = pauses = extends = 0
+    max_error = 0.0
+
+    while True:
+        clock.advance(timer.ms_to_next_second() / 1000 + draw_stall(rng))
+        wakes += 1
+
+        expected = max(0.0, ideal_deadline - clock.now)
+        max_error = max(max_error, abs(timer.remaining() - expected))
+        if timer.expired():
+            break
+
+        roll = rng.random()
+        if roll < 0.001:
+            pause = rng.uniform(30, 900)
+            timer.pause()
+            clock.advance(pause)
+            timer.resume()
+            ideal_deadline += pause
+            pauses += 1
+        elif roll < 0.0015:
+            timer.extend(300)
+            ideal_deadline += 300
+            extends += 1
+
+    # Legacy engine: a 1000 ms QTimer that loses every stall
+    legacy_rng = random.Random(seed)
+    legacy_wall = sum(1.0 + min(draw_stall(legacy_rng), 8.0) for _ in range(int(total)))
+
+    return {
+        "simulated_hours": hours,
+        "wakeups": wakes,
+        "pauses": pauses,
+        "extensions": extends,
+        "max_abs_error_s": max_error,
+        "end_detected_late_s": round(clock.now - ideal_deadline, 3),
+        "legacy_drift_s": round(legacy_wall - total, 1),
+    }
+
+# --- 3. SESSION LIFECYCLES ---
+
+TRANSITIONS_PER_LIFECYCLE = 9
+
+def bench_lifecycle(count=50000):
+    """
+    Full headless lifecycles: focus -> pause/resume -> check-in -> +5 ->
+    check-in -> break -> loop into focus -> stop (TRANSITIONS_PER_LIFECYCLE).
+    """
+    clock = FakeClock()
+    machine = SessionMachine(clock)
+    seen = [0]
+    machine.subscribe(lambda t: seen.__setitem__(0, seen[0] + 1))
+
+    began = time.perf_counter()
+    for _ in range(count):
+        machine.start(1500, 300)
+        clock.advance(600); machine.pause()
+        clock.advance(60);  machine.resume()
+        clock.advance(900); machine.poll()       # -> check-in
+        machine.extend(300)
+        clock.advance(300); machine.poll()       # -> check-in again
+        machine.take_break()
+        clock.advance(300); machine.poll()       # break over -> focus
+        clock.advance(120); machine.stop()
+        if machine.state != IDLE:
+            raise RuntimeError(f"Lifecycle ended in {machine.state}")
+    elapsed = time.perf_counter() - began
+
+    return {
+        "lifecycles": count,
+        "transitions": seen[0],
+        "seconds": round(elapsed, 3),
+        "lifecycles_per_s": int(count / elapsed),
+        "transitions_per_s": int(seen[0] / elapsed),
+    }
+
+# --- 4. WIDGET CONSTRUCTION ---
+
+def qt_app():
+    """QApplication on the offscreen platform, with a throwaway profile dir."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="ikiflow_bench_")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+def time_builds(factory, repeat):
+    from PySide6.QtWidgets import QApplication
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        widget = factory()
+        QApplication.processEvents()  # polish + first layout
+        samples.append((time.perf_counter() - began) * 1000)
+        widget.close()
+        widget.deleteLater()
+        QApplication.processEvents()
+    return {
+        "repeat": repeat,
+        "first_ms": round(samples[0], 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+    }
+
+def inline_sheets(sheet):
+    """
+    {objectName: css} from the app-level rules: every block goes to the first
+    #Name in its selector. Set per widget, that's what the tree looked like
+    before the theme (an inline sheet on each styled widget, parsed per widget).
+    """
+    sheets = {}
+    sheet = re.sub(r"/\*.*?\*/", "", sheet, flags=re.S)
+    for selector, body in re.findall(r"([^{}]+)\{([^{}]*)\}", sheet):
+        name = re.search(r"#(\w+)", selector)
+        if name:
+            sheets.setdefault(name.group(1), []).append(f"{selector.strip()} {{{body}}}")
+    return {name: "\n".join(blocks) for name, blocks in sheets.items()}
+
+def inline_build(factory, sheets):
+    """factory(), then an inline sheet on each named widget (the baseline build)."""
+    from PySide6.QtWidgets import QWidget
+    def build():
+        widget = factory()
+        for child in [widget] + widget.findChildren(QWidget):
+            css = sheets.get(child.objectName())
+            if css:
+                child.setStyleSheet(css)
+        return widget
+    return build
+
+def bench_construct(repeat=20):
+    """
+    Build time of the heavily styled windows: with per-widget inline sheets
+    and only the base STYLESHEET on the app (before), and under the
+    app-level theme (after).
+    """
+    app = qt_app()
+    from Ikiflow_style import STYLESHEET
+    from Ikiflow_theme import apply_theme, compile_theme
+    from Ikiflow_analyzer import AnalyzerWindow
+    from Ikiflow_settings import SettingsTab
+    from main import MainWindow
+
+    sheets = inline_sheets(compile_theme()[len(STYLESHEET):])
+    result = {}
+    app.setStyleSheet(STYLESHEET)
+    for name, factory in (("analyzer_window", AnalyzerWindow), ("settings_tab", SettingsTab)):
+        result[name] = {"before": time_builds(inline_build(factory, sheets), repeat)}
+
+    began = time.perf_counter()
+    apply_theme(app)
+    result["apply_theme_ms"] = round((time.perf_counter() - began) * 1000, 2)
+    for name, factory in (("analyzer_window", AnalyzerWindow), ("settings_tab", SettingsTab)):
+        result[name]["after"] = time_builds(factory, repeat)
+        result[name]["speedup"] = speedup(result[name]["before"], result[name]["after"])
+
+    # Settings tab is a placeholder until opened, so it's not in here
+    result["main_window"] = time_builds(MainWindow, min(repeat, 5))
+    return result
+
+# --- 5. PAINT PER TICK ---
+
+def time_ticks(target, tick, ticks):
+    """tick(i) changes the text, then target repaints synchronously (what 1 Hz costs)."""
+    samples = []
+    for i in range(ticks):
+        tick(i)
+        began = time.perf_counter()
+        target.repaint()
+        samples.append((time.perf_counter() - began) * 1000)
+    return {
+        "ticks": ticks,
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "max_ms": round(max(samples), 4),
+    }
+
+def bench_paint(ticks=300):
+    """
+    Main card timer label and floater, each painted with the old graphics
+    effects (before) and with the nine-slice shadow / window opacity (after).
+    """
+    app = qt_app()
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QColor
+    from PySide6.QtWidgets import (QWidget, QFrame, QLabel, QVBoxLayout,
+                                   QGraphicsDropShadowEffect, QGraphicsOpacityEffect)
+    from Ikiflow_theme import apply_theme
+    from Ikiflow_render import ShadowHost
+    from Ikiflow_components import FloatingWidget
+    apply_theme(app)
+
+    def card_window(use_effect):
+        host = QWidget() if use_effect else ShadowHost(20)
+        host.setAttribute(Qt.WA_TranslucentBackground)
+        host.resize(420, 560)
+        outer = QVBoxLayout(host)
+        outer.setContentsMargins(10, 10, 10, 10)
+        card = QFrame()
+        card.setObjectName("MainCard")  # Styled by the theme, like main
+        outer.addWidget(card)
+        label = QLabel("25:00")
+        label.setObjectName("BigTimer")
+        QVBoxLayout(card).addWidget(label)
+        if use_effect:
+            shadow = QGraphicsDropShadowEffect(host)
+            shadow.setBlurRadius(20)
+            shadow.setYOffset(5)
+            shadow.setColor(QColor(0, 0, 0, 40))
+            card.setGraphicsEffect(shadow)
+        else:
+            host.card = card
+        host.show()
+        app.processEvents()
+        return host, label
+
+    def floater(use_effect):
+        w = FloatingWidget()
+        if use_effect:
+            effect = QGraphicsOpacityEffect(w)
+            effect.setOpacity(0.8)
+            w.setGraphicsEffect(effect)
+        else:
+            w.setWindowOpacity(0.8)
+        w.show()
+        app.processEvents()
+        return w
+
+    result = {}
+    for name, use_effect in (("before", True), ("after", False)):
+        host, label = card_window(use_effect)
+        result.setdefault("card", {})[name] = time_ticks(
+            label, lambda i: label.setText(f"{24 - i // 60 % 25:02d}:{59 - i % 60:02d}"), ticks)
+        host.close()
+
+        w = floater(use_effect)
+        result.setdefault("floater", {})[name] = time_ticks(
+            w, lambda i: w.set_time(f"{24 - i // 60 % 25:02d}:{59 - i % 60:02d}", 100 - i % 100), ticks)
+        w.close()
+
+    for part in result.values():
+        part["speedup"] = speedup(part["before"], part["after"])
+    return result
+
+# --- 6. STARTUP ---
+# Each run is a fresh `python -X importtime` child on the offscreen platform.
+# The child stamps phases (wall clock, relative to the parent's spawn time)
+# into a JSON file; the parent adds the importtime table from stderr.
+
+STARTUP_TIMEOUT_S = 15
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+def startup_child(out_path, silent=False):
+    """Runs inside the child: main.py's own startup (section 0 + launch()), stamped."""
+    spawned = float(os.environ["IKIFLOW_BENCH_SPAWNED"])
+    phases = {}
+    def stamp(name):
+        phases[name] = round((time.time() - spawned) * 1000, 2)
+
+    stamp("interpreter")
+    argv = sys.argv[:1] + (["--silent"] if silent else [])
+    from Ikiflow_protocol import parse_command
+    from Ikiflow_ctl import forward
+    command = parse_command(argv[1:])
+    if forward(command) is not None:
+        sys.exit("Ikiflow is already running: close it to measure a cold start")
+    stamp("forward_probe")
+    import main as ikiflow
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    stamp("imports")
+
+    # Stamp the two big steps of MainWindow.__init__ from the outside
+    def stamped(method, name):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            stamp(name)
+            return result
+        return wrapper
+    ikiflow.MainWindow.init_ui = stamped(ikiflow.MainWindow.init_ui, "ui_built")
+    ikiflow.MainWindow.setup_tray = stamped(ikiflow.MainWindow.setup_tray, "tray_ready")
+
+    # Shown (unless silent) before the loop runs, so the first paint is still ahead
+    app, window = ikiflow.launch(command, argv, hook=stamp)
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if (event.type() == QEvent.Paint and "first_paint" not in phases
+                    and obj.isWidgetType() and obj.window() is window):
+                stamp("first_paint")
+            return False
+    watcher = FirstPaint()
+    app.installEventFilter(watcher)
+
+    def finish(timed_out=False):
+        if not window.warmup.jobs:
+            stamp("warmup_done")
+        result = {"phases": phases, "warmup_ms": window.warmup.stats()["ms"], "timed_out": timed_out}
+        with open(out_path, "w") as f:
+            json.dump(result, f)
+        app.quit()
+
+    def check():
+        if (silent or "first_paint" in phases) and not window.warmup.jobs:
+            finish()
+    poll = QTimer()
+    poll.timeout.connect(check)
+    poll.start(5)
+    QTimer.singleShot(STARTUP_TIMEOUT_S * 1000, lambda: finish(timed_out=True))
+    app.exec()
+
+def parse_importtime(stderr, top=15):
+    """-X importtime lines -> heaviest modules by self and cumulative time (ms)."""
+    rows = []
+    for line in stderr.splitlines():
+        found = IMPORTTIME.match(line)
+        if found:
+            self_us, cumulative_us, indent, name = found.groups()
+            rows.append({"module": name, "self_ms": int(self_us) / 1000,
+                         "cumulative_ms": int(cumulative_us) / 1000, "depth": len(indent) // 2})
+    top_level = [r for r in rows if r["depth"] == 0]
+    return {
+        "modules": len(rows),
+        "total_ms": round(sum(r["cumulative_ms"] for r in top_level), 2),
+        "by_self": sorted(rows, key=lambda r: r["self_ms"], reverse=True)[:top],
+        "by_cumulative": sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top],
+    }
+
+def run_startup_once(silent=False):
+    workdir = tempfile.mkdtemp(prefix="ikiflow_startup_")
+    out_path = os.path.join(workdir, "phases.json")
+    env = dict(os.environ,
+               QT_QPA_PLATFORM="offscreen",
+               USERPROFILE=workdir,          # fresh config/history every run
+               IKIFLOW_BENCH_SPAWNED=repr(time.time()))
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(__file__), "_startup-child", out_path]
+    if silent:
+        cmd.append("--silent")
+
+    began = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True,
+                          timeout=STARTUP_TIMEOUT_S + 30,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall_ms = (time.perf_counter() - began) * 1000
+    if proc.returncode != 0 or not os.path.exists(out_path):
+        tail = "\n".join(line for line in proc.stderr.splitlines()
+                         if not line.startswith("import time:"))[-2000:]
+        raise RuntimeError(f"startup child failed ({proc.returncode}):\n{tail}")
+
+    with open(out_path) as f:
+        run = json.load(f)
+    run["process_wall_ms"] = round(wall_ms, 2)
+    run["imports"] = parse_importtime(proc.stderr)
+    return run
+
+def bench_startup(repeat=5, silent=False):
+    """Process start -> imports, QApplication, MainWindow, tray, first paint (ms)."""
+    runs = [run_startup_once(silent) for _ in range(repeat)]
+
+    names = []
+    for run in runs:
+        names += [name for name in run["phases"] if name not in names]
+    median = {name: round(statistics.median(run["phases"][name] for run in runs
+                                            if name in run["phases"]), 2)
+              for name in names}
+
+    return {
+        "repeat": repeat,
+        "silent": silent,
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "median_ms": median,
+        "runs": [run["phases"] for run in runs],
+        "timed_out": sum(run["timed_out"] for run in runs),
+        "warmup_ms": runs[-1]["warmup_ms"],
+        "imports": runs[-1]["imports"],  # last run: disk caches warm, like a normal launch
+    }
+
+# --- 7. NOISE GENERATOR ---
+
+def bench_noise(seconds=60, block=1024, rate=44100):
+    """
+    CPU per second of generated audio, per color, through the same
+    generator + ring buffer path the sink is fed from (no Qt, no device).
+    """
+    import numpy as np
+    from Ikiflow_noise import NoiseGenerator, RingBuffer, COLORS
+
+    result = {"seconds": seconds, "block": block, "rate": rate}
+    blocks = seconds * rate // block
+    for color in COLORS:
+        gen = NoiseGenerator(color, block, seed=1)
+        ring = RingBuffer(rate // 2)
+        peak = 0.0
+        began_cpu, began = time.process_time(), time.perf_counter()
+        for _ in range(blocks):
+            samples = gen.block(block)
+            peak = max(peak, float(np.abs(samples).max()))
+            ring.write(samples)
+            ring.read(block)
+        cpu = time.process_time() - began_cpu
+        wall = time.perf_counter() - began
+        audio_s = blocks * block / rate
+
+        # Same seed, different block boundaries -> same signal (no seams)
+        a, b = NoiseGenerator(color, block, seed=2), NoiseGenerator(color, block, seed=2)
+        joined = np.concatenate([a.block(block).copy() for _ in range(8)])
+        parts, left, sizes = [], len(joined), [1, 333, 1000, 7, block]
+        while left:
+            n = min(sizes[len(parts) % len(sizes)], left)
+            parts.append(b.block(n).copy())
+            left -= n
+        split = np.concatenate(parts)
+
+        result[color] = {
+            "cpu_ms_per_audio_s": round(cpu * 1000 / audio_s, 3),
+            "realtime_x": round(audio_s / wall, 1),
+            "peak": round(peak, 3),
+            "seam_max_diff": float(np.abs(joined - split).max()),
+            "memory_bytes": ring.data.nbytes + gen.white.nbytes + gen.mix.nbytes + gen.scratch.nbytes,
+        }
+    return result
+
+# --- 8. SELF-CHECKS ---
+# Assertions over the Qt-free engines. Each check raises AssertionError.
+
+def check_deadline_timer():
+    clock = FakeClock()
+    timer = DeadlineTimer(clock)
+    timer.start(100)
+    clock.advance(30.4)
+    assert abs(timer.remaining() - 69.6) < 1e-9
+    assert timer.remaining_seconds() == 70           # 01:10 until the boundary
+    assert timer.ms_to_next_second() == 600 + DeadlineTimer.WAKE_SLACK_MS
+
+    timer.pause()
+    clock.advance(50)                                # paused time doesn't count
+    assert abs(timer.remaining() - 69.6) < 1e-9
+    timer.resume()
+    clock.advance(69.6)
+    assert timer.expired()
+
+    clock.advance(5)                                 # noticed late, then +60
+    timer.extend(60)
+    assert abs(timer.remaining() - 60) < 1e-9
+    assert timer.total == 160
+
+def check_session_log():
+    clock = FakeClock()
+    machine = SessionMachine(clock)
+    assert machine.pause() is None                   # invalid events are ignored
+
+    machine.start(1500, 300)
+    clock.advance(600); machine.pause()
+    clock.advance(60);  machine.resume()
+    clock.advance(900); assert machine.poll().new == CHECKIN
+    clock.advance(40)                                # waiting on the check-in
+    machine.extend(300)
+    clock.advance(300); machine.poll()
+    machine.take_break()
+    assert machine.state == BREAK
+
+    totals = fold_events(machine.log.events)
+    assert totals["planned_s"] == 1500
+    assert totals["focus_s"] == 1800
+    assert totals["paused_s"] == 60
+    assert totals["checkin_s"] == 40
+    assert (totals["pauses"], totals["extensions"], totals["extended_s"]) == (1, 1, 300)
+
+    clock.advance(300); machine.poll()               # break over -> new block, new log
+    assert machine.state == FOCUS and machine.log.events == [[0.0, START, 1500]]
+
+def check_protocol():
+    from Ikiflow_protocol import FrameReader, encode_frame, parse_command, HEADER, MAX_FRAME
+    frames = encode_frame({"cmd": "status"}) + encode_frame({"cmd": "start", "minutes": 25})
+    reader = FrameReader()
+    got = []
+    for i in range(len(frames)):                     # worst case: one byte per read
+        got += reader.feed(frames[i:i + 1])
+    assert got == [{"cmd": "status"}, {"cmd": "start", "minutes": 25}]
+    assert FrameReader().feed(frames) == got
+
+    for bad in (HEADER.pack(MAX_FRAME + 1), HEADER.pack(2) + b"[]"):
+        try:
+            FrameReader().feed(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+    assert parse_command(["--start", "25"]) == {"cmd": "start", "minutes": 25}
+    assert parse_command(["--start", "soon"]) == {"cmd": "start"}
+    assert parse_command(["--silent"]) == {"cmd": "show"}
+    assert parse_command(["--silent", "--stats"]) == {"cmd": "stats"}
+
+def check_usage_sketch():
+    from Ikiflow_data import AppUsageSketch, OTHER_BUCKET  # imports PySide6
+    sketch = AppUsageSketch(capacity=2)
+    sketch.add("Figma", 10)
+    sketch.add("Slack", 5)
+    sketch.add("Notion", 1)                          # full: takes over Slack's slot
+    usage = sketch.as_dict()
+    assert len(sketch) == 2
+    assert usage["Figma"] == 10 and usage["Notion"] == 1
+    assert usage[OTHER_BUCKET] == 5                  # Slack's time isn't lost
+    assert sum(usage.values()) == sketch.total == 16
+
+CHECKS = {
+    "deadline_timer": check_deadline_timer,
+    "session_log": check_session_log,
+    "protocol": check_protocol,
+    "usage_sketch": check_usage_sketch,
+}
+
+def run_checks():
+    results = {}
+    for name, check in CHECKS.items():
+        try:
+            check()
+            results[name] = "ok"
+        except ImportError as e:
+            results[name] = f"skipped ({e})"
+        except AssertionError as e:
+            results[name] = f"FAILED: {e or 'assertion'}"
+    return results
+
+# --- 9. ENTRY POINT ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ikiflow benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_drift = sub.add_parser("drift", help="Deadline timer drift over simulated sessions")
+    p_drift.add_argument("--hours", type=float, default=8.0)
+    p_drift.add_argument("--seed", type=int, default=1)
+    p_drift.add_argument("--tolerance", type=float, default=1e-6, help="Max allowed |remaining - ideal| (s)")
+    p_drift.add_argument("--out", help="Write the JSON report here too")
+
+    p_life = sub.add_parser("lifecycle", help="Headless session state machine throughput")
+    p_life.add_argument("--count", type=int, default=50000)
+    p_life.add_argument("--min-rate", type=int, default=2000, help="Fail below this many lifecycles/s")
+    p_life.add_argument("--out")
+
+    p_build = sub.add_parser("construct", help="AnalyzerWindow / SettingsTab construction time")
+    p_build.add_argument("--repeat", type=int, default=20)
+    p_build.add_argument("--out")
+
+    p_paint = sub.add_parser("paint", help="Paint time per timer tick, graphics effects vs cached compositing")
+    p_paint.add_argument("--ticks", type=int, default=300)
+    p_paint.add_argument("--out")
+
+    p_start = sub.add_parser("startup", help="Cold start phases + -X importtime (offscreen, fresh profile)")
+    p_start.add_argument("--repeat", type=int, default=5)
+    p_start.add_argument("--silent", action="store_true", help="Like a --silent launch: tray only, no window")
+    p_start.add_argument("--out")
+
+    p_noise = sub.add_parser("noise", help="Procedural noise generator CPU cost per second of audio")
+    p_noise.add_argument("--seconds", type=int, default=60)
+    p_noise.add_argument("--out")
+
+    p_check = sub.add_parser("check", help="Assertions over the Qt-free engines (timer, session log, protocol, usage sketch)")
+    p_check.add_argument("--out")
+
+    p_child = sub.add_parser("_startup-child")  # internal: one measured launch
+    p_child.add_argument("out_path")
+    p_child.add_argument("--silent", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "drift":
+        result = bench_drift(args.hours, args.seed)
+        result["tolerance_s"] = args.tolerance
+        result["ok"] = result["max_abs_error_s"] <= args.tolerance
+        report(result, args.out)
+        return 0 if result["ok"] else 1
+
+    if args.command == "lifecycle":
+        result = bench_lifecycle(args.count)
+        result["min_rate"] = args.min_rate
+        result["ok"] = (result["transitions"] == args.count * TRANSITIONS_PER_LIFECYCLE
+                        and result["lifecycles_per_s"] >= args.min_rate)
+        report(result, args.out)
+        return 0 if result["ok"] else 1
+
+    if args.command == "construct":
+        report(bench_construct(args.repeat), args.out)
+        return 0
+
+    if args.command == "paint":
+        report(bench_paint(args.ticks), args.out)
+        return 0
+
+    if args.command == "startup":
+        result = bench_startup(args.repeat, args.silent)
+        report(result, args.out)
+        return 0 if not result["timed_out"] else 1
+
+    if args.command == "noise":
+        report(bench_noise(args.seconds), args.out)
+        return 0
+
+    if args.command == "check":
+        results = run_checks()
+        report(results, args.out)
+        return 1 if any(r.startswith("FAILED") for r in results.values()) else 0
+
+    if args.command == "_startup-child":
+        startup_child(args.out_path, args.silent)
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
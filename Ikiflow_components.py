@@ -1,10 +1,18 @@
 import math
+import random
+import statistics
+import time
+from collections import deque
 from PySide6.QtWidgets import (QWidget, QPushButton, QLabel, QProgressBar, 
                                QSpinBox, QVBoxLayout, QHBoxLayout, QFrame, 
-                               QGraphicsOpacityEffect, QGraphicsDropShadowEffect, QStackedWidget, QApplication,
+                               QStackedWidget, QApplication,
                                QDialog, QLineEdit, QListWidget, QMenu)
-from PySide6.QtCore import (Qt, QPoint, QRectF, QTimer, Signal, QSize, QSettings, QPropertyAnimation, QEasingCurve)
-from PySide6.QtGui import (QColor, QPainter, QPen, QFont, QAction,)
+from PySide6.QtCore import (Qt, QObject, QPoint, QRectF, QTimer, Signal, QPropertyAnimation, QEasingCurve)
+from PySide6.QtGui import (QColor, QPainter, QPainterPath, QPen, QFont)
+from Ikiflow_session import FOCUS, CHECKIN, BREAK, IDLE, EXTEND, TAKE_BREAK
+from Ikiflow_screens import ScreenIndex
+from Ikiflow_render import draw_card_shadow
+from Ikiflow_config import get_config
 
 # --- 1. CUSTOM WINDOW BUTTON ---
 
@@ -311,8 +319,6 @@ class CustomLinearInput(QWidget):
         self.spin_box.resize(50, 35)
         self.spin_box.valueChanged.connect(self.on_spinbox_change)
 
-        self.settings = QSettings()
-
     def resizeEvent(self, event):
         self.spin_box.move(self.width() - 60, 0)
         super().resizeEvent(event)
@@ -332,9 +338,7 @@ class CustomLinearInput(QWidget):
 
     def mouseMoveEvent(self, e):
         if self.dragging: self.snap_to_x(e.position().x())
-    def mouseReleaseEvent(self, e):
-        self.dragging = False
-        self.settings.setValue("pos", self.pos())
+    def mouseReleaseEvent(self, e): self.dragging = False
 
     def snap_to_x(self, x):
         padding = 20
@@ -376,13 +380,18 @@ class CustomLinearInput(QWidget):
 # --- 5. FLOATING WIDGET (UPDATED) ---
 
 class FloatingWidget(QWidget):
+    """
+    Always-on-top mini timer, painted by hand: container shape, time text and
+    progress bar. Style/size/snap changes only drop the cached geometry; the
+    container QPainterPath is cached per shape variant and size.
+    """
+    MAX_PATHS = 16
+    LOOK_KEYS = ("style_idx", "radius", "theme_color", "scale", "opacity")
+
     def __init__(self):
         super().__init__()
 
-        self.settings = QSettings("Ikiflow", "FloatingWidget")
-        saved_pos = self.settings.value("pos")
-        if saved_pos:
-            self.move(saved_pos)
+        self.config = get_config()
 
         self.setWindowFlags(
             Qt.FramelessWindowHint |
@@ -399,6 +408,7 @@ class FloatingWidget(QWidget):
         self.dragging = False
         self.offset = QPoint()
         self.is_snapped = False
+        self.snap_edges = ()     # e.g. ("left", "top") while stuck to a corner
 
         # Intent Data State
         self.mode = "Free"
@@ -413,52 +423,39 @@ class FloatingWidget(QWidget):
         self.text_color = "#2D3436"
         self.bar_bg = "#DFE6E9"
 
-        # Layout
-        root = QVBoxLayout(self)
-        root.setContentsMargins(0, 0, 0, 0)
-
-        self.container = QFrame()
-        self.container.setObjectName("ContainerFrame")
-        root.addWidget(self.container)
-
-        inner = QVBoxLayout(self.container)
-        self.container_layout = inner
-        inner.setContentsMargins(20, 5, 20, 10) # Adjusted margins
-        inner.setSpacing(0)
+        # What we draw
+        self.time_text = "Ready"
+        self.bar_value = 0       # % left, 0..100
 
-        # 1. New Task Label
-        self.lbl_task = QLabel("")
-        self.lbl_task.setAlignment(Qt.AlignCenter)
-        self.lbl_task.setStyleSheet("font-size: 11px; font-weight: bold; text-transform: uppercase; margin-bottom: 0px;")
-        
-        # 2. Timer
-        self.time_lbl = QLabel("Ready")
-        self.time_lbl.setAlignment(Qt.AlignCenter)
-
-        # 3. Bar
-        self.bar = QProgressBar()
-        self.bar.setTextVisible(False)
-        self.bar.setFixedHeight(6)
+        # Paint caches
+        self.geo = None          # layout for the current size/style (see layout_geometry)
+        self.paths = {}          # {(variant, w, h, r, border): QPainterPath}
 
-        inner.addWidget(self.lbl_task)
-        inner.addWidget(self.time_lbl)
-        inner.addWidget(self.bar)
+        # Look comes straight from the store (the Settings tab is built lazily)
+        self.load_config(self.config)
 
-        self.opacity_effect = QGraphicsOpacityEffect(self)
-        self.setGraphicsEffect(self.opacity_effect)
+        # Settings sliders set the store per mouse pixel: restyle at most once per frame
+        self.restyle_requests = 0
+        self.restyles = 0
+        self.restyle_frame = QTimer(self)
+        self.restyle_frame.setSingleShot(True)
+        self.restyle_frame.setInterval(16)
+        self.restyle_frame.timeout.connect(self.restyle)
+        for key in self.LOOK_KEYS:
+            self.config.subscribe(key, self.on_look_changed, owner=self)
 
-        self.apply_style()
+        # Monitors: positions are remembered per screen layout
+        self.screens = ScreenIndex(self)
+        self.screens.changed.connect(self.restore_position)
+        self.restore_position()
 
     # --- INTENT LOGIC (CLEAN VERSION) ---
     def set_session_data(self, mode, tasks):
         self.mode = mode
         self.task_list = tasks
         
-        # FIX: Always hide the label. The user wants a clean timer only.
-        self.lbl_task.hide() 
-        self.lbl_task.setText("") # Clear it just in case
-        
-        # We still store the task name so it saves to history.json later
+        # The task name isn't drawn (clean timer only), but it is
+        # still stored so it can be saved to history.json later
         self.current_task = tasks[0] if tasks else "Focus"
 
     def contextMenuEvent(self, event):
@@ -479,85 +476,156 @@ class FloatingWidget(QWidget):
 
     def switch_task(self, task_name):
         self.current_task = task_name
-        self.lbl_task.setText(task_name)
+
+    # ---------- SESSION ----------
+    def on_session_transition(self, t):
+        # Visible only while focusing (paused keeps whatever we had)
+        if t.new == FOCUS:
+            self.setWindowState(Qt.WindowNoState)
+            self.show()
+            self.raise_()
+            if t.event == EXTEND:
+                self.activateWindow()
+        elif t.new in (CHECKIN, BREAK, IDLE):
+            self.hide()
+
+    def set_time(self, text, pct_left):
+        if (text, pct_left) == (self.time_text, self.bar_value): return
+        self.time_text = text
+        self.bar_value = pct_left
+        self.update()
+
+    def has_bar(self):
+        return self.style_idx not in (2, 3)
 
     # ---------- STYLE ----------
     def apply_style(self):
+        # Nothing to re-polish: the next paint rebuilds the layout
+        self.geo = None
+        self.update()
 
-        self.container.show()
-        self.bar.show()
-        self.time_lbl.show()
-        
-        # Logic to show/hide task label based on mode is handled in set_session_data
-        # Here we just set colors
-
-        h = max(1, self.height())
-        m_y = max(2, int(h * 0.1))
-        m_x = max(5, int(self.width() * 0.08))
-        
-        # Only adjust margins if they changed significantly to avoid jitter
-        # Using fixed margins usually works better with the added Label
-        
+    def layout_geometry(self):
+        w, h = self.width(), max(1, self.height())
         f_size = max(10, int(h * 0.28))
         r_val = int((self.corner_r_pct / 100.0) * (h / 2))
         if self.style_idx == 0 and not self.is_snapped:
             r_val = h // 2
 
-        bg = self.bg_color
-        text_col = self.text_color
-        border_css = "border: 2px solid #E0E0E0;"
+        bg = QColor(self.bg_color)
+        text_col = QColor(self.text_color)
+        border = (2, QColor("#E0E0E0"))
 
         if self.is_snapped:
-            radius_css = f"""
-                border-top-left-radius: 0px;
-                border-top-right-radius: 0px;
-                border-bottom-right-radius: {r_val}px;
-                border-bottom-left-radius: {r_val}px;
-            """
-            border_css = "border: 1px solid transparent;"
-        else:
-            radius_css = f"border-radius: {r_val}px;"
+            border = (1, QColor(Qt.transparent))
 
         if self.style_idx == 2:
-            bg = "transparent"
-            border_css = "border: none;"
-            self.bar.hide()
-            text_col = self.theme_color
+            bg = None
+            border = (0, None)
+            text_col = QColor(self.theme_color)
         elif self.style_idx == 3:
-            self.bar.hide()
             f_size = int(f_size * 1.3)
         elif self.style_idx == 4:
-            bg = "rgba(255,255,255,0.7)" if self.bg_color != "#2D3436" else "rgba(0,0,0,0.6)"
-            border_css = "border: 1px solid rgba(200,200,200,0.5);"
-
-        self.container.setStyleSheet(f"""
-            QFrame#ContainerFrame {{
-                background-color: {bg};
-                {border_css}
-                {radius_css}
-            }}
-        """)
+            bg = QColor(255, 255, 255, 178) if self.bg_color != "#2D3436" else QColor(0, 0, 0, 153)
+            border = (1, QColor(200, 200, 200, 128))
 
-        self.time_lbl.setStyleSheet(f"color:{text_col}; font-size:{f_size}px; font-weight:bold; border: none;")
-        
-        # Style the task label to match text color but slightly faded
-        # Use opacity in color or just inherit text_col
-        self.lbl_task.setStyleSheet(f"color:{text_col}; font-size: 11px; font-weight: bold; text-transform: uppercase; border: none;")
+        font = QFont(self.font())
+        font.setPixelSize(f_size)
+        font.setBold(True)
 
+        # Same box model the old stylesheet layout had: border + 20/5/20/10 margins
+        bw = border[0]
+        content = QRectF(self.rect()).adjusted(20 + bw, 5 + bw, -20 - bw, -10 - bw)
         bar_h = max(2, int(h * 0.08))
-        self.bar.setFixedHeight(bar_h)
+        bar_rect = None
+        text_rect = content
+        if self.has_bar():
+            bar_rect = QRectF(content.left(), content.bottom() - bar_h, content.width(), bar_h)
+            text_rect = QRectF(content.left(), content.top(), content.width(), content.height() - bar_h)
+
+        return {
+            "path": self.container_path(w, h, r_val, bw),
+            "bg": bg, "border": border, "text_col": text_col, "font": font,
+            "text_rect": text_rect, "bar_rect": bar_rect,
+            "bar_r": min(int(r_val / 2), bar_h // 2),
+        }
+
+    def container_path(self, w, h, r, bw):
+        key = (self.snap_edges, w, h, r, bw)
+        path = self.paths.get(key)
+        if path is not None:
+            return path
+
+        # Stroke sits inside the widget, like a CSS border
+        rect = QRectF(0, 0, w, h).adjusted(bw / 2, bw / 2, -bw / 2, -bw / 2)
+        path = QPainterPath()
+        if self.snap_edges:
+            # Flat sides glued to the screen: round a rect that runs past
+            # the snapped edges, then cut it back to the widget
+            edges = self.snap_edges
+            grown = rect.adjusted(-r if "left" in edges else 0, -r if "top" in edges else 0,
+                                  r if "right" in edges else 0, r if "bottom" in edges else 0)
+            path.addRoundedRect(grown, r, r)
+            clip = QPainterPath()
+            clip.addRect(rect)
+            path = path.intersected(clip)
+        else:
+            path.addRoundedRect(rect, r, r)
 
-        bar_r = min(int(r_val / 2), bar_h // 2)
-        self.bar.setStyleSheet(f"""
-            QProgressBar {{ background:{self.bar_bg}; border-radius:{bar_r}px; }}
-            QProgressBar::chunk {{ background:{self.theme_color}; border-radius:{bar_r}px; }}
-        """)
+        if len(self.paths) >= self.MAX_PATHS:
+            self.paths.clear()
+        self.paths[key] = path
+        return path
 
-        self.container.style().unpolish(self.container)
-        self.container.style().polish(self.container)
-        self.container.update()
+    def paintEvent(self, event):
+        if self.geo is None:
+            self.geo = self.layout_geometry()
+        geo = self.geo
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 1. Container
+        bw, border_col = geo["border"]
+        painter.setPen(QPen(border_col, bw) if bw else Qt.NoPen)
+        painter.setBrush(geo["bg"] if geo["bg"] is not None else Qt.NoBrush)
+        if bw or geo["bg"] is not None:
+            painter.drawPath(geo["path"])
+
+        # 2. Time
+        painter.setFont(geo["font"])
+        painter.setPen(geo["text_col"])
+        painter.drawText(geo["text_rect"], Qt.AlignCenter, self.time_text)
+
+        # 3. Bar (% left)
+        bar = geo["bar_rect"]
+        if bar is not None:
+            r = geo["bar_r"]
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(self.bar_bg))
+            painter.drawRoundedRect(bar, r, r)
+            if self.bar_value > 0:
+                chunk = QRectF(bar.left(), bar.top(), bar.width() * self.bar_value / 100, bar.height())
+                painter.setBrush(QColor(self.theme_color))
+                painter.drawRoundedRect(chunk, r, r)
 
     # ---------- SETTINGS ----------
+    def on_look_changed(self, value):
+        self.restyle_requests += 1
+        if not self.restyle_frame.isActive():
+            self.restyle_frame.start()
+
+    def restyle(self):
+        self.load_config(self.config)
+        self.restyles += 1
+
+    def stats(self):
+        """Live preview: store changes heard vs. restyles actually done."""
+        return {"restyle_requests": self.restyle_requests, "restyles": self.restyles}
+
+    def load_config(self, config):
+        self.update_config(config.get("style_idx"), config.get("radius"), config.get("theme_color"))
+        self.apply_settings(config.get("scale"), config.get("opacity"))
+
     def update_config(self, style_idx, corner_r_pct, color_hex):
         self.style_idx = style_idx
         self.corner_r_pct = corner_r_pct
@@ -577,7 +645,8 @@ class FloatingWidget(QWidget):
     def apply_settings(self, scale_percent, opacity_val):
         scale = scale_percent / 100
         self.resize(int(self.base_w * scale), int(self.base_h * scale))
-        self.opacity_effect.setOpacity(opacity_val / 100)
+        # Window-level opacity: composited by the OS, no offscreen subtree render
+        self.setWindowOpacity(opacity_val / 100)
         self.apply_style()
 
     # ---------- DRAG + SNAP ----------
@@ -590,24 +659,34 @@ class FloatingWidget(QWidget):
         if not self.dragging:
             return
 
-        screen = QApplication.primaryScreen().availableGeometry()
-        pos = e.globalPosition().toPoint() - self.offset
-
-        SNAP = 20
-        snapped = abs(pos.y() - screen.top()) < SNAP
-
-        if snapped:
-            pos.setY(screen.top())
-
+        # Any edge/corner of any monitor (cached edge index, no screen queries)
+        pos, edges = self.screens.snap(e.globalPosition().toPoint() - self.offset, self.size())
         self.move(pos)
-
-        if snapped != self.is_snapped:
-            self.is_snapped = snapped
-            self.apply_style()
+        self.set_snap_edges(edges)
 
     def mouseReleaseEvent(self, e):
         self.dragging = False
-        self.settings.setValue("pos", self.pos())
+        positions = dict(self.config.get("floater_positions"))
+        positions[self.screens.layout_key()] = [self.x(), self.y()]
+        self.config.set("floater_positions", positions)
+
+    def set_snap_edges(self, edges):
+        if edges == self.snap_edges:
+            return
+        self.snap_edges = edges
+        self.is_snapped = bool(edges)
+        self.apply_style()
+
+    def restore_position(self):
+        """Position saved for this monitor layout (falls back to the old single key)."""
+        positions = self.config.get("floater_positions")
+        saved = positions.get(self.screens.layout_key()) or positions.get("default")
+        if not saved:
+            return
+        pos = self.screens.clamp(QPoint(*saved), self.size())
+        pos, edges = self.screens.snap(pos, self.size())
+        self.move(pos)
+        self.set_snap_edges(edges)
 
     def resizeEvent(self, e):
         self.apply_style()
@@ -617,17 +696,20 @@ class FloatingWidget(QWidget):
 
 class OverlayWindow(QWidget):
     """
-    Dual-Mode Overlay: 
+    Dual-Mode Overlay for one screen: 
     1. Check-In (Ask user if done)
     2. Break Mode (Health tips + Timer)
+    Session handling lives in OverlayPool, which keeps one of these per screen.
     """
-    # Custom signals to talk to MainWindow
+    # Custom signals to talk to MainWindow (through the pool)
     action_break = Signal()
     action_extend = Signal()
     action_cancelled = Signal()
+    painted = Signal(float)  # ms from show request to first paint
 
     def __init__(self):
         super().__init__()
+        self.show_requested = None
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
         
@@ -645,7 +727,7 @@ class OverlayWindow(QWidget):
         l_check.setAlignment(Qt.AlignCenter)
         
         lbl_q = QLabel("DID YOU FINISH YOUR TASK?")
-        lbl_q.setStyleSheet("color: #FFFFFF; font-size: 32px; font-weight: 800; border: none; font-family: 'Segoe UI';")
+        lbl_q.setObjectName("OverlayQuestion")  # Styles live in Ikiflow_theme
         lbl_q.setAlignment(Qt.AlignCenter)
         
         btn_layout = QHBoxLayout()
@@ -655,20 +737,14 @@ class OverlayWindow(QWidget):
         btn_yes = QPushButton("YES, START BREAK")
         btn_yes.setCursor(Qt.PointingHandCursor)
         btn_yes.setFixedSize(220, 60)
-        btn_yes.setStyleSheet("""
-            QPushButton { background-color: #00B894; color: white; border-radius: 12px; font-weight: bold; font-size: 16px; border: none; }
-            QPushButton:hover { background-color: #00A383; }
-        """)
+        btn_yes.setObjectName("OverlayBreak")
         btn_yes.clicked.connect(lambda: self.action_break.emit())
         
         # No Button
         btn_no = QPushButton("NO, +5 MINUTES")
         btn_no.setCursor(Qt.PointingHandCursor)
         btn_no.setFixedSize(220, 60)
-        btn_no.setStyleSheet("""
-            QPushButton { background-color: #0984E3; color: white; border-radius: 12px; font-weight: bold; font-size: 16px; border: none; }
-            QPushButton:hover { background-color: #74B9FF; }
-        """)
+        btn_no.setObjectName("OverlayExtend")
         btn_no.clicked.connect(lambda: self.action_extend.emit())
         
         btn_layout.addStretch()
@@ -686,32 +762,20 @@ class OverlayWindow(QWidget):
         l_break.setAlignment(Qt.AlignCenter)
 
         
-        self.tips = [
-            "Release your jaw.", "Look at something 20 feet away.",
-            "Take a deep belly breath.", "Stretch your shoulders.",
-            "Drink a glass of water.", "Relax your forehead."
-        ]
-        self.tip_timer = QTimer(self)
-        self.tip_timer.timeout.connect(self.cycle_tip)
-        
-        retro_font = "font-family: 'Consolas', 'Courier New', monospace;"
         self.msg_label = QLabel("SCREEN REST")
-        self.msg_label.setStyleSheet(f"color: #888888; font-size: 48px; font-weight: bold; background: transparent; border: none; {retro_font} letter-spacing: 2px;")
+        self.msg_label.setObjectName("OverlayMessage")
         self.msg_label.setAlignment(Qt.AlignCenter)
         self.msg_label.setFixedWidth(1000)
         
         self.timer_label = QLabel("00:00")
-        self.timer_label.setStyleSheet(f"color: #AAAAAA; font-size: 32px; font-weight: normal; margin-top: 30px; border: none; background: transparent; {retro_font}")
+        self.timer_label.setObjectName("OverlayTimer")
         self.timer_label.setAlignment(Qt.AlignCenter)
         
         self.progress = QProgressBar()
         self.progress.setFixedWidth(598)
         self.progress.setFixedHeight(20)
         self.progress.setTextVisible(False)
-        self.progress.setStyleSheet("""
-            QProgressBar { background-color: #111111; border: 2px solid #333333; border-radius: 0px; } 
-            QProgressBar::chunk { background-color: #AAAAAA; width: 15px; margin: 2px; }
-        """)
+        self.progress.setObjectName("OverlayProgress")
         
         l_break.addWidget(self.msg_label, 0, Qt.AlignCenter)
         l_break.addWidget(self.timer_label, 0, Qt.AlignCenter)
@@ -722,21 +786,26 @@ class OverlayWindow(QWidget):
         self.stack.addWidget(self.page_checkin)
         self.stack.addWidget(self.page_break)
 
+    def warm(self, screen):
+        """Native window, polish, layout and one offscreen render -- all while hidden."""
+        self.winId()
+        self.windowHandle().setScreen(screen)
+        self.setGeometry(screen.geometry())
+        self.ensurePolished()
+        self.layout.activate()
+        self.grab()
+
     def show_checkin(self):
         """ Show the dark screen with the Question """
-        self.tip_timer.stop()
         self.stack.setCurrentIndex(0) # Page 0 is Check-in
+        self.show_requested = time.perf_counter()
         self.showFullScreen()
 
     def show_break_mode(self):
         """ Switch to the break timer view """
         self.stack.setCurrentIndex(1) # Page 1 is Break Timer
-        self.cycle_tip()
-        self.tip_timer.start(8000)
 
-    def cycle_tip(self):
-        import random
-        tip = random.choice(self.tips)
+    def set_tip(self, tip):
         self.msg_label.setText(tip.upper())
 
     def update_state(self, current_sec, total_sec):
@@ -752,6 +821,10 @@ class OverlayWindow(QWidget):
         painter.setBrush(QColor(0, 0, 0, 255))
         painter.setPen(Qt.NoPen)
         painter.drawRect(self.rect())
+
+        if self.show_requested is not None:
+            self.painted.emit((time.perf_counter() - self.show_requested) * 1000)
+            self.show_requested = None
         
     def set_message(self, text):
         # Override for custom messages if needed
@@ -768,6 +841,150 @@ class OverlayWindow(QWidget):
         self.action_cancelled.emit()
         event.accept()
 
+class OverlayPool(QObject):
+    """
+    One pre-warmed OverlayWindow per screen, created hidden ahead of time
+    and reused, so check-in/break cover every monitor without creating native
+    windows at 00:00. Same signals/methods MainWindow used on the single
+    overlay; windows follow screens being added or removed.
+    With warm=False nothing is built until warm_up() (startup idle queue)
+    or the first check-in, whichever comes first.
+    """
+    action_break = Signal()
+    action_extend = Signal()
+    action_cancelled = Signal()
+    windows_changed = Signal()
+
+    TIPS = [
+        "Release your jaw.", "Look at something 20 feet away.",
+        "Take a deep belly breath.", "Stretch your shoulders.",
+        "Drink a glass of water.", "Relax your forehead."
+    ]
+    FRAME_MS = 1000 / 60
+
+    def __init__(self, parent=None, warm=True):
+        super().__init__(parent)
+        self.windows = {}      # {QScreen: OverlayWindow}
+        self.warmed = False
+        self.message = None
+        self.page = None       # None (hidden) / "checkin" / "break"
+        self.latencies = deque(maxlen=50)
+
+        self.tip_timer = QTimer(self)
+        self.tip_timer.timeout.connect(self.cycle_tip)
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self.add_screen)
+        app.screenRemoved.connect(self.remove_screen)
+        if warm:
+            self.warm_up()
+
+    # --- Screens ---
+    def warm_up(self):
+        self.warmed = True
+        for screen in QApplication.screens():
+            if screen not in self.windows:
+                self.add_screen(screen)
+
+    def add_screen(self, screen):
+        w = OverlayWindow()
+        w.action_break.connect(self.action_break)
+        w.action_extend.connect(self.action_extend)
+        w.action_cancelled.connect(self.action_cancelled)
+        w.painted.connect(self.latencies.append)
+        if self.message:
+            w.set_message(self.message)
+        w.warm(screen)
+        screen.geometryChanged.connect(lambda _rect, s=screen: self.rewarm(s))
+        self.windows[screen] = w
+        self.windows_changed.emit()
+
+        # Plugged in mid check-in/break: cover it right away
+        if self.page:
+            self.show_on(w)
+
+    def remove_screen(self, screen):
+        w = self.windows.pop(screen, None)
+        if w is None: return
+        w.hide()
+        w.deleteLater()
+        self.windows_changed.emit()
+
+    def rewarm(self, screen):
+        w = self.windows.get(screen)
+        if w is not None:
+            w.warm(screen)
+
+    def lead(self):
+        """Window on the primary screen (keyboard focus, render-layer visibility)."""
+        primary = QApplication.primaryScreen()
+        return self.windows.get(primary) or next(iter(self.windows.values()), None)
+
+    # --- Session ---
+    def on_session_transition(self, t):
+        if t.new == CHECKIN:
+            self.show_checkin()
+        elif t.new == BREAK and t.event == TAKE_BREAK:
+            self.show_break_mode()
+        elif t.new in (FOCUS, IDLE):
+            self.hide()
+
+    def show_on(self, w):
+        w.show_checkin()
+        if self.page == "break":
+            w.show_break_mode()
+
+    def show_checkin(self):
+        if not self.warmed: self.warm_up()
+        self.tip_timer.stop()
+        self.page = "checkin"
+        for w in self.windows.values():
+            w.show_checkin()
+        lead = self.lead()
+        if lead is not None:
+            lead.raise_()
+            lead.activateWindow()
+
+    def show_break_mode(self):
+        if not self.warmed: self.warm_up()
+        self.page = "break"
+        for w in self.windows.values():
+            w.show_break_mode()
+        self.cycle_tip()
+        self.tip_timer.start(8000)
+
+    def hide(self):
+        self.page = None
+        self.tip_timer.stop()
+        for w in self.windows.values():
+            w.hide()
+
+    def cycle_tip(self):
+        tip = random.choice(self.TIPS) # Same tip on every screen
+        for w in self.windows.values():
+            w.set_tip(tip)
+
+    def update_state(self, current_sec, total_sec):
+        for w in self.windows.values():
+            w.update_state(current_sec, total_sec)
+
+    def set_message(self, text):
+        self.message = text
+        for w in self.windows.values():
+            w.set_message(text)
+
+    def stats(self):
+        if not self.latencies:
+            return {"screens": len(self.windows), "shows": 0}
+        return {
+            "screens": len(self.windows),
+            "shows": len(self.latencies),
+            "last_show_ms": round(self.latencies[-1], 2),
+            "median_show_ms": round(statistics.median(self.latencies), 2),
+            "max_show_ms": round(max(self.latencies), 2),
+            "within_frame": max(self.latencies) <= self.FRAME_MS,
+        }
+
 # --- 7. SNAP SLIDER & GHOST CLOSE BUTTON (FINAL) ---
 
 class SnapSlider(QWidget):
@@ -928,17 +1145,15 @@ class QuickStartDialog(QDialog):
         self.dragging = False
         self.allowed_to_close = False # <--- LOCKDOWN FLAG
 
-        self.settings = QSettings("Ikiflow", "QuickStart")
-        self.last_focus = int(self.settings.value("last_focus", 30))
-        self.last_break = int(self.settings.value("last_break", 5))
+        self.config = get_config()
+        self.last_focus = self.config.get("last_focus")
+        self.last_break = self.config.get("last_break")
 
         layout = QVBoxLayout(self); layout.setContentsMargins(10, 10, 10, 10)
 
         # --- CARD UI ---
         self.card = QFrame()
-        self.card.setStyleSheet("background: #FFFFFF; border-radius: 15px;")
-        shadow = QGraphicsDropShadowEffect(self); shadow.setBlurRadius(20); shadow.setYOffset(5); shadow.setColor(QColor(0,0,0,40))
-        self.card.setGraphicsEffect(shadow)
+        self.card.setStyleSheet("background: #FFFFFF; border-radius: 15px;") # Shadow: see paintEvent
         layout.addWidget(self.card)
 
         inner = QVBoxLayout(self.card); inner.setContentsMargins(20, 30, 20, 20); inner.setSpacing(15)
@@ -980,6 +1195,11 @@ class QuickStartDialog(QDialog):
         self.ghost_btn.move(self.width() - self.ghost_btn.width() - m, m)
         self.ghost_btn.clicked.connect(lambda: self.finish("skip"))
 
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        draw_card_shadow(painter, self.card.geometry(), 15)
+        painter.end()
+
     def update_btn_text(self, val): self.btn_start.setText(f"Start {val}m Focus")
     def cycle_break(self):
         opts = [5, 10, 15, 20, 30]
@@ -988,7 +1208,7 @@ class QuickStartDialog(QDialog):
         self.btn_break.setText(f"{new_val}m Break"); self.last_break = new_val
         
     def accept_start(self):
-        self.settings.setValue("last_focus", self.slider.get_value()); self.settings.setValue("last_break", self.last_break)
+        self.config.set("last_focus", self.slider.get_value()); self.config.set("last_break", self.last_break)
         self.finish("start")
 
     def finish(self, action):
@@ -0,0 +1,195 @@
+import json
+import os
+from PySide6.QtCore import QObject, QTimer, QSettings, QCoreApplication
+from Ikiflow_utils import data_dir
+
+# --- 1. SCHEMA ---
+# Every setting the app keeps, with its type and default.
+# Path: C:\Users\YourName\Ikiflow_Data\config.json
+
+SCHEMA = {
+    # Widget appearance (Settings tab)
+    "style_idx": (int, 0),
+    "radius": (int, 50),
+    "scale": (int, 100),
+    "opacity": (int, 100),
+    "theme_color": (str, "#0984E3"),
+
+    # System & behavior toggles
+    "minimize_to_tray": (bool, True),
+    "sound_enabled": (bool, True),
+    "auto_start_break": (bool, False),
+
+    # Built-in ambient noise colour (brown / pink / white)
+    "noise_color": (str, "brown"),
+
+    # Auto-start triggers (SUPPORTED_APPS names)
+    "app_triggers": (list, []),
+
+    # Floater position per monitor layout: {layout_key: [x, y]}
+    "floater_positions": (dict, {}),
+
+    # Quick-start popup remembers the last choice
+    "last_focus": (int, 30),
+    "last_break": (int, 5),
+}
+
+def coerce(key, value):
+    """Value as SCHEMA says it should be; the default if it can't be."""
+    kind, default = SCHEMA[key]
+    if kind in (list, dict) and not isinstance(value, kind):
+        return kind(default)  # list("abc") would be ['a', 'b', 'c']
+    try:
+        if kind is bool and isinstance(value, str):  # QSettings ini gives "true"/"false"
+            return value.lower() in ("true", "1")
+        return kind(value)
+    except (TypeError, ValueError):
+        return kind(default)
+
+def defaults():
+    return {key: kind(default) for key, (kind, default) in SCHEMA.items()}
+
+# --- 2. LEGACY IMPORT ---
+
+def read_legacy():
+    """One-time import of the old QSettings stores (config.ini, FloatingWidget, QuickStart)."""
+    values = {}
+
+    ini = QSettings(str(data_dir() / "config.ini"), QSettings.IniFormat)
+    for key in ("style_idx", "radius", "scale", "opacity", "theme_color"):
+        if ini.contains(key):
+            values[key] = ini.value(key)
+    values["app_triggers"] = [key[len("app_trigger_"):] for key in ini.allKeys()
+                              if key.startswith("app_trigger_")
+                              and ini.value(key, False, type=bool)]
+
+    floater = QSettings("Ikiflow", "FloatingWidget")
+    positions = {}
+    for key in floater.allKeys():
+        pos = floater.value(key)
+        if not hasattr(pos, "x"): continue
+        if key.startswith("positions/"):
+            positions[key[len("positions/"):]] = [pos.x(), pos.y()]
+        elif key == "pos":
+            positions["default"] = [pos.x(), pos.y()]  # pre multi-monitor fallback
+    values["floater_positions"] = positions
+
+    quick = QSettings("Ikiflow", "QuickStart")
+    for key in ("last_focus", "last_break"):
+        if quick.contains(key):
+            values[key] = quick.value(key)
+    return values
+
+# --- 3. CONFIG STORE ---
+
+class ConfigStore(QObject):
+    """
+    All settings, loaded once into memory.
+    - get() is a dict lookup, safe for hot paths
+    - set() coerces to the SCHEMA type, tells subscribers, and marks the
+      store dirty; the whole file is rewritten in one batch after QUIET_MS
+      of quiet (and on quit), via a temp file + os.replace so a crash never
+      leaves half a config behind
+    List/dict values are shared: build a new one and set() it, don't mutate.
+    """
+    QUIET_MS = 500
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or (data_dir() / "config.json")
+        self.values = defaults()
+        self.subscribers = {}   # {key: [callback(value)]}
+        self.dirty = False
+        self.quit_hooked = False
+
+        self.sets = 0      # set() calls that changed something
+        self.flushes = 0   # file rewrites (the only disk writes)
+
+        self.quiet = QTimer(self)
+        self.quiet.setSingleShot(True)
+        self.quiet.timeout.connect(self.flush)
+
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                loaded = json.load(f)
+        except FileNotFoundError:
+            loaded = read_legacy()
+            self.dirty = True  # first run on config.json: keep what we imported
+        except (OSError, ValueError):
+            loaded = {}        # corrupt file: defaults, rewritten on next change
+        if not isinstance(loaded, dict):
+            loaded = {}
+
+        for key, value in loaded.items():
+            if key in SCHEMA:
+                self.values[key] = coerce(key, value)
+        if self.dirty:
+            self.schedule()
+
+    # --- Reads ---
+    def get(self, key):
+        return self.values[key]
+
+    # --- Writes ---
+    def set(self, key, value):
+        value = coerce(key, value)
+        if self.values[key] == value:
+            return
+        self.values[key] = value
+        self.sets += 1
+        self.dirty = True
+        self.schedule()
+
+        for callback in list(self.subscribers.get(key, ())):
+            callback(value)
+
+    def subscribe(self, key, callback, owner=None):
+        """callback(value) after each change of key; dropped again when owner (a QObject) is destroyed."""
+        self.subscribers.setdefault(key, []).append(callback)
+        if owner is not None:
+            owner.destroyed.connect(lambda: self.unsubscribe(key, callback))
+
+    def unsubscribe(self, key, callback):
+        callbacks = self.subscribers.get(key, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def schedule(self):
+        self.quiet.start(self.QUIET_MS)  # restart: wait for the drag to end
+        if not self.quit_hooked:
+            # The store can be created before the QApplication: hook quit on first write
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.flush)
+                self.quit_hooked = True
+
+    def flush(self):
+        self.quiet.stop()
+        if not self.dirty: return
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.values, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Config save failed: {e}")  # stays dirty, next change retries
+            return
+        self.dirty = False
+        self.flushes += 1
+
+    def stats(self):
+        return {"sets": self.sets, "disk_writes": self.flushes, "pending": self.dirty}
+
+# --- 4. SHARED INSTANCE ---
+
+_config = None
+
+def get_config():
+    """The app-wide store (created on first use, flushed on quit)."""
+    global _config
+    if _config is None:
+        _config = ConfigStore()
+    return _config
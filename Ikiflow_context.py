@@ -0,0 +1,306 @@
+import time
+import ctypes
+from collections import deque
+from PySide6.QtCore import QObject, QTimer, Signal
+from Ikiflow_data import get_idle_seconds
+
+# --- 1. WAKEUP METER ---
+
+class WakeupMeter:
+    """Counts timer wakeups (total + rolling per-minute rate)."""
+    def __init__(self, window=60.0):
+        self.window = window
+        self.total = 0
+        self.recent = deque()
+
+    def hit(self, now=None):
+        now = time.monotonic() if now is None else now
+        self.total += 1
+        self.recent.append(now)
+        self.trim(now)
+
+    def trim(self, now):
+        while self.recent and now - self.recent[0] > self.window:
+            self.recent.popleft()
+
+    def per_minute(self, now=None):
+        self.trim(time.monotonic() if now is None else now)
+        return len(self.recent) * 60.0 / self.window
+
+# --- 2. ADAPTIVE POLLER ---
+
+class AdaptivePoller(QObject):
+    """
+    Single-shot poll loop that backs off while nothing changes.
+    - changed sample  -> snap back to min_interval
+    - unchanged       -> double the interval up to max_interval
+    - user idle       -> idle_interval
+    - pinned          -> fixed interval, no back-off (pin/unpin)
+    stop() pauses it completely (e.g. while a session runs).
+    """
+    wake = Signal()
+
+    MIN_INTERVAL = 3000       # ms, the old fixed rate
+    MAX_INTERVAL = 30000      # ms, window unchanged for a while
+    IDLE_INTERVAL = 120000    # ms, nobody at the keyboard
+    IDLE_AFTER = 300          # seconds without input = idle
+
+    def __init__(self, parent=None, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        super().__init__(parent)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.pinned = None
+        self.running = False
+        self.meter = WakeupMeter()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def start(self):
+        self.running = True
+        self.interval = self.pinned or self.min_interval
+        self.timer.start(self.interval)
+
+    def pin(self, interval_ms):
+        if interval_ms == self.pinned:
+            return
+        self.pinned = interval_ms
+        self.interval = interval_ms
+        if self.running:
+            self.timer.start(self.interval)
+
+    def unpin(self):
+        if self.pinned is None:
+            return
+        self.pinned = None
+        self.interval = self.min_interval
+        if self.running:
+            self.timer.start(self.interval)
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def is_running(self):
+        return self.running
+
+    def report(self, changed):
+        """Called by the consumer after each wake to steer the next interval."""
+        if self.pinned:
+            self.interval = self.pinned
+        elif changed:
+            self.interval = self.min_interval
+        elif get_idle_seconds() >= self.IDLE_AFTER:
+            self.interval = self.IDLE_INTERVAL
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    def on_timeout(self):
+        self.meter.hit()
+        self.wake.emit()
+        # Re-arm unless the consumer stopped us (or restarted us itself)
+        if self.running and not self.timer.isActive():
+            self.timer.start(self.interval)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "interval_ms": self.interval,
+            "wakeups": self.meter.total,
+            "wakeups_per_min": round(self.meter.per_minute(), 2),
+        }
+
+# --- 3. FOREGROUND HOOK ---
+
+class ForegroundHook:
+    """
+    SetWinEventHook wrapper: calls back when the foreground window changes or
+    renames itself (browser tab, document switch). Out-of-context hooks are
+    delivered through the GUI thread's message loop, so Qt's loop is enough.
+    install() returns False where hooks aren't available (non-Windows).
+    """
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+
+    def __init__(self):
+        self.handles = []
+        self.proc = None       # keep the ctypes callback alive
+        self.callback = None
+        self.watched = None    # hwnd whose renames we care about
+
+    def install(self, callback):
+        if self.handles: return True
+        try:
+            user32 = ctypes.windll.user32
+            proto = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p,
+                                       ctypes.c_long, ctypes.c_long, ctypes.c_ulong, ctypes.c_ulong)
+        except (AttributeError, OSError):
+            return False
+
+        self.callback = callback
+        self.proc = proto(self.on_event)
+        # Our own windows too: time in Ikiflow is charged to "Focus Timer",
+        # not to whatever app was in front before it
+        flags = self.WINEVENT_OUTOFCONTEXT
+        for event in (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_OBJECT_NAMECHANGE):
+            handle = user32.SetWinEventHook(event, event, None, self.proc, 0, 0, flags)
+            if handle:
+                self.handles.append(handle)
+        if not self.handles:
+            self.proc = None
+        return bool(self.handles)
+
+    def uninstall(self):
+        for handle in self.handles:
+            ctypes.windll.user32.UnhookWinEvent(handle)
+        self.handles = []
+        self.proc = None
+
+    def is_installed(self):
+        return bool(self.handles)
+
+    def on_event(self, hook, event, hwnd, id_object, id_child, thread, ms):
+        # NAMECHANGE fires for every control everywhere; only the foreground window counts
+        if event == self.EVENT_OBJECT_NAMECHANGE:
+            if id_object != self.OBJID_WINDOW or hwnd != self.watched:
+                return
+        self.callback()
+
+# --- 4. SHARED FOREGROUND SAMPLER ---
+
+class ForegroundSampler(QObject):
+    """
+    The only place that asks the OS for the foreground window.
+    Consumers declare how often they need samples instead of running timers:
+        set_demand("tracker", 1000)               # fixed rate
+        set_demand("autostart", ADAPTIVE)         # back-off while unchanged
+        set_demand("tracker", 1000, events=True)  # on window changes; 1000 if no hook
+        set_demand("tracker", None)               # done
+    The poll rate follows the fastest demand, not the number of consumers.
+    Event demands don't poll at all while the WinEvent hook is installed.
+    """
+    sampled = Signal(object)  # WindowSample, every poll
+    changed = Signal(object)  # WindowSample, only when hwnd/title changed
+
+    ADAPTIVE = 0
+    EVENT_SETTLE_MS = 100  # titles change in bursts (tab switch, page load)
+
+    def __init__(self, provider, parent=None):
+        super().__init__(parent)
+        self.provider = provider
+        self.demands = {}   # {"consumer": (interval_ms or ADAPTIVE, events)}
+        self.last = None
+        self.calls = WakeupMeter()
+        self.hook_events = WakeupMeter()
+
+        self.poller = AdaptivePoller(self)
+        self.poller.wake.connect(self.poll)
+
+        self.hook = ForegroundHook()
+        self.settle = QTimer(self)
+        self.settle.setSingleShot(True)
+        self.settle.timeout.connect(self.poll)
+
+    def set_demand(self, consumer, interval_ms, events=False):
+        if interval_ms is None:
+            self.demands.pop(consumer, None)
+        else:
+            self.demands[consumer] = (interval_ms, events)
+        self.reschedule()
+
+    def reschedule(self):
+        # 1. Hook on while anybody wants events (falls back to their interval)
+        if any(events for _, events in self.demands.values()):
+            self.hook.install(self.on_hook_event)
+        elif self.hook.is_installed():
+            self.hook.uninstall()
+            self.settle.stop()
+
+        hooked = self.hook.is_installed()
+        polled = [ms for ms, events in self.demands.values() if not (events and hooked)]
+        if not polled:
+            self.poller.stop()
+            return
+
+        # 2. Poll for the rest
+        fixed = [ms for ms in polled if ms != self.ADAPTIVE]
+        if fixed:
+            self.poller.pin(min(fixed))
+        else:
+            self.poller.unpin()
+        if not self.poller.is_running():
+            self.poller.start()
+
+    def poll(self):
+        sample = self.provider.sample()
+        self.calls.hit()
+
+        is_new = (self.last is None or
+                  (sample.hwnd, sample.title) != (self.last.hwnd, self.last.title))
+        self.last = sample
+        self.hook.watched = sample.hwnd
+        self.poller.report(is_new)
+
+        self.sampled.emit(sample)
+        if is_new:
+            self.changed.emit(sample)
+
+    def on_hook_event(self):
+        self.hook_events.hit()
+        if not self.settle.isActive():
+            self.settle.start(self.EVENT_SETTLE_MS)
+
+    def stats(self):
+        stats = self.poller.stats()
+        stats["os_calls"] = self.calls.total
+        stats["os_calls_per_min"] = round(self.calls.per_minute(), 2)
+        stats["hooked"] = self.hook.is_installed()
+        stats["hook_events_per_min"] = round(self.hook_events.per_minute(), 2)
+        stats["demands"] = dict(self.demands)
+        return stats
+
+# --- 5. IDLE WARMUP QUEUE ---
+
+class WarmupQueue(QObject):
+    """
+    Startup work that isn't needed for the first paint or the tray icon
+    (overlay windows, audio, history file, ...). Starts once the event loop
+    has had START_MS to show things, then runs one job per loop turn so
+    input and paints get in between. Each job also has its own lazy path,
+    the queue just usually gets there before the user does.
+    """
+    START_MS = 300
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = deque()
+        self.timings = {}   # {name: ms}
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_next)
+
+    def add(self, name, job):
+        self.jobs.append((name, job))
+
+    def start(self):
+        self.timer.start(self.START_MS)
+
+    def run_next(self):
+        if not self.jobs: return
+        name, job = self.jobs.popleft()
+        began = time.perf_counter()
+        try:
+            job()
+        except Exception as e:
+            print(f"Warmup '{name}' failed: {e}")  # First real use will try again
+        self.timings[name] = round((time.perf_counter() - began) * 1000, 2)
+        if self.jobs:
+            self.timer.start(0)
+
+    def stats(self):
+        return {"pending": [name for name, _ in self.jobs], "ms": dict(self.timings)}
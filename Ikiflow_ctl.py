@@ -0,0 +1,216 @@
+"""
+Ikiflow control client: talks to the running app without loading Qt.
+
+    python Ikiflow_ctl.py status              -> {"ok": true, "state": "focus", "remaining_s": 1234, ...}
+    python Ikiflow_ctl.py status --text       -> FOCUS 20:34 · Figma
+    python Ikiflow_ctl.py status --watch 1    -> one JSON line per second over one connection
+    python Ikiflow_ctl.py start 25 | pause | resume | stop | show
+    python Ikiflow_ctl.py stats               -> wakeup / repaint / overlay / config-write counters
+
+Exit codes: 0 ok, 1 the app refused (reply has "error"), 2 not running.
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+
+from Ikiflow_protocol import SERVER_NAME, HEADER, MAX_FRAME, encode_frame
+
+TIMEOUT_S = 1.0
+
+# --- 1. TRANSPORT ---
+# Same endpoint QLocalServer uses: a named pipe on Windows,
+# a Unix socket in the temp dir everywhere else.
+
+def server_path():
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{SERVER_NAME}"
+    return os.path.join(tempfile.gettempdir(), SERVER_NAME)
+
+class NotRunning(Exception):
+    pass
+
+class Connection:
+    """One connection, any number of request/reply round trips."""
+    def __init__(self, timeout=TIMEOUT_S):
+        path = server_path()
+        self.timeout = timeout
+        if sys.platform == "win32":
+            self.pipe = self.open_pipe(path, timeout)
+            self.sock = None
+        else:
+            self.pipe = None
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            try:
+                self.sock.connect(path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:  # none / stale socket file
+                self.sock.close()
+                raise NotRunning(str(e))
+
+    @staticmethod
+    def open_pipe(path, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return open(path, "r+b", buffering=0)
+            except FileNotFoundError as e:
+                raise NotRunning(str(e))
+            except OSError:
+                # All pipe instances busy (another client mid-request): retry briefly
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.005)
+
+    def send(self, command):
+        frame = encode_frame(command)
+        if self.pipe:
+            self.pipe.write(frame)
+        else:
+            self.sock.sendall(frame)
+        (size,) = HEADER.unpack(self.read_exact(HEADER.size))
+        if size > MAX_FRAME:
+            raise ValueError(f"frame too large ({size} bytes)")
+        return json.loads(self.read_exact(size).decode("utf-8"))
+
+    def pipe_ready(self):
+        """
+        Bytes waiting in the pipe, after up to `timeout` seconds of polling.
+        A blocking ReadFile can't time out, so this stands in for the
+        socket's settimeout() on Windows.
+        """
+        import ctypes, msvcrt  # Windows only, and only once we got this far
+        handle = msvcrt.get_osfhandle(self.pipe.fileno())
+        available = ctypes.c_ulong(0)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if not ctypes.windll.kernel32.PeekNamedPipe(handle, None, 0, None,
+                                                         ctypes.byref(available), None):
+                return 0  # broken pipe: the server hung up
+            if available.value:
+                return available.value
+            if time.monotonic() > deadline:
+                raise TimeoutError("Ikiflow did not reply in time")
+            time.sleep(0.005)
+
+    def read_exact(self, count):
+        data = b""
+        while len(data) < count:
+            if self.pipe:
+                ready = self.pipe_ready()
+                chunk = self.pipe.read(min(count - len(data), ready)) if ready else b""
+            else:
+                chunk = self.sock.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError("Ikiflow closed the connection")
+            data += chunk
+        return data
+
+    def close(self):
+        if self.pipe:
+            self.pipe.close()
+        else:
+            self.sock.close()
+
+def request(command, timeout=TIMEOUT_S):
+    """One command -> reply dict. Raises NotRunning when nobody is listening."""
+    conn = Connection(timeout)
+    try:
+        return conn.send(command)
+    finally:
+        conn.close()
+
+# --- 2. OUTPUT ---
+
+def as_text(reply):
+    if not reply.get("ok"):
+        return f"error: {reply.get('error')}"
+    if "state" not in reply:  # stats: no one-line form
+        return json.dumps(reply, indent=2)
+    state = reply["state"]
+    if state == "idle":
+        return "IDLE"
+    mins, secs = divmod(reply["remaining_s"], 60)
+    text = f"{state.upper()} {mins:02d}:{secs:02d}"
+    if reply.get("app"):
+        text += f" · {reply['app']}"
+    return text
+
+def emit(reply, text=False):
+    print(as_text(reply) if text else json.dumps(reply), flush=True)
+
+def forward(command):
+    """
+    main.py's second-launch path: send command to the running instance and
+    print what's worth printing -> exit code, or None if there is none.
+    """
+    try:
+        reply = request(command)
+    except NotRunning:
+        return None
+    except (OSError, ValueError) as e:  # listening but hung / garbled
+        reply = {"ok": False, "error": str(e)}
+    if command["cmd"] in ("status", "stats") or not reply.get("ok"):
+        print(json.dumps(reply))
+    return 0 if reply.get("ok") else 1
+
+# --- 3. WATCH MODE ---
+
+def watch(interval, text=False):
+    """
+    Status every `interval` seconds on one kept-open connection, so a panel
+    pays for one small round trip per poll instead of a process + connect.
+    Reconnects if the app restarts; prints a not-running line meanwhile.
+    """
+    conn = None
+    while True:
+        began = time.monotonic()
+        try:
+            if conn is None:
+                conn = Connection()
+            emit(conn.send({"cmd": "status"}), text)
+        except (NotRunning, OSError, ValueError) as e:
+            if conn is not None:
+                conn.close()
+                conn = None
+            emit({"ok": False, "error": "Ikiflow is not running" if isinstance(e, NotRunning) else str(e)}, text)
+        time.sleep(max(0.0, interval - (time.monotonic() - began)))
+
+# --- 4. ENTRY POINT ---
+
+def main(argv=None):
+    import argparse  # not needed by main.py's second-launch path
+    parser = argparse.ArgumentParser(description="Control a running Ikiflow")
+    parser.add_argument("cmd", choices=("status", "start", "pause", "resume", "stop", "show", "stats"))
+    parser.add_argument("minutes", nargs="?", type=int, help="for start (default: the app's focus input)")
+    parser.add_argument("--text", action="store_true", help="One human-readable line instead of JSON")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="status only: keep polling")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        if args.cmd != "status":
+            parser.error("--watch only works with status")
+        try:
+            watch(args.watch, args.text)
+        except KeyboardInterrupt:
+            return 0
+
+    command = {"cmd": args.cmd}
+    if args.cmd == "start" and args.minutes is not None:
+        command["minutes"] = args.minutes
+
+    try:
+        reply = request(command)
+    except NotRunning:
+        emit({"ok": False, "error": "Ikiflow is not running"}, args.text)
+        return 2
+    except (OSError, ValueError) as e:
+        emit({"ok": False, "error": str(e)}, args.text)
+        return 1
+    emit(reply, args.text)
+    return 0 if reply.get("ok") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
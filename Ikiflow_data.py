@@ -1,24 +1,263 @@
 import json
 import os
 import ctypes
+from collections import namedtuple
 from datetime import datetime
 from pathlib import Path
 from PySide6.QtWidgets import QMessageBox
 
 # --- PART 1: WINDOW DETECTOR ---
+WindowSample = namedtuple("WindowSample", "hwnd pid exe title")
+
+# Executable -> display name used to group app usage
+KNOWN_EXECUTABLES = {
+    "ikiflow.exe": "Focus Timer",
+    "illustrator.exe": "Adobe Illustrator",
+    "photoshop.exe": "Adobe Photoshop",
+    "indesign.exe": "Adobe InDesign",
+    "adobe premiere pro.exe": "Adobe Premiere Pro",
+    "afterfx.exe": "Adobe After Effects",
+    "lightroom.exe": "Adobe Lightroom",
+    "xd.exe": "Adobe XD",
+    "figma.exe": "Figma",
+    "canva.exe": "Canva",
+    "blender.exe": "Blender",
+    "resolve.exe": "DaVinci Resolve",
+    "chrome.exe": "Google Chrome",
+    "msedge.exe": "Microsoft Edge",
+    "firefox.exe": "Mozilla Firefox",
+    "brave.exe": "Brave",
+    "opera.exe": "Opera",
+    "code.exe": "Visual Studio Code",
+    "devenv.exe": "Visual Studio",
+    "pycharm64.exe": "PyCharm",
+    "idea64.exe": "IntelliJ IDEA",
+    "studio64.exe": "Android Studio",
+    "sublime_text.exe": "Sublime Text",
+    "winword.exe": "Microsoft Word",
+    "excel.exe": "Microsoft Excel",
+    "powerpnt.exe": "Microsoft PowerPoint",
+    "outlook.exe": "Microsoft Outlook",
+    "notepad.exe": "Notepad",
+    "notepad++.exe": "Notepad++",
+    "explorer.exe": "File Explorer",
+    "spotify.exe": "Spotify",
+    "discord.exe": "Discord",
+    "slack.exe": "Slack",
+    "teams.exe": "Microsoft Teams",
+    "ms-teams.exe": "Microsoft Teams",
+}
+
+# Hosts that run many different apps: the title says more than the exe
+HOST_EXECUTABLES = {
+    "applicationframehost.exe", "python.exe", "pythonw.exe",
+    "java.exe", "javaw.exe", "electron.exe",
+}
+
+def read_window_title(hwnd):
+    length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
+    buff = ctypes.create_unicode_buffer(length + 1)
+    ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
+    return buff.value
+
 def get_active_window_title():
     """Returns the title of the currently active window."""
     try:
         hwnd = ctypes.windll.user32.GetForegroundWindow()
-        length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-        buff = ctypes.create_unicode_buffer(length + 1)
-        ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-        title = buff.value
+        title = read_window_title(hwnd)
         return title if title else "Unknown"
     except Exception:
         return "Unknown"
 
-# --- PART 2: HISTORY MANAGER ---
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+def get_idle_seconds():
+    """Seconds since the last keyboard/mouse input (0 if unknown)."""
+    try:
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return 0
+        millis = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return millis / 1000.0
+    except Exception:
+        return 0
+
+def classify_title(title):
+    """Groups noisy window titles into an app name (fallback when the exe is unknown)."""
+    app_name = title
+
+    # 1. Adobe Illustrator / Photoshop Files (e.g. "Logo.ai @ 50%...")
+    if any(x in title for x in [".ai @", "(RGB/Preview)", "(CMYK/Preview)", "Adobe Illustrator"]):
+        app_name = "Adobe Illustrator"
+    elif any(x in title for x in [".psd @", "(RGB/8)", "(CMYK/8)", "Adobe Photoshop"]):
+        app_name = "Adobe Photoshop"
+    # 2. Browsers (Clean up tabs)
+    elif " - Google Chrome" in title:
+        app_name = "Google Chrome"
+    elif " - Microsoft Edge" in title:
+        app_name = "Microsoft Edge"
+    # 3. Code Editors
+    elif "Visual Studio Code" in title:
+        app_name = "Visual Studio Code"
+    # 4. Filter your own app
+    elif "Ikiflow" in title:
+        app_name = "Focus Timer"
+    # 5. Fallback: Clean standard " - " suffixes
+    elif " - " in title:
+        # Check if the suffix looks like an app name (usually the last part)
+        parts = title.split(" - ")
+        if len(parts) > 1:
+            potential_app = parts[-1]
+            # Avoid splitting filenames that use hyphens
+            if len(potential_app) < 40:
+                app_name = potential_app
+
+    return app_name
+
+class ActiveWindowProvider:
+    """
+    Foreground window sampler that also resolves the owning executable.
+    Process lookups are cached per window handle; an entry is dropped when
+    the handle gets reused by a different PID.
+    """
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    MAX_CACHE = 256
+
+    def __init__(self):
+        self.cache = {}  # {hwnd: [pid, exe, app_name]}
+
+    def sample(self):
+        try:
+            user32 = ctypes.windll.user32
+            hwnd = user32.GetForegroundWindow()
+            if not hwnd:
+                return WindowSample(0, 0, None, "Unknown")
+
+            pid = ctypes.c_ulong()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            exe = self.resolve_exe(hwnd, pid.value)
+            title = read_window_title(hwnd)
+            return WindowSample(hwnd, pid.value, exe, title if title else "Unknown")
+        except Exception:
+            return WindowSample(0, 0, None, "Unknown")
+
+    def resolve_exe(self, hwnd, pid):
+        entry = self.cache.get(hwnd)
+        if entry and entry[0] == pid:
+            return entry[1]
+
+        # New handle, or the handle now belongs to another process
+        exe = self.query_exe(pid)
+        if len(self.cache) >= self.MAX_CACHE:
+            self.cache.clear()
+        self.cache[hwnd] = [pid, exe, None]
+        return exe
+
+    def query_exe(self, pid):
+        if not pid:
+            return None
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None  # e.g. elevated processes
+        try:
+            size = ctypes.c_ulong(1024)
+            buff = ctypes.create_unicode_buffer(size.value)
+            if kernel32.QueryFullProcessImageNameW(handle, 0, buff, ctypes.byref(size)):
+                return os.path.basename(buff.value).lower()
+            return None
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def classify(self, sample):
+        """App name for a sample. Exe is the primary key, cached per handle."""
+        if not sample.exe or sample.exe in HOST_EXECUTABLES:
+            return classify_title(sample.title)
+
+        entry = self.cache.get(sample.hwnd)
+        if entry and entry[0] == sample.pid and entry[2]:
+            return entry[2]
+
+        app_name = KNOWN_EXECUTABLES.get(sample.exe)
+        if not app_name:
+            stem = Path(sample.exe).stem
+            app_name = stem[:1].upper() + stem[1:]
+        if entry and entry[0] == sample.pid:
+            entry[2] = app_name
+        return app_name
+
+    def invalidate(self, hwnd=None):
+        if hwnd is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(hwnd, None)
+
+# --- PART 2: APP USAGE SKETCH ---
+MAX_TRACKED_APPS = 12     # Hard cap on named apps stored per session
+MAX_APP_NAME_LEN = 60     # Long titles get cut so keys stay small
+OTHER_BUCKET = "Other"
+
+class AppUsageSketch:
+    """
+    Bounded app usage counter (Space-Saving heavy hitters).
+    Keeps at most `capacity` named apps. When a new app shows up and the
+    sketch is full, the smallest entry is evicted and the newcomer inherits
+    its count as error. Anything we can't attribute for sure goes to "Other",
+    so the totals always add up to the tracked time.
+    """
+    def __init__(self, capacity=MAX_TRACKED_APPS):
+        self.capacity = capacity
+        self.counts = {}   # {"App": upper bound of seconds}
+        self.errors = {}   # {"App": seconds inherited on takeover}
+        self.total = 0
+
+    def add(self, name, amount=1):
+        name = (name or "Unknown")[:MAX_APP_NAME_LEN]
+        self.total += amount
+
+        if name in self.counts:
+            self.counts[name] += amount
+        elif len(self.counts) < self.capacity:
+            self.counts[name] = amount
+            self.errors[name] = 0
+        else:
+            # Take over the smallest slot (K is tiny, a scan is fine)
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            del self.errors[victim]
+            self.counts[name] = floor + amount
+            self.errors[name] = floor
+
+    def as_dict(self):
+        """Guaranteed seconds per app, remainder folded into "Other"."""
+        result = {}
+        for name, count in self.counts.items():
+            sure = int(round(count - self.errors[name]))
+            if sure > 0:
+                result[name] = result.get(name, 0) + sure
+
+        other = int(round(self.total)) - sum(result.values())
+        if other > 0:
+            result[OTHER_BUCKET] = result.get(OTHER_BUCKET, 0) + other
+        return result
+
+    def __len__(self):
+        return len(self.counts)
+
+def cap_app_usage(app_data, limit=MAX_TRACKED_APPS):
+    """Keeps the top `limit` apps and folds the rest into "Other"."""
+    if len(app_data) <= limit:
+        return dict(app_data)
+
+    ranked = sorted(app_data.items(), key=lambda x: x[1], reverse=True)
+    capped = dict(ranked[:limit])
+    rest = sum(sec for _, sec in ranked[limit:])
+    capped[OTHER_BUCKET] = capped.get(OTHER_BUCKET, 0) + rest
+    return capped
+
+# --- PART 3: HISTORY MANAGER ---
 class HistoryManager:
     def __init__(self):
         # --- THE NUCLEAR OPTION: USER PROFILE FOLDER ---
@@ -57,7 +296,7 @@ class HistoryManager:
             except Exception as e:
                 self.show_error(f"Could not create file: {e}")
 
-    def save_session(self, duration_planned, duration_actual, break_duration, status, app_data):
+    def save_session(self, duration_planned, duration_actual, break_duration, status, app_data, events=None):
         # 1. Load existing
         history = []
         if self.filename.exists():
@@ -76,15 +315,18 @@ class HistoryManager:
             "focus_actual": duration_actual,
             "break_selected": break_duration,
             "status": status,
-            "app_usage": app_data
+            "app_usage": cap_app_usage(app_data)
         }
+        if events:
+            new_entry["events"] = events  # [[secs, event, arg?], ...] -> fold_events()
         
         history.append(new_entry)
         
-        # 3. Save Back
+        # 3. Save Back (one compact line per session: the event logs stay small)
         try:
             with open(self.filename, "w") as f:
-                json.dump(history, f, indent=4)
+                f.write("[\n" + ",\n".join(json.dumps(entry, separators=(",", ":"))
+                                           for entry in history) + "\n]\n")
             
             # --- POPUP CONFIRMATION ---
             # Once you see this working, add a # before the next line to silence it.
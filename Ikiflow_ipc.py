@@ -0,0 +1,84 @@
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer
+from Ikiflow_protocol import SERVER_NAME, LEGACY_SHOW, FrameReader, encode_frame
+from Ikiflow_ctl import request, NotRunning
+
+# --- 1. COMMAND SERVER ---
+
+class CommandServer(QObject):
+    """
+    Single-instance server. Each connection sends framed commands
+    (Ikiflow_protocol) and gets one reply frame per command from
+    handler(command) -> dict. The old raw b"SHOW_WINDOW" still works.
+    Listen as early as possible and set handler once the window exists.
+    """
+    def __init__(self, handler=None, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.readers = {}   # {QLocalSocket: FrameReader}
+        self.handled = 0
+        self.in_use = False  # listen() failed because another instance answers
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def listen(self):
+        """Call only after a client request (Ikiflow_ctl) found nobody listening."""
+        self.in_use = False
+        if self.server.listen(SERVER_NAME):
+            return True
+        # Taken: either a crashed instance left its socket file behind (Unix)
+        # or another launch got here first. Only remove a name nobody answers on
+        try:
+            request({"cmd": "status"})
+        except NotRunning:
+            QLocalServer.removeServer(SERVER_NAME)
+            return self.server.listen(SERVER_NAME)
+        except (OSError, ValueError):
+            pass  # listening but hung: still not ours to delete
+        self.in_use = True
+        return False
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.readers[socket] = FrameReader()
+            socket.readyRead.connect(lambda s=socket: self.on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self.drop(s))
+
+    def on_ready_read(self, socket):
+        reader = self.readers.get(socket)
+        if reader is None: return
+        data = socket.readAll().data()
+
+        if not reader.buffer and data.startswith(LEGACY_SHOW):
+            self.run({"cmd": "show"})
+            socket.disconnectFromServer()
+            return
+
+        try:
+            messages = reader.feed(data)
+        except ValueError as e:  # garbage: answer once and hang up
+            socket.write(encode_frame({"ok": False, "error": str(e)}))
+            socket.flush()
+            socket.disconnectFromServer()
+            return
+
+        for message in messages:
+            socket.write(encode_frame(self.run(message)))
+        if messages:
+            socket.flush()
+
+    def run(self, command):
+        self.handled += 1
+        if self.handler is None:  # listening, window not built yet
+            return {"ok": False, "error": "Ikiflow is starting"}
+        try:
+            return self.handler(command)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def drop(self, socket):
+        self.readers.pop(socket, None)
+        socket.deleteLater()
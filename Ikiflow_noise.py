@@ -0,0 +1,127 @@
+import numpy as np
+
+# --- 1. ONE-POLE FILTERS, VECTORIZED ---
+# y[n] = a * y[n-1] + g * x[n], run over a whole block without a Python loop:
+# inside a chunk of C samples, y[j] = a^(j+1) * (y0 + cumsum(g * x[k] / a^(k+1))[j]).
+# C is kept small enough that 1 / |a|^C can't overflow for the poles we use.
+
+CHUNK = 256
+
+class OnePole:
+    __slots__ = ("gain", "state", "powers", "inverse")
+
+    def __init__(self, pole, gain):
+        self.gain = gain
+        self.state = 0.0
+        self.powers = pole ** np.arange(1, CHUNK + 1, dtype=np.float64)
+        self.inverse = 1.0 / self.powers
+
+    def run(self, x, out):
+        """Filter x into out (same length); the state carries over, so blocks join seamlessly."""
+        for start in range(0, len(x), CHUNK):
+            stop = min(start + CHUNK, len(x))
+            n = stop - start
+            acc = np.cumsum(x[start:stop] * self.inverse[:n])
+            acc *= self.gain
+            acc += self.state
+            acc *= self.powers[:n]
+            out[start:stop] = acc
+            self.state = acc[-1]
+        return out
+
+# --- 2. NOISE COLORS ---
+
+# Paul Kellet's pink filter: six one-poles + a direct path + one-sample delay
+PINK_POLES = ((0.99886, 0.0555179), (0.99332, 0.0750759), (0.96900, 0.1538520),
+              (0.86650, 0.3104856), (0.55000, 0.5329522), (-0.7616, -0.0168980))
+PINK_DIRECT, PINK_DELAYED, PINK_SCALE = 0.5362, 0.115926, 0.11
+
+BROWN_POLE = 1 / 1.02        # leaky integrator: no DC drift, no clipping walk
+BROWN_GAIN = 0.02 / 1.02
+BROWN_SCALE = 3.5
+
+WHITE_SCALE = 0.25
+
+COLORS = ("brown", "pink", "white")
+
+class NoiseGenerator:
+    """
+    Endless noise, synthesized block by block. All filter state carries
+    across blocks, so there is no loop point and no seam. Scratch buffers
+    are allocated once for max_block samples.
+    """
+    def __init__(self, color="brown", max_block=4096, seed=None):
+        if color not in COLORS:
+            raise ValueError(f"unknown noise color: {color}")
+        self.color = color
+        self.rng = np.random.default_rng(seed)
+        self.white = np.empty(max_block)
+        self.mix = np.empty(max_block)
+        self.scratch = np.empty(max_block)
+
+        self.brown = OnePole(BROWN_POLE, BROWN_GAIN)
+        self.pink = [OnePole(pole, gain) for pole, gain in PINK_POLES]
+        self.pink_last = 0.0    # previous white sample (delayed path)
+
+    def block(self, n):
+        """-> n float64 samples in [-1, 1] (a view into an internal buffer)."""
+        white = self.white[:n]
+        mix = self.mix[:n]
+        self.rng.standard_normal(out=white)
+        white *= 0.5  # ~N(0, 0.25): like the uniform [-1, 1] the filters were tuned for
+
+        if self.color == "white":
+            np.multiply(white, WHITE_SCALE, out=mix)
+        elif self.color == "brown":
+            self.brown.run(white, mix)
+            mix *= BROWN_SCALE
+        else:
+            scratch = self.scratch[:n]
+            np.multiply(white, PINK_DIRECT, out=mix)
+            for stage in self.pink:
+                mix += stage.run(white, scratch)
+            mix[0] += self.pink_last * PINK_DELAYED
+            mix[1:] += white[:-1] * PINK_DELAYED
+            self.pink_last = white[-1]
+            mix *= PINK_SCALE
+
+        np.clip(mix, -1.0, 1.0, out=mix)
+        return mix
+
+# --- 3. RING BUFFER ---
+
+class RingBuffer:
+    """Fixed int16 ring between the generator and the audio sink (constant memory)."""
+    def __init__(self, capacity):
+        self.data = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.read_at = 0
+        self.size = 0
+
+    def free(self):
+        return self.capacity - self.size
+
+    def clear(self):
+        self.read_at = 0
+        self.size = 0
+
+    def write(self, samples):
+        """samples: floats in [-1, 1]. Caller keeps len(samples) <= free()."""
+        n = len(samples)
+        start = (self.read_at + self.size) % self.capacity
+        first = min(n, self.capacity - start)
+        np.multiply(samples[:first], 32767, out=self.data[start:start + first], casting="unsafe")
+        if first < n:
+            np.multiply(samples[first:], 32767, out=self.data[:n - first], casting="unsafe")
+        self.size += n
+
+    def read(self, n):
+        """-> up to n samples as little-endian int16 bytes."""
+        n = min(n, self.size)
+        first = min(n, self.capacity - self.read_at)
+        chunk = self.data[self.read_at:self.read_at + first].tobytes()
+        if first < n:
+            chunk += self.data[:n - first].tobytes()
+        self.read_at = (self.read_at + n) % self.capacity
+        self.size -= n
+        return chunk
@@ -0,0 +1,59 @@
+import json
+import struct
+
+# --- 1. WIRE FORMAT ---
+# Stdlib only: shared by the Qt server (Ikiflow_ipc) and script clients.
+# One frame = 4-byte big-endian length + UTF-8 JSON object.
+#   request: {"cmd": "start", "minutes": 25}
+#   reply:   {"ok": true, ...} / {"ok": false, "error": "..."}
+
+SERVER_NAME = "Ikiflow_SingleInstance"
+LEGACY_SHOW = b"SHOW_WINDOW"   # what builds before the protocol sent
+MAX_FRAME = 64 * 1024
+HEADER = struct.Struct(">I")
+
+COMMANDS = ("show", "start", "pause", "resume", "stop", "status", "stats")
+
+def encode_frame(message):
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+class FrameReader:
+    """Buffers stream bytes; feed() returns every complete message so far."""
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data):
+        self.buffer += data
+        messages = []
+        while len(self.buffer) >= HEADER.size:
+            (size,) = HEADER.unpack_from(self.buffer)
+            if size > MAX_FRAME:
+                raise ValueError(f"frame too large ({size} bytes)")
+            end = HEADER.size + size
+            if len(self.buffer) < end:
+                break
+            message = json.loads(self.buffer[HEADER.size:end].decode("utf-8"))
+            if not isinstance(message, dict):
+                raise ValueError("frame is not a JSON object")
+            messages.append(message)
+            self.buffer = self.buffer[end:]
+        return messages
+
+# --- 2. COMMAND LINE ---
+
+def parse_command(argv):
+    """
+    Launch arguments -> command for the running instance.
+        --start [MINUTES]   --pause   --resume   --stop   --status   --stats
+    Anything else (plain launch, --silent, Qt flags) means "show".
+    """
+    for i, arg in enumerate(argv):
+        name = arg[2:] if arg.startswith("--") else None
+        if name not in COMMANDS:
+            continue
+        command = {"cmd": name}
+        if name == "start" and i + 1 < len(argv) and argv[i + 1].isdigit():
+            command["minutes"] = int(argv[i + 1])
+        return command
+    return {"cmd": "show"}
@@ -0,0 +1,209 @@
+import time
+from PySide6.QtCore import Qt, QObject, QTimer, QEvent, QRectF, Signal
+from PySide6.QtGui import QBrush, QColor, QImage, QPainter, QPainterPath, QPen, QPixmap
+from PySide6.QtWidgets import QGraphicsBlurEffect, QGraphicsScene, QWidget
+from Ikiflow_context import WakeupMeter
+
+# --- 1. VIEWS ---
+
+class RenderView:
+    """One thing on screen (label text, bar value, ...) and how to push a value into it."""
+    __slots__ = ("widget", "apply", "shown", "pending", "dirty")
+
+    def __init__(self, widget, apply):
+        self.widget = widget
+        self.apply = apply
+        self.shown = None     # value currently on screen
+        self.pending = None   # latest value asked for
+        self.dirty = False
+
+    def is_visible(self):
+        window = self.widget.window()
+        return self.widget.isVisible() and not window.isMinimized()
+
+# --- 2. RENDER LAYER ---
+
+class RenderLayer(QObject):
+    """
+    Every producer (tick, transitions, ...) calls set(name, value).
+    - unchanged values are dropped
+    - hidden/minimized views stay dirty and catch up when shown
+    - everything dirty is applied in one flush, at most once per frame,
+      so Qt paints each window once instead of once per setText
+    Repaints are counted from the windows' UpdateRequest events.
+    visibility_changed fires (once per burst) when a view's window is
+    shown, hidden, minimized or restored.
+    """
+    visibility_changed = Signal()
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.views = {}
+        self.windows = set()
+        self.last_flush = 0.0
+
+        self.repaints = WakeupMeter(window=10.0)
+        self.applied = 0
+        self.skipped_same = 0
+        self.skipped_hidden = 0
+
+        self.frame = QTimer(self)
+        self.frame.setSingleShot(True)
+        self.frame.timeout.connect(self.flush)
+
+        # Show/Hide arrive before the window is fully (un)mapped; look after the burst
+        self.visibility = QTimer(self)
+        self.visibility.setSingleShot(True)
+        self.visibility.timeout.connect(self.visibility_changed.emit)
+
+    def register(self, name, widget, apply):
+        """Also used to re-point a view at another widget (e.g. overlay screens changed)."""
+        old = self.views.get(name)
+        self.views[name] = RenderView(widget, apply)
+        if old is not None:
+            self.views[name].pending = old.pending
+            self.views[name].dirty = old.pending is not None
+            self.forget(old.widget)
+
+        widget.installEventFilter(self)  # Show -> catch up
+        window = widget.window()
+        if window not in self.windows:
+            self.windows.add(window)
+            window.installEventFilter(self)
+
+    def forget(self, widget):
+        # Stop counting repaints of a window no view uses anymore
+        try:
+            window = widget.window()
+        except RuntimeError:  # already deleted
+            self.windows = {w for w in self.windows if w is not widget}
+            return
+        if all(v.widget.window() is not window for v in self.views.values()):
+            self.windows.discard(window)
+
+    def set(self, name, value):
+        view = self.views[name]
+        if value == view.shown and not view.dirty:
+            self.skipped_same += 1
+            return
+        view.pending = value
+        view.dirty = value != view.shown
+        if view.dirty:
+            self.schedule()
+
+    def schedule(self):
+        if self.frame.isActive(): return
+        since = (time.monotonic() - self.last_flush) * 1000
+        self.frame.start(max(0, int(self.FRAME_MS - since)))
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        for view in self.views.values():
+            if not view.dirty: continue
+            if not view.is_visible():
+                self.skipped_hidden += 1
+                continue
+            view.apply(view.pending)
+            view.shown = view.pending
+            view.dirty = False
+            self.applied += 1
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.UpdateRequest and obj in self.windows:
+            self.repaints.hit()
+        elif kind == QEvent.Show:
+            if any(v.dirty for v in self.views.values()):
+                self.schedule()
+        if obj in self.windows and kind in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+            self.visibility.start(0)
+        return False
+
+    def any_visible(self):
+        """False when nothing we draw is on screen (tray-only)."""
+        return any(view.is_visible() for view in self.views.values())
+
+    def stats(self):
+        return {
+            "repaints": self.repaints.total,
+            "repaints_per_s": round(self.repaints.per_minute() / 60, 2),
+            "views_applied": self.applied,
+            "skipped_unchanged": self.skipped_same,
+            "skipped_hidden": self.skipped_hidden,
+        }
+
+# --- 3. CARD SHADOWS ---
+# A QGraphicsDropShadowEffect re-renders the whole card offscreen on every
+# update (1 Hz timer label included). Instead the shadow is rendered once per
+# look into a small nine-slice pixmap and stretched around the card.
+
+SHADOW_COLOR = QColor(0, 0, 0, 40)
+SHADOW_CACHE = {}  # {(radius, blur, rgba): QPixmap}
+
+def shadow_pixmap(radius, blur=20, color=SHADOW_COLOR):
+    """Blurred rounded rect just big enough for its corners: (2 * (blur + radius) + 1)^2 px."""
+    key = (radius, blur, color.rgba())
+    pix = SHADOW_CACHE.get(key)
+    if pix is not None:
+        return pix
+
+    size = 2 * (blur + radius) + 1
+    body = QPainterPath()
+    body.addRoundedRect(QRectF(blur, blur, size - 2 * blur, size - 2 * blur), radius, radius)
+
+    scene = QGraphicsScene(0, 0, size, size)
+    item = scene.addPath(body, QPen(Qt.NoPen), QBrush(color))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+    painter.end()
+
+    pix = QPixmap.fromImage(image)
+    SHADOW_CACHE[key] = pix
+    return pix
+
+def draw_nine_slice(painter, pix, target, corner):
+    """Stretch pix over target, corners kept 1:1, centre skipped (the card covers it)."""
+    w, h = pix.width(), pix.height()
+    sx = (0, corner, w - corner, w)
+    sy = (0, corner, h - corner, h)
+    tx = (target.left(), target.left() + corner, target.right() - corner, target.right())
+    ty = (target.top(), target.top() + corner, target.bottom() - corner, target.bottom())
+    for row in range(3):
+        for col in range(3):
+            if row == 1 and col == 1:
+                continue
+            painter.drawPixmap(QRectF(tx[col], ty[row], tx[col + 1] - tx[col], ty[row + 1] - ty[row]),
+                               pix,
+                               QRectF(sx[col], sy[row], sx[col + 1] - sx[col], sy[row + 1] - sy[row]))
+
+def draw_card_shadow(painter, card_rect, radius, blur=20, offset_y=5, color=SHADOW_COLOR):
+    pix = shadow_pixmap(radius, blur, color)
+    target = QRectF(card_rect).adjusted(-blur, -blur + offset_y, blur, blur + offset_y)
+    draw_nine_slice(painter, pix, target, blur + radius)
+
+class ShadowHost(QWidget):
+    """Parent that paints a cached shadow under its `card` child."""
+    def __init__(self, radius, parent=None):
+        super().__init__(parent)
+        self.radius = radius
+        self.card = None
+
+    def paintEvent(self, event):
+        if self.card is None or not self.card.isVisible():
+            return
+        card = self.card.geometry()
+        # Repaints inside the card (timer label) never touch the shadow
+        inner = card.adjusted(self.radius, self.radius, -self.radius, -self.radius)
+        if inner.contains(event.rect()):
+            return
+        painter = QPainter(self)
+        draw_card_shadow(painter, card, self.radius)
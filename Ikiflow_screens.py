@@ -0,0 +1,111 @@
+from PySide6.QtCore import QObject, QPoint, Signal
+from PySide6.QtWidgets import QApplication
+
+# --- 1. SCREEN EDGE INDEX ---
+
+class ScreenIndex(QObject):
+    """
+    Available geometry of every monitor, cached and refreshed only when Qt
+    reports a screen being added/removed or resized. Snapping a window does
+    a lookup in the screen it was on last (crossing monitors is the only
+    time we scan), then compares against that screen's four edges.
+    """
+    changed = Signal()
+
+    SNAP = 20  # px
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.edges = []   # [(left, top, right, bottom)] exclusive right/bottom
+        self.key = ""
+        self.last = 0     # index of the screen hit by the previous lookup
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(lambda _screen: self.refresh())
+        for screen in app.screens():
+            self.watch(screen)
+        self.refresh()
+
+    def watch(self, screen):
+        screen.geometryChanged.connect(lambda _rect: self.refresh())
+        screen.availableGeometryChanged.connect(lambda _rect: self.refresh())
+
+    def on_screen_added(self, screen):
+        self.watch(screen)
+        self.refresh()
+
+    def refresh(self):
+        screens = QApplication.screens()
+        self.edges = []
+        for screen in screens:
+            g = screen.availableGeometry()
+            self.edges.append((g.x(), g.y(), g.x() + g.width(), g.y() + g.height()))
+        # Same monitors in any order -> same layout key
+        full = sorted((s.geometry().getRect() for s in screens))
+        self.key = "_".join(f"{w}x{h}+{x}+{y}" for x, y, w, h in full)
+        self.last = 0
+        self.changed.emit()
+
+    # --- Lookups ---
+    def layout_key(self):
+        return self.key
+
+    def screen_at(self, x, y):
+        """Index of the screen containing (x, y), or the nearest one."""
+        if not self.edges:
+            return None
+        l, t, r, b = self.edges[self.last]
+        if l <= x < r and t <= y < b:
+            return self.last
+
+        best, best_dist = 0, None
+        for i, (l, t, r, b) in enumerate(self.edges):
+            dx = max(l - x, 0, x - r + 1)
+            dy = max(t - y, 0, y - b + 1)
+            dist = dx * dx + dy * dy
+            if dist == 0:
+                best = i
+                break
+            if best_dist is None or dist < best_dist:
+                best, best_dist = i, dist
+        self.last = best
+        return best
+
+    def snap(self, pos, size):
+        """
+        -> (QPoint, edges). Sticks the window to any edge or corner of the
+        monitor under its centre; edges is a tuple like ("left", "top").
+        """
+        w, h = size.width(), size.height()
+        i = self.screen_at(pos.x() + w // 2, pos.y() + h // 2)
+        if i is None:
+            return QPoint(pos), ()
+
+        l, t, r, b = self.edges[i]
+        x, y = pos.x(), pos.y()
+        edges = []
+        if abs(x - l) < self.SNAP:
+            x = l
+            edges.append("left")
+        elif abs(x + w - r) < self.SNAP:
+            x = r - w
+            edges.append("right")
+        if abs(y - t) < self.SNAP:
+            y = t
+            edges.append("top")
+        elif abs(y + h - b) < self.SNAP:
+            y = b - h
+            edges.append("bottom")
+        return QPoint(x, y), tuple(edges)
+
+    def clamp(self, pos, size):
+        """Keep a restored window fully on the nearest monitor."""
+        w, h = size.width(), size.height()
+        i = self.screen_at(pos.x() + w // 2, pos.y() + h // 2)
+        if i is None:
+            return QPoint(pos)
+        l, t, r, b = self.edges[i]
+        x = min(max(pos.x(), l), max(l, r - w))
+        y = min(max(pos.y(), t), max(t, b - h))
+        return QPoint(x, y)
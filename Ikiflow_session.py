@@ -0,0 +1,203 @@
+from collections import namedtuple
+from Ikiflow_timer import DeadlineTimer, monotonic
+
+# --- 1. STATES & EVENTS ---
+
+IDLE    = "idle"
+FOCUS   = "focus"
+PAUSED  = "paused"
+CHECKIN = "checkin"   # 00:00 reached, waiting for "Did you finish?"
+BREAK   = "break"
+
+START  = "start"
+PAUSE  = "pause"
+RESUME = "resume"
+EXPIRE = "expire"     # countdown hit 00:00 (focus -> check-in, break -> focus)
+EXTEND = "extend"
+TAKE_BREAK = "take_break"
+STOP   = "stop"
+
+# (state, event) -> next state. RESUME goes back to wherever we paused from.
+TRANSITIONS = {
+    (IDLE, START): FOCUS,
+    (FOCUS, PAUSE): PAUSED,
+    (BREAK, PAUSE): PAUSED,
+    (PAUSED, RESUME): None,
+    (FOCUS, EXPIRE): CHECKIN,
+    (BREAK, EXPIRE): FOCUS,
+    (FOCUS, EXTEND): FOCUS,
+    (CHECKIN, EXTEND): FOCUS,
+    (CHECKIN, TAKE_BREAK): BREAK,
+    (FOCUS, STOP): IDLE,
+    (PAUSED, STOP): IDLE,
+    (CHECKIN, STOP): IDLE,
+    (BREAK, STOP): IDLE,
+}
+
+Transition = namedtuple("Transition", "event old new data")
+
+# --- 2. EVENT LOG ---
+
+class SessionLog:
+    """
+    Append-only log of one focus block, kept compact for history.json:
+        [[seconds_since_start, event], [seconds_since_start, event, arg], ...]
+    """
+    def __init__(self, origin=0.0):
+        self.origin = origin
+        self.events = []
+
+    def append(self, at, event, arg=None):
+        entry = [round(at - self.origin, 1), event]
+        if arg is not None:
+            entry.append(arg)
+        self.events.append(entry)
+
+def fold_events(events):
+    """One pass over a session log -> focus / pause / extension totals (seconds)."""
+    totals = {"planned_s": 0, "focus_s": 0.0, "paused_s": 0.0, "checkin_s": 0.0,
+              "extended_s": 0, "pauses": 0, "extensions": 0}
+    state, since = None, 0.0
+
+    for entry in events:
+        at, event = entry[0], entry[1]
+        arg = entry[2] if len(entry) > 2 else 0
+
+        # 1. Charge the time since the previous event to the state we were in
+        if state == FOCUS:     totals["focus_s"] += at - since
+        elif state == PAUSED:  totals["paused_s"] += at - since
+        elif state == CHECKIN: totals["checkin_s"] += at - since
+
+        # 2. Move on
+        if event == START:
+            totals["planned_s"] = arg
+            state = FOCUS
+        elif event == PAUSE:
+            totals["pauses"] += 1
+            state = PAUSED
+        elif event in (RESUME, EXTEND):
+            if event == EXTEND:
+                totals["extended_s"] += arg
+                totals["extensions"] += 1
+            state = FOCUS
+        elif event == EXPIRE:
+            state = CHECKIN
+        else:  # TAKE_BREAK / STOP close the block
+            state = None
+        since = at
+
+    for key in ("focus_s", "paused_s", "checkin_s"):
+        totals[key] = round(totals[key], 1)
+    return totals
+
+# --- 3. SESSION MACHINE ---
+
+class SessionMachine:
+    """
+    Headless focus -> check-in -> extend/break -> focus loop.
+    No Qt in here: the UI calls the event methods, drives poll() from its
+    own timer and subscribes to transitions. Invalid events are ignored
+    (the method returns None). Every transition of the current focus block
+    is appended to self.log before observers hear about it.
+    """
+    def __init__(self, clock=monotonic):
+        self.clock = clock
+        self.countdown = DeadlineTimer(clock)
+        self.state = IDLE
+        self.paused_from = None
+        self.focus_seconds = 0
+        self.break_seconds = 0
+        self.log = SessionLog()
+        self.observers = []
+
+    # --- Observers ---
+    def subscribe(self, callback):
+        self.observers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.observers:
+            self.observers.remove(callback)
+
+    # --- Queries ---
+    def can(self, event):
+        return (self.state, event) in TRANSITIONS
+
+    @property
+    def phase(self):
+        """FOCUS/BREAK even while paused."""
+        return self.paused_from if self.state == PAUSED else self.state
+
+    # --- Events ---
+    def start(self, focus_seconds, break_seconds=0):
+        if not self.can(START): return None
+        self.focus_seconds = focus_seconds
+        self.break_seconds = break_seconds
+        self.countdown.start(focus_seconds)
+        return self.go(START)
+
+    def pause(self):
+        if not self.can(PAUSE): return None
+        self.paused_from = self.state
+        self.countdown.pause()
+        return self.go(PAUSE)
+
+    def resume(self):
+        if not self.can(RESUME): return None
+        self.countdown.resume()
+        return self.go(RESUME, self.paused_from)
+
+    def extend(self, seconds):
+        if not self.can(EXTEND): return None
+        self.countdown.extend(seconds)
+        return self.go(EXTEND, seconds=seconds)
+
+    def take_break(self, break_seconds=None):
+        if not self.can(TAKE_BREAK): return None
+        if break_seconds is not None:
+            self.break_seconds = break_seconds
+        focus_total = self.countdown.total
+        self.countdown.start(self.break_seconds)
+        return self.go(TAKE_BREAK, focus_total=focus_total)
+
+    def stop(self):
+        if not self.can(STOP): return None
+        phase = self.phase
+        data = {"phase": phase, "total": self.countdown.total, "elapsed": self.countdown.elapsed()}
+        self.countdown.stop()
+        return self.go(STOP, **data)
+
+    def poll(self):
+        """Call on every wake. Fires EXPIRE when the countdown is done."""
+        if self.state not in (FOCUS, BREAK) or not self.countdown.expired():
+            return None
+        if self.state == BREAK:
+            self.countdown.start(self.focus_seconds)  # loop back into focus
+            return self.go(EXPIRE)
+        # Focus really ended at the deadline, not when we noticed
+        return self.go(EXPIRE, at=self.countdown.deadline)
+
+    # --- Internals ---
+    def go(self, event, new=None, at=None, **data):
+        old = self.state
+        self.state = new or TRANSITIONS[(old, event)]
+        if self.state != PAUSED:
+            self.paused_from = None
+
+        data["at"] = self.clock() if at is None else at
+        self.record(event, old, data)
+
+        transition = Transition(event, old, self.state, data)
+        for callback in list(self.observers):
+            callback(transition)
+        return transition
+
+    def record(self, event, old, data):
+        at = data["at"]
+        if event == START or (event == EXPIRE and old == BREAK):
+            # New focus block -> new log
+            self.log = SessionLog(at)
+            self.log.append(at, START, self.focus_seconds)
+        elif event == EXTEND:
+            self.log.append(at, EXTEND, data["seconds"])
+        else:
+            self.log.append(at, event)
@@ -1,14 +1,11 @@
-import os
-from pathlib import Path
+import re
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QPushButton, QComboBox, QButtonGroup, QScrollArea, 
-                               QGroupBox, QCheckBox, QLineEdit, QFormLayout, 
-                               QFrame, QGraphicsDropShadowEffect, QScrollBar,
-                               QGridLayout, QSizePolicy) 
+                               QCheckBox, QLineEdit, QFrame, QGridLayout, QSizePolicy) 
 from PySide6.QtCore import (Qt, Signal, QRectF, QPoint, QPropertyAnimation, 
-                            QEasingCurve, QSettings, QTimer, QAbstractAnimation, 
-                            QParallelAnimationGroup)
-from PySide6.QtGui import QColor, QPainter, QPen, QFont, QCursor
+                            QEasingCurve, QAbstractAnimation)
+from PySide6.QtGui import QColor, QPainter, QPen, QFont
+from Ikiflow_config import get_config
 
 # --- CONSTANTS ---
 ACCENT       = "#0984E3"  
@@ -44,6 +41,67 @@ SUPPORTED_APPS = [
     "Notepad", "Notepad++"
 ]
 
+# Executable -> SUPPORTED_APPS entry (primary key for auto-start detection)
+SUPPORTED_APP_EXECUTABLES = {
+    "illustrator.exe": "Adobe Illustrator", "photoshop.exe": "Photoshop",
+    "indesign.exe": "InDesign", "adobe premiere pro.exe": "Premiere",
+    "afterfx.exe": "After Effects", "lightroom.exe": "Lightroom",
+    "xd.exe": "Adobe XD", "blender.exe": "Blender", "figma.exe": "Figma",
+    "canva.exe": "Canva", "resolve.exe": "DaVinci Resolve",
+
+    "unity.exe": "Unity", "unrealeditor.exe": "Unreal Editor",
+    "ue4editor.exe": "Unreal Editor", "maya.exe": "Maya", "3dsmax.exe": "3ds Max",
+    "cinema 4d.exe": "Cinema 4D", "acad.exe": "AutoCAD", "sldworks.exe": "SolidWorks",
+
+    "code.exe": "Visual Studio Code", "devenv.exe": "Visual Studio",
+    "pycharm64.exe": "PyCharm", "idea64.exe": "IntelliJ IDEA",
+    "studio64.exe": "Android Studio", "sublime_text.exe": "Sublime Text",
+    "webstorm64.exe": "WebStorm", "godot.exe": "Godot",
+
+    "winword.exe": "Microsoft Word", "excel.exe": "Microsoft Excel",
+    "powerpnt.exe": "Microsoft PowerPoint", "notion.exe": "Notion",
+    "obsidian.exe": "Obsidian", "evernote.exe": "Evernote",
+    "scrivener.exe": "Scrivener", "notepad.exe": "Notepad", "notepad++.exe": "Notepad++",
+}
+
+class TriggerMatcher:
+    """
+    In-memory set of enabled auto-start apps.
+    Loaded once, then kept in sync by subscribing to the store's app_triggers.
+    Detection is one dict hit on the exe, or one compiled regex search on the title.
+    """
+    def __init__(self, enabled=()):
+        self.enabled = set(enabled)
+        self.compile()
+
+    @classmethod
+    def from_config(cls, config):
+        matcher = cls()
+        matcher.load(config.get("app_triggers"))
+        config.subscribe("app_triggers", matcher.load)
+        return matcher
+
+    def load(self, app_names):
+        self.enabled = {app for app in app_names if app in SUPPORTED_APPS}
+        self.compile()
+
+    def compile(self):
+        # Longest first so "Notepad++" wins over "Notepad"
+        names = sorted(self.enabled, key=len, reverse=True)
+        self.by_lower = {name.lower(): name for name in names}
+        self.pattern = None
+        if names:
+            self.pattern = re.compile("|".join(re.escape(n) for n in names), re.IGNORECASE)
+
+    def match(self, title, exe=None):
+        app_name = SUPPORTED_APP_EXECUTABLES.get(exe)
+        if app_name in self.enabled:
+            return app_name
+        if self.pattern is None or not title:
+            return None
+        found = self.pattern.search(title)
+        return self.by_lower[found.group(0).lower()] if found else None
+
 # --- 0. COLLAPSIBLE BOX (The new feature) ---
 class CollapsibleBox(QWidget):
     def __init__(self, title="", parent=None):
@@ -51,11 +109,7 @@ class CollapsibleBox(QWidget):
         
         # Toggle Button
         self.toggle_button = QPushButton(title)
-        self.toggle_button.setStyleSheet("""
-            QPushButton { text-align: left; background: transparent; border: none; font-weight: bold; color: #636E72; padding: 5px; }
-            QPushButton:hover { color: #0984E3; }
-            QPushButton:checked { color: #2D3436; }
-        """)
+        self.toggle_button.setObjectName("CollapsibleToggle")
         self.toggle_button.setCheckable(True)
         self.toggle_button.setChecked(False)
         self.toggle_button.setCursor(Qt.PointingHandCursor)
@@ -72,6 +126,7 @@ class CollapsibleBox(QWidget):
         self.lay.setContentsMargins(0, 0, 0, 0)
         self.lay.addWidget(self.toggle_button)
         self.lay.addWidget(self.content_area)
+        self.content_factory = None  # builds the layout on first expand
         
         # Animation
         self.anim = QPropertyAnimation(self.content_area, b"maximumHeight")
@@ -81,7 +136,14 @@ class CollapsibleBox(QWidget):
     def set_content_layout(self, layout):
         self.content_area.setLayout(layout)
 
+    def set_content_factory(self, factory):
+        """Like set_content_layout, but nothing is built until the box is opened."""
+        self.content_factory = factory
+
     def on_pressed(self):
+        if self.content_area.layout() is None and self.content_factory:
+            self.set_content_layout(self.content_factory())
+            self.content_factory = None
         checked = self.toggle_button.isChecked()
         self.toggle_button.setText("▼ " + self.toggle_button.text()[2:] if checked else "▶ " + self.toggle_button.text()[2:])
         
@@ -210,12 +272,12 @@ class SettingCard(QWidget):
         self.main_layout.setSpacing(15)
         
         lbl_title = QLabel(title)
-        lbl_title.setStyleSheet("font-size: 14px; font-weight: bold; color: #0984E3; border: none; background: transparent;")
+        lbl_title.setObjectName("CardTitle")
         self.main_layout.addWidget(lbl_title)
         
         line = QFrame()
         line.setFixedHeight(1)
-        line.setStyleSheet("background-color: #F0F0F0; border: none;")
+        line.setObjectName("CardDivider")
         self.main_layout.addWidget(line)
 
     def paintEvent(self, event):
@@ -236,29 +298,16 @@ class SettingCard(QWidget):
 
 class SettingsTab(QWidget):
     preview_toggled = Signal()
-    widget_style_updated = Signal(int, int, str)
-    widget_props_updated = Signal(int, int) 
     overlay_text_updated = Signal(str)
     feedback_clicked = Signal()
-    
-    preferences = {
-        "minimize_to_tray": True,
-        "sound_enabled": True,
-        "auto_start_break": False
-    }
 
     def __init__(self):
         super().__init__()
         
-        # --- SAFE MODE: Save settings to 'config.ini' in User Profile ---
-        # Path: C:\Users\YourName\Ikiflow_Data\config.ini
-        base_path = Path(os.environ['USERPROFILE']) / "Ikiflow_Data"
-        # Ensure the folder exists (it should, but just in case)
-        base_path.mkdir(parents=True, exist_ok=True)
-        ini_path = base_path / "config.ini"
-        
-        # Initialize Settings with Explicit File Path
-        self.settings = QSettings(str(ini_path), QSettings.IniFormat)
+        # Shared in-memory config (Ikiflow_config): slider drags hit memory,
+        # disk sees one write after the drag. The floater and the trigger
+        # matcher subscribe to the keys they care about
+        self.config = get_config()
         
         self.init_ui()
         self.load_settings()
@@ -270,17 +319,10 @@ class SettingsTab(QWidget):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet("""
-            QScrollArea { background: transparent; border: none; }
-            QScrollBar:vertical { border: none; background: transparent; width: 6px; margin: 0px 0px 0px 0px; }
-            QScrollBar::handle:vertical { background: #D0D0D0; border-radius: 3px; min-height: 20px; }
-            QScrollBar::handle:vertical:hover { background: #B0B0B0; }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
-        """)
+        scroll.setObjectName("SettingsScroll")  # Styles live in Ikiflow_theme
         
         content_widget = QWidget()
-        content_widget.setStyleSheet("background: transparent;") 
+        content_widget.setObjectName("SettingsContent")
         content_layout = QVBoxLayout(content_widget)
         content_layout.setSpacing(20) 
         content_layout.setContentsMargins(5, 5, 5, 5) 
@@ -292,13 +334,9 @@ class SettingsTab(QWidget):
         row_style.addWidget(QLabel("Style Preset:"))
         
         self.combo_style = QComboBox()
-        self.combo_style.setStyleSheet("""
-            QComboBox { padding: 5px; border: 1px solid #DFE6E9; border-radius: 5px; background-color: #F8F9FA; padding-right: 28px; }
-            QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left: 1px solid #DFE6E9; background: transparent; }
-            QComboBox QAbstractItemView { background-color: #FFFFFF; color: #2D3436; selection-background-color: #F1F2F6; selection-color: #0984E3; border: 1px solid #E0E0E0; outline: none; }
-        """)
+        self.combo_style.setObjectName("StylePreset")
         self.combo_style.addItems(["Standard Pill", "Modern Box", "Minimal Text", "Bold & Barless", "Glass Panel"])
-        self.combo_style.currentIndexChanged.connect(self.emit_design_update)
+        self.combo_style.currentIndexChanged.connect(self.save_design)
         row_style.addWidget(self.combo_style, 1)
         card_visuals.add_layout(row_style)
 
@@ -308,7 +346,7 @@ class SettingsTab(QWidget):
         colors = [("#0984E3", True), ("#E17055", False), ("#00B894", False), ("#2D3436", False), ("#FFFFFF", False)]
         for hex_code, active in colors:
             btn = ColorPresetButton(hex_code, active)
-            btn.clicked.connect(self.emit_design_update)
+            btn.clicked.connect(self.save_design)
             self.color_group.addButton(btn)
             row_color.addWidget(btn)
         row_color.addStretch()
@@ -316,21 +354,21 @@ class SettingsTab(QWidget):
 
         card_visuals.add_widget(QLabel("Corner Roundness"))
         self.slider_round = ModernSettingsSlider(0, 100, 50, "%")
-        self.slider_round.valueChanged.connect(self.emit_design_update)
+        self.slider_round.valueChanged.connect(self.save_design)
         card_visuals.add_widget(self.slider_round)
 
         card_visuals.add_widget(QLabel("Size Scale"))
         self.slider_scale = ModernSettingsSlider(30, 150, 100, "%")
-        self.slider_scale.valueChanged.connect(self.emit_props_update)
+        self.slider_scale.valueChanged.connect(self.save_props)
         card_visuals.add_widget(self.slider_scale)
 
         card_visuals.add_widget(QLabel("Opacity"))
         self.slider_op = ModernSettingsSlider(20, 100, 100, "%")
-        self.slider_op.valueChanged.connect(self.emit_props_update)
+        self.slider_op.valueChanged.connect(self.save_props)
         card_visuals.add_widget(self.slider_op)
 
         btn_preview = QPushButton("Toggle Desktop Preview")
-        btn_preview.setStyleSheet("QPushButton { background-color: #F8F9FA; color: #2D3436; border: 1px solid #DFE6E9; border-radius: 6px; padding: 8px; font-weight: bold;} QPushButton:hover { background-color: #E0E0E0; }")
+        btn_preview.setObjectName("SecondaryButton")
         btn_preview.clicked.connect(self.preview_toggled.emit)
         card_visuals.add_widget(btn_preview)
         
@@ -340,7 +378,7 @@ class SettingsTab(QWidget):
         card_overlay = SettingCard("Break Screen")
         self.input_msg = QLineEdit("SCREEN REST")
         self.input_msg.setPlaceholderText("Enter screen message...")
-        self.input_msg.setStyleSheet("QLineEdit { padding: 10px; border: 1px solid #DFE6E9; border-radius: 6px; background: #FAFAFA; } QLineEdit:focus { border: 1px solid #0984E3; }")
+        self.input_msg.setObjectName("BreakMessageInput")
         self.input_msg.textChanged.connect(self.emit_overlay_update)
         card_overlay.add_widget(QLabel("Custom Message:"))
         card_overlay.add_widget(self.input_msg)
@@ -352,12 +390,12 @@ class SettingsTab(QWidget):
         # --- CARD 3: SYSTEM ---
         card_sys = SettingCard("System & Behavior")
         
-        def create_toggle_row(text, key, default=True):
+        def create_toggle_row(text, key):
             row = QHBoxLayout()
             lbl = QLabel(text)
-            lbl.setStyleSheet("font-size: 13px; background: transparent; border: none;")
+            lbl.setObjectName("ToggleLabel")
             toggle = ToggleSwitch()
-            toggle.setChecked(default)
+            toggle.setChecked(self.config.get(key))
             toggle.stateChanged.connect(lambda: self.update_pref(key, toggle.isChecked()))
             row.addWidget(lbl)
             row.addStretch()
@@ -370,7 +408,7 @@ class SettingsTab(QWidget):
         row_sound, self.chk_sound = create_toggle_row("Sound Notifications", "sound_enabled")
         card_sys.add_layout(row_sound)
         
-        row_auto, self.chk_auto = create_toggle_row("Auto-start Break", "auto_start_break", False)
+        row_auto, self.chk_auto = create_toggle_row("Auto-start Break", "auto_start_break")
         card_sys.add_layout(row_auto)
         
         content_layout.addWidget(card_sys)
@@ -383,36 +421,26 @@ class SettingsTab(QWidget):
         card_help = SettingCard("Support")
         btn_feedback = QPushButton("Send Feedback / Report Bug")
         btn_feedback.setCursor(Qt.PointingHandCursor)
-        btn_feedback.setStyleSheet("QPushButton { background-color: #0984E3; color: white; border-radius: 6px; padding: 10px; font-weight: bold; border: none;} QPushButton:hover { background-color: #74B9FF; }")
+        btn_feedback.setObjectName("PrimaryButton")
         btn_feedback.clicked.connect(self.feedback_clicked.emit)
         card_help.add_widget(btn_feedback)
         content_layout.addWidget(card_help)
 
     def update_pref(self, key, value):
-        self.preferences[key] = value
+        self.config.set(key, value)
 
-    def emit_design_update(self):
+    def selected_color(self):
         sel_btn = self.color_group.checkedButton()
-        color = sel_btn.color if sel_btn else "#0984E3"
+        return sel_btn.color if sel_btn else "#0984E3"
 
-        self.settings.setValue("style_idx", self.combo_style.currentIndex())
-        self.settings.setValue("radius", self.slider_round.value())
-        self.settings.setValue("theme_color", color)
+    def save_design(self):
+        self.config.set("style_idx", self.combo_style.currentIndex())
+        self.config.set("radius", self.slider_round.value())
+        self.config.set("theme_color", self.selected_color())
 
-        self.widget_style_updated.emit(
-            self.combo_style.currentIndex(),
-            self.slider_round.value(),
-            color
-        )
-
-    def emit_props_update(self):
-        self.settings.setValue("scale", self.slider_scale.value())
-        self.settings.setValue("opacity", self.slider_op.value())
-
-        self.widget_props_updated.emit(
-            self.slider_scale.value(),
-            self.slider_op.value()
-        )
+    def save_props(self):
+        self.config.set("scale", self.slider_scale.value())
+        self.config.set("opacity", self.slider_op.value())
 
     def emit_overlay_update(self):
         text = self.input_msg.text()
@@ -420,13 +448,15 @@ class SettingsTab(QWidget):
         self.overlay_text_updated.emit(text)
 
     def load_settings(self):
-        style_idx = int(self.settings.value("style_idx", 0))
-        radius = int(self.settings.value("radius", 50))
-        scale = int(self.settings.value("scale", 100))
-        opacity = int(self.settings.value("opacity", 100))
-        color = self.settings.value("theme_color", "#0984E3")
+        style_idx = self.config.get("style_idx")
+        radius = self.config.get("radius")
+        scale = self.config.get("scale")
+        opacity = self.config.get("opacity")
+        color = self.config.get("theme_color")
 
+        self.combo_style.blockSignals(True)  # don't save back half-loaded values
         self.combo_style.setCurrentIndex(style_idx)
+        self.combo_style.blockSignals(False)
         self.slider_round.val = radius 
         self.slider_scale.val = scale
         self.slider_op.val = opacity
@@ -440,34 +470,36 @@ class SettingsTab(QWidget):
         self.slider_scale.update()
         self.slider_op.update()
 
-        QTimer.singleShot(100, self.emit_design_update)
-        QTimer.singleShot(100, self.emit_props_update)
-
     # --- APP SELECTION GROUP (Correct Placement) ---
     def create_app_selection_group(self):
         card = SettingCard("Auto-Start Triggers")
         
         desc = QLabel("Ikiflow detects these apps and offers to start a timer.")
-        desc.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px; margin-bottom: 5px;")
+        desc.setObjectName("CardHint")
         desc.setWordWrap(True)
         card.add_widget(desc)
         
-        # CollapsibleBox logic
+        # CollapsibleBox logic (the ~40 checkboxes are built on first open)
         collapsible = CollapsibleBox("▶  Select Apps to Monitor")
+        self.app_checks = {} 
+        collapsible.set_content_factory(self.create_app_grid)
+        card.add_widget(collapsible)
         
+        return card
+
+    def create_app_grid(self):
         grid = QGridLayout()
-        self.app_checks = {} 
         
         sorted_apps = sorted(SUPPORTED_APPS)
+        enabled = set(self.config.get("app_triggers"))
         
         for i, app_name in enumerate(sorted_apps):
             chk = QCheckBox(app_name)
             chk.setCursor(Qt.PointingHandCursor)
-            chk.setStyleSheet(f"color: {TEXT_MAIN}; font-size: 12px;")
+            chk.setObjectName("AppTrigger")
             
             # --- FIX: Default is now False (Unchecked) ---
-            is_enabled = self.settings.value(f"app_trigger_{app_name}", False, type=bool)
-            chk.setChecked(is_enabled)
+            chk.setChecked(app_name in enabled)
             
             chk.toggled.connect(lambda checked, name=app_name: self.save_app_state(name, checked))
             
@@ -477,11 +509,11 @@ class SettingsTab(QWidget):
             col = i % 2
             grid.addWidget(chk, row, col)
             
-        collapsible.set_content_layout(grid)
-        card.add_widget(collapsible)
-        
-        return card
+        return grid
 
     def save_app_state(self, app_name, is_checked):
-        self.settings.setValue(f"app_trigger_{app_name}", is_checked)
+        enabled = [app for app in self.config.get("app_triggers") if app != app_name]
+        if is_checked:
+            enabled.append(app_name)
+        self.config.set("app_triggers", sorted(enabled))
         # print(f"DEBUG: Set {app_name} to {is_checked}") # Commented out for production
\ No newline at end of file
@@ -0,0 +1,177 @@
+from Ikiflow_style import STYLESHEET
+
+# --- 1. PALETTE ---
+# Widgets only get an objectName (+ a dynamic property for variants);
+# all their CSS lives here and is parsed once, at app level.
+
+PALETTE = {
+    "accent": "#0984E3",
+    "accent_hover": "#74B9FF",
+    "accent_fade": "rgba(9, 132, 227, 0.15)",
+    "accent_bar": "rgba(9, 132, 227, 0.6)",
+    "idle_bar": "rgba(100, 100, 100, 0.4)",
+    "text_main": "#2D3436",
+    "text_dim": "#636E72",
+    "text_quiet": "#A4AAB0",
+    "bg_card": "#FFFFFF",
+    "bg_soft": "#F8F9FA",
+    "bg_input": "#FAFAFA",
+    "border_soft": "#ECEFF1",
+    "border": "#DFE6E9",
+    "border_card": "#E0E0E0",
+    "divider": "#F0F0F0",
+    "hover": "#DFE6E9",
+    "pressed": "#E0E0E0",
+    "selection": "#F1F2F6",
+    "scroll": "#D0D0D0",
+    "scroll_hover": "#B0B0B0",
+    "success": "#00B894",
+    "success_hover": "#00A383",
+    "warning": "#FAB1A0",
+    "noise_on": "#E17055",
+}
+
+BORDER = 1   # card/button outline width
+RADIUS = 12  # base corner radius
+
+# --- 2. RULES ---
+
+def main_rules(c, b, r):
+    return f"""
+/* --- Main window --- */
+QFrame#MainCard {{ background-color: {c['bg_card']}; border-radius: {r + 8}px; border: {b}px solid {c['border_card']}; }}
+QLabel#StatusLabel[mode="break"] {{ color: {c['success']}; font-size: 18px; font-weight: bold; }}
+QPushButton#AnalyzeButton {{ background: {c['selection']}; border-radius: {r}px; font-size: 20px; border: none; }}
+QPushButton#AnalyzeButton:hover {{ background: {c['hover']}; }}
+QPushButton#NoiseToggle, QPushButton#NoiseBrowse {{
+    color: {c['text_dim']}; background: transparent; border: {b}px solid {c['border']};
+    border-radius: 15px; font-weight: bold;
+}}
+QPushButton#NoiseToggle {{ padding: 5px; }}
+QPushButton#NoiseToggle:checked {{ background-color: {c['noise_on']}; color: white; border: none; }}
+QPushButton#NoiseBrowse:hover {{ background-color: {c['hover']}; }}
+"""
+
+def analyzer_rules(c, b, r):
+    return f"""
+/* --- Analyzer: window background reaches every child, like before --- */
+#AnalyzerWindow, #AnalyzerWindow QWidget {{ background-color: {c['bg_soft']}; }}
+#SessionScroll, #SessionScroll QWidget {{ background: transparent; border: none; }}
+
+QLabel#AnalyzerTitle {{ font-size: 24px; font-weight: 800; color: {c['text_main']}; }}
+QPushButton#ModeToggle {{
+    background: {c['bg_card']}; color: {c['text_dim']}; font-size: 11px; font-weight: bold;
+    border: {b}px solid {c['border_soft']}; border-radius: {r // 2}px;
+}}
+QPushButton#ModeToggle:hover {{ border: 1px solid {c['accent']}; color: {c['accent']}; }}
+QPushButton#NavButton {{
+    background: {c['bg_card']}; border-radius: 12px; font-weight: bold;
+    color: {c['text_dim']}; border: {b}px solid {c['border_soft']};
+}}
+QPushButton#NavButton:hover {{ background: {c['hover']}; color: {c['text_main']}; }}
+QFrame#Divider {{ background: {c['border_soft']}; margin: 5px 0; }}
+
+QLabel#MonthLabel {{ font-weight: bold; font-size: 14px; color: {c['text_main']}; }}
+QLabel#SectionCaption {{ color: {c['text_quiet']}; font-size: 10px; font-weight: bold; letter-spacing: 1px; }}
+QLabel#WeekRange {{ color: {c['text_main']}; font-size: 12px; font-weight: bold; }}
+QLabel#Insight {{ color: {c['accent']}; font-size: 10px; font-weight: bold; margin-top: 5px; }}
+QLabel#DayHeader {{ color: {c['text_main']}; font-size: 14px; font-weight: 800; letter-spacing: 0.5px; }}
+QLabel#DaySub {{ color: {c['text_quiet']}; font-size: 11px; font-weight: bold; margin-bottom: 5px; }}
+QLabel#EmptyNote {{ color: {c['text_quiet']}; font-style: italic; margin-top: 20px; }}
+
+/* Stat cards */
+QFrame#StatCard {{ background-color: {c['bg_card']}; border-radius: {r}px; border: {b}px solid {c['border_soft']}; }}
+#StatCard QLabel {{ background: transparent; border: none; }}
+QLabel#StatTitle {{ color: {c['text_quiet']}; font-size: 9px; font-weight: 700; letter-spacing: 1px; }}
+QLabel#StatIcon {{ color: {c['accent_fade']}; font-size: 28px; }}
+QLabel#StatValue {{ color: {c['text_main']}; font-size: 24px; font-weight: 900; }}
+QLabel#StatFootnote {{ color: {c['text_quiet']}; font-size: 10px; font-weight: bold; }}
+
+/* Session rows */
+#SessionItem QWidget {{ background: transparent; border: none; }}
+QFrame#SessionItem {{ background: {c['bg_card']}; border: {b}px solid {c['border_soft']}; border-radius: {r - 4}px; }}
+QFrame#SessionItem:hover, QFrame#SessionItem[expanded="true"] {{ border: 1px solid {c['accent']}; }}
+QLabel#SessionTime {{ color: {c['text_main']}; font-size: 13px; font-weight: 800; }}
+QLabel#SessionStatus {{ font-size: 9px; font-weight: 800; border-radius: 4px; padding: 2px 6px; }}
+QLabel#SessionStatus[status="good"] {{ color: {c['success']}; border: 1px solid {c['success']}; }}
+QLabel#SessionStatus[status="distracted"] {{ color: {c['warning']}; border: 1px solid {c['warning']}; }}
+QLabel#SessionStatus[status="deep"] {{ color: {c['accent']}; border: 1px solid {c['accent']}; }}
+QLabel#SessionArrow {{ color: {c['text_quiet']}; font-size: 10px; }}
+QFrame#SessionStats {{ background: {c['bg_soft']}; border-radius: {r // 2}px; }}
+QLabel#SessionStatCaption {{ color: {c['text_quiet']}; font-size: 9px; }}
+QLabel#SessionStatValue {{ color: {c['text_main']}; font-size: 12px; font-weight: bold; }}
+QLabel#UsageCaption {{ color: {c['text_quiet']}; font-size: 9px; font-weight: bold; margin-top: 5px; }}
+QLabel#UsageName {{ color: {c['text_dim']}; font-size: 11px; }}
+QLabel#UsageTime {{ color: {c['text_quiet']}; font-size: 10px; }}
+QFrame#UsageTrack {{ background: {c['border_soft']}; border-radius: 2px; }}
+QFrame#UsageFill {{ background: {c['accent_bar']}; border-radius: 2px; }}
+QFrame#UsageFill[idle="true"] {{ background: {c['idle_bar']}; }}
+"""
+
+def settings_rules(c, b, r):
+    return f"""
+/* --- Settings --- */
+QScrollArea#SettingsScroll {{ background: transparent; border: none; }}
+#SettingsScroll QScrollBar:vertical {{ border: none; background: transparent; width: 6px; margin: 0px; }}
+#SettingsScroll QScrollBar::handle:vertical {{ background: {c['scroll']}; border-radius: 3px; min-height: 20px; }}
+#SettingsScroll QScrollBar::handle:vertical:hover {{ background: {c['scroll_hover']}; }}
+#SettingsScroll QScrollBar::add-line:vertical, #SettingsScroll QScrollBar::sub-line:vertical {{ height: 0px; }}
+#SettingsScroll QScrollBar::add-page:vertical, #SettingsScroll QScrollBar::sub-page:vertical {{ background: none; }}
+QWidget#SettingsContent {{ background: transparent; }}
+
+QLabel#CardTitle {{ font-size: 14px; font-weight: bold; color: {c['accent']}; }}
+QFrame#CardDivider {{ background-color: {c['divider']}; border: none; }}
+QLabel#CardHint {{ color: {c['text_dim']}; font-size: 11px; margin-bottom: 5px; }}
+QLabel#ToggleLabel {{ font-size: 13px; }}
+QCheckBox#AppTrigger {{ color: {c['text_main']}; font-size: 12px; }}
+
+QPushButton#CollapsibleToggle {{ text-align: left; background: transparent; border: none; font-weight: bold; color: {c['text_dim']}; padding: 5px; }}
+QPushButton#CollapsibleToggle:hover {{ color: {c['accent']}; }}
+QPushButton#CollapsibleToggle:checked {{ color: {c['text_main']}; }}
+
+QComboBox#StylePreset {{ padding: 5px; border: 1px solid {c['border']}; border-radius: 5px; background-color: {c['bg_soft']}; padding-right: 28px; }}
+QComboBox#StylePreset::drop-down {{ subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left: 1px solid {c['border']}; background: transparent; }}
+QComboBox#StylePreset QAbstractItemView {{ background-color: {c['bg_card']}; color: {c['text_main']}; selection-background-color: {c['selection']}; selection-color: {c['accent']}; border: 1px solid {c['border_card']}; outline: none; }}
+
+QPushButton#SecondaryButton {{ background-color: {c['bg_soft']}; color: {c['text_main']}; border: {b}px solid {c['border']}; border-radius: {r // 2}px; padding: 8px; font-weight: bold; }}
+QPushButton#SecondaryButton:hover {{ background-color: {c['pressed']}; }}
+QPushButton#PrimaryButton {{ background-color: {c['accent']}; color: white; border-radius: {r // 2}px; padding: 10px; font-weight: bold; border: none; }}
+QPushButton#PrimaryButton:hover {{ background-color: {c['accent_hover']}; }}
+QLineEdit#BreakMessageInput {{ padding: 10px; border: 1px solid {c['border']}; border-radius: {r // 2}px; background: {c['bg_input']}; }}
+QLineEdit#BreakMessageInput:focus {{ border: 1px solid {c['accent']}; }}
+"""
+
+def overlay_rules(c, b, r):
+    # The overlay is always black, so only the accents follow the palette
+    retro = "font-family: 'Consolas', 'Courier New', monospace;"
+    return f"""
+/* --- Overlay --- */
+QLabel#OverlayQuestion {{ color: #FFFFFF; font-size: 32px; font-weight: 800; font-family: 'Segoe UI'; }}
+QPushButton#OverlayBreak, QPushButton#OverlayExtend {{ color: white; border-radius: {r}px; font-weight: bold; font-size: 16px; border: none; }}
+QPushButton#OverlayBreak {{ background-color: {c['success']}; }}
+QPushButton#OverlayBreak:hover {{ background-color: {c['success_hover']}; }}
+QPushButton#OverlayExtend {{ background-color: {c['accent']}; }}
+QPushButton#OverlayExtend:hover {{ background-color: {c['accent_hover']}; }}
+QLabel#OverlayMessage {{ color: #888888; font-size: 48px; font-weight: bold; {retro} letter-spacing: 2px; }}
+QLabel#OverlayTimer {{ color: #AAAAAA; font-size: 32px; font-weight: normal; margin-top: 30px; {retro} }}
+QProgressBar#OverlayProgress {{ background-color: #111111; border: 2px solid #333333; border-radius: 0px; }}
+QProgressBar#OverlayProgress::chunk {{ background-color: #AAAAAA; width: 15px; margin: 2px; }}
+"""
+
+# --- 3. COMPILED SHEET ---
+
+def compile_theme():
+    """Whole app stylesheet: base sheet + every window's object-name rules."""
+    c, b, r = PALETTE, BORDER, RADIUS
+    return "".join((STYLESHEET,
+                    main_rules(c, b, r),
+                    analyzer_rules(c, b, r),
+                    settings_rules(c, b, r),
+                    overlay_rules(c, b, r)))
+
+def apply_theme(app):
+    """Set the compiled sheet on the QApplication (no-op if it's already active)."""
+    sheet = compile_theme()
+    if app.styleSheet() != sheet:
+        app.setStyleSheet(sheet)
+    return sheet
@@ -0,0 +1,92 @@
+import math
+import time
+
+# --- 1. CLOCK ---
+# Suspend-aware monotonic time. On Windows time.monotonic() already keeps
+# counting through sleep; on Linux CLOCK_MONOTONIC stops, so use BOOTTIME.
+if hasattr(time, "CLOCK_BOOTTIME"):
+    def monotonic():
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic = time.monotonic
+
+# --- 2. DEADLINE TIMER ---
+
+class DeadlineTimer:
+    """
+    Countdown stored as a monotonic deadline instead of a decremented counter.
+    Remaining time is always recomputed from the clock, so late or missed
+    wakeups (modal dialogs, save I/O, system sleep) can't make it run slow.
+    """
+    WAKE_SLACK_MS = 2  # land just after the second boundary, not before
+
+    def __init__(self, clock=monotonic):
+        self.clock = clock
+        self.total = 0.0          # planned + extensions, in seconds
+        self.deadline = None      # clock value at 00:00 (while running)
+        self.paused_left = None   # remaining seconds (while paused)
+
+    # --- State ---
+    def start(self, seconds):
+        self.total = float(seconds)
+        self.deadline = self.clock() + seconds
+        self.paused_left = None
+
+    def stop(self):
+        self.deadline = None
+        self.paused_left = None
+
+    def pause(self):
+        if self.deadline is None: return
+        self.paused_left = self.remaining()
+        self.deadline = None
+
+    def resume(self):
+        if self.paused_left is None: return
+        self.deadline = self.clock() + self.paused_left
+        self.paused_left = None
+
+    def extend(self, seconds):
+        self.total += seconds
+        if self.paused_left is not None:
+            self.paused_left += seconds
+        elif self.deadline is not None:
+            # After 00:00 the extension counts from now, not from the old deadline
+            self.deadline = max(self.deadline, self.clock()) + seconds
+
+    # --- Queries ---
+    def is_running(self):
+        return self.deadline is not None
+
+    def is_paused(self):
+        return self.paused_left is not None
+
+    def remaining(self):
+        if self.paused_left is not None:
+            return self.paused_left
+        if self.deadline is None:
+            return 0.0
+        return max(0.0, self.deadline - self.clock())
+
+    def remaining_seconds(self):
+        """Whole seconds for display (25:00 stays on screen for the first second)."""
+        return int(math.ceil(self.remaining() - 1e-9))
+
+    def elapsed(self):
+        """Counted time so far (pauses excluded)."""
+        return self.total - self.remaining()
+
+    def expired(self):
+        return self.deadline is not None and self.remaining() <= 0
+
+    def ms_to_next(self, step=1):
+        """Delay until the remaining time crosses the next multiple of `step` seconds."""
+        left = self.remaining()
+        frac = left % step
+        if frac <= 1e-6:
+            frac = step if left > 0 else 0.0
+        return int(math.ceil(frac * 1000)) + self.WAKE_SLACK_MS
+
+    def ms_to_next_second(self):
+        """Delay until the displayed seconds value changes next."""
+        return self.ms_to_next(1)
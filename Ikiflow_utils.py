@@ -1,9 +1,16 @@
 import sys
 import os
+from pathlib import Path
 
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
     except Exception:
         base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+def data_dir():
+    # Path: C:\Users\YourName\Ikiflow_Data (shared by history + config)
+    path = Path(os.environ['USERPROFILE']) / "Ikiflow_Data"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
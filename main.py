@@ -1,27 +1,48 @@
 import sys
-import os
+import json
+
+# --- 0. SECOND LAUNCH ---
+# Before any Qt import: if an instance is already running, hand it our
+# command (show / --start N / --status ...) over the stdlib client and exit
+# without loading the GUI stack. Fails fast when nobody is listening.
+from Ikiflow_protocol import parse_command
+from Ikiflow_ctl import forward
+
+if __name__ == "__main__":
+    COMMAND = parse_command(sys.argv[1:])
+    code = forward(COMMAND)
+    if code is not None:
+        sys.exit(code)
+    if COMMAND["cmd"] not in ("show", "start"):
+        # Nothing to pause/stop/ask: don't launch a GUI just to say so
+        print(json.dumps({"ok": False, "error": "Ikiflow is not running"}))
+        sys.exit(1)
+
 import math
 import time
+from importlib import import_module
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLabel, QPushButton, QFrame, 
-                               QGraphicsDropShadowEffect, QStackedWidget, 
+                               QStackedWidget, 
                                QSystemTrayIcon, QMenu, QFileDialog, QMessageBox, QTabWidget, QDialog)
 from PySide6.QtCore import Qt, QTimer, QUrl, QPoint
-from PySide6.QtGui import QIcon, QPixmap, QDesktopServices, QColor, QPainter, QAction, QPen
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
-from PySide6.QtCore import QSettings, QTimer
-from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtGui import QIcon, QPixmap, QDesktopServices, QColor, QPainter, QAction
 
 # --- YOUR CUSTOM MODULES ---
+# Analyzer, feedback (requests), audio (QtMultimedia) and the update check
+# (QNetworkAccessManager) are imported on first use / from the warmup queue
 from Ikiflow_utils import resource_path
-from Ikiflow_style import STYLESHEET
-from Ikiflow_audio import SoundEngine
-from Ikiflow_components import (IntentDialog, ModernWindowButton, CircularTimeInput, 
-                                CustomLinearInput, FloatingWidget, OverlayWindow, QuickStartDialog)
-from Ikiflow_settings import SettingsTab, SUPPORTED_APPS
-from Ikiflow_feedback import FeedbackDialog
-from Ikiflow_data import HistoryManager, get_active_window_title
-from Ikiflow_analyzer import AnalyzerWindow
+from Ikiflow_theme import apply_theme
+from Ikiflow_components import (ModernWindowButton, CircularTimeInput, 
+                                CustomLinearInput, FloatingWidget, OverlayPool, QuickStartDialog)
+from Ikiflow_settings import SettingsTab, TriggerMatcher
+from Ikiflow_config import get_config
+from Ikiflow_data import HistoryManager, AppUsageSketch, ActiveWindowProvider
+from Ikiflow_context import ForegroundSampler, WakeupMeter, WarmupQueue
+from Ikiflow_render import RenderLayer, ShadowHost
+from Ikiflow_ipc import CommandServer
+from Ikiflow_session import (SessionMachine, IDLE, FOCUS, PAUSED, CHECKIN, BREAK,
+                             START, PAUSE, RESUME, EXPIRE, TAKE_BREAK, fold_events)
 
 
 # --- 5. MAIN WINDOW ---
@@ -43,58 +64,79 @@ class MainWindow(QMainWindow):
         self.dragging = False
         self.offset = QPoint()
         
-        self.is_running = False
-        self.is_paused = False
-        self.total_time = 0
+        self.total_time = 0   # Display cache, the session machine owns the real state
         self.time_left = 0
-        self.is_break = False
         
         # --- NEW: Cooldown Tracker ---
         # Stores { "AppName": timestamp } to prevent spamming
         self.app_cooldowns = {} 
         # -----------------------------
 
-        self.overlay = OverlayWindow()
+        # One window per screen, built from the warmup queue (or the first check-in)
+        self.overlay = OverlayPool(warm=False)
 
         # --- NEW CONNECTIONS ---
         # Moved to after setup_tray
         
         self.floater = FloatingWidget()
+        # Session engine (Qt-free). Countdown = monotonic deadline;
+        # the QTimer only wakes us at second boundaries
+        self.session = SessionMachine()
+        self.countdown = self.session.countdown
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.tick)
-        self.history_manager = HistoryManager()
+        self.tick_meter = WakeupMeter()
+        self.tray_text = None
+        self._history_manager = None  # see history_manager
 
         # --- NEW: App Tracking Setup ---
-        self.session_app_data = {}  # Stores {"App Name": seconds_used}
-        self.tracker_timer = QTimer()
-        # self.tracker_timer.timeout.connect(self.track_current_app)
+        self.session_app_data = AppUsageSketch()  # Bounded {"App Name": seconds_used}
+        self.window_provider = ActiveWindowProvider()  # Caches exe per window handle
+        self.is_tracking = False
+        self.track_app = None    # App of the last sample
+        self.track_mark = 0.0    # monotonic time of the last sample
+
+        # One sampler for everybody (tracker, auto-start, ...)
+        self.sampler = ForegroundSampler(self.window_provider, self)
+        self.sampler.sampled.connect(self.track_current_app)
+        self.sampler.sampled.connect(self.monitor_context)
         # -------------------------------
 
         self.session_start_time = None
         self.detected_app = "None"
 
-        # --- NEW: Init Sound Engine ---
-        self.sound_engine = SoundEngine()
-        try:
-            self.sound_engine.load_sound("noise.wav") # Make sure you have this file!
-            print("Sound loaded successfully")
-        except Exception as e:
-            print(f"Warning: Could not load sound file: {e}")
+        # --- NEW: Sound Engine (built on first use, see sound_engine) ---
+        self._sound_engine = None
         self.is_ambient_on = False
-        
-        # Inside MainWindow __init__
-        self.overlay = OverlayWindow()
 
         # --- NEW: Context Awareness ---
-        self.context_timer = QTimer(self)
-        self.context_timer.timeout.connect(self.monitor_context)
-        self.context_timer.start(3000) # Check every 3 seconds
         self.last_triggered_app = None # Prevent spamming the popup
+        self.trigger_matcher = TriggerMatcher.from_config(get_config()) # Loaded once, follows the store
+        get_config().subscribe("app_triggers", lambda _: self.update_context_polling(), owner=self)
+
+        # Adaptive: 3s after a change, backs off to 30s (120s when idle)
+        self.update_context_polling()
         
         # Setup UI and Tray
         self.init_ui()
         self.setup_tray()
         
+        # Everything the tick draws goes through one coalescing render layer
+        self.render = RenderLayer(self)
+        self.render.register("timer", self.lbl_big_timer, self.lbl_big_timer.setText)
+        self.render.register("floater", self.floater, lambda v: self.floater.set_time(*v))
+        self.register_overlay_view()
+        self.overlay.windows_changed.connect(self.register_overlay_view)
+        # Nothing on screen -> low-power ticks (see schedule_tick)
+        self.render.visibility_changed.connect(self.on_visibility_changed)
+
+        # Views follow the session machine
+        self.session.subscribe(self.on_session_transition)
+        self.session.subscribe(self.floater.on_session_transition)
+        self.session.subscribe(self.overlay.on_session_transition)
+
         self.overlay.action_break.connect(self.start_actual_break)
         self.overlay.action_extend.connect(lambda: self.extend_session(5))
         
@@ -102,14 +144,41 @@ class MainWindow(QMainWindow):
         self.overlay.action_cancelled.connect(self.stop_timer)
         # ---------------------------
 
+        # Not needed for the first paint / tray icon: done once the loop is idle
+        self.warmup = WarmupQueue(self)
+        self.warmup.add("overlay", self.overlay.warm_up)
+        self.warmup.add("history", lambda: self.history_manager)
+        self.warmup.add("audio", lambda: self.sound_engine.warm())  # decodes the cues
+        self.warmup.add("analyzer", lambda: import_module("Ikiflow_analyzer"))
+        self.warmup.start()
+
         QTimer.singleShot(2000, self.check_for_updates)
+
+    # ---------- Lazy subsystems ----------
+    @property
+    def sound_engine(self):
+        if self._sound_engine is None:
+            from Ikiflow_audio import SoundEngine  # QtMultimedia is slow to import
+            self._sound_engine = SoundEngine()
+            try:
+                # Last picked colour (no NumPy -> the bundled noise.wav, make sure you have it!)
+                self._sound_engine.load_noise(get_config().get("noise_color"))
+            except Exception as e:
+                print(f"Warning: Could not load sound file: {e}")
+        return self._sound_engine
+
+    @property
+    def history_manager(self):
+        if self._history_manager is None:
+            self._history_manager = HistoryManager()
+        return self._history_manager
         
 
     # ---------- New Function ----------
 
     # --- CONTEXT AWARENESS LOGIC (FIXED) ---
 
-    def monitor_context(self):
+    def monitor_context(self, sample):
         # 1. Safety Checks (Initialize if missing)
         if not hasattr(self, 'app_cooldowns'): self.app_cooldowns = {}
         if not hasattr(self, 'last_triggered_app'): self.last_triggered_app = None
@@ -118,34 +187,12 @@ class MainWindow(QMainWindow):
         if self.is_running or self.isVisible(): 
             return
 
-        # 3. Get Title (Safe Get)
-        title = get_active_window_title()
+        # 3. Sample comes from the shared sampler (exe is cached per handle)
+        title = sample.title
         if not title: return
 
-        def monitor_context(self):
-            # ... (safety checks remain the same) ...
-            if self.is_running or self.isVisible(): return
-
-            title = get_active_window_title()
-            if not title: return
-
-        # --- DYNAMIC TRIGGER LIST ---
-        active_triggers = []
-        
-        # settings is available globally via QApplication or self.settings if you initialized it
-        settings = QSettings() 
-        
-        for app in SUPPORTED_APPS:
-            # Check if user enabled this app (Default True)
-            if settings.value(f"app_trigger_{app}", True, type=bool):
-                active_triggers.append(app)
-        
-        # --- DETECTION LOGIC ---
-        detected = None
-        for t in active_triggers:
-            if t.lower() in title.lower():
-                detected = t
-                break
+        # 4. Detection (cached trigger set, exe first, then one regex search)
+        detected = self.trigger_matcher.match(title, sample.exe)
         
         # 5. Smart Logic
         if detected:
@@ -162,9 +209,48 @@ class MainWindow(QMainWindow):
                 self.last_triggered_app = detected
                 self.trigger_quick_start(detected)
 
+    def update_context_polling(self):
+        # Poll only when there is something to detect: no session, triggers enabled
+        if self.is_running or not self.trigger_matcher.enabled:
+            self.sampler.set_demand("autostart", None)
+        else:
+            # Window-change events where available, adaptive polling otherwise
+            switching_on = "autostart" not in self.sampler.demands
+            self.sampler.set_demand("autostart", ForegroundSampler.ADAPTIVE, events=True)
+            if switching_on:
+                # The hook only hears the *next* change: check what's in front now.
+                # Next loop turn, so a quick-start popup never opens mid-transition
+                QTimer.singleShot(0, self.sampler.poll)
+
+    def register_overlay_view(self):
+        # All overlay windows show together; the primary one stands for them
+        lead = self.overlay.lead()
+        if lead is not None:
+            self.render.register("overlay", lead, lambda v: self.overlay.update_state(*v))
+
+    def get_wakeup_stats(self):
+        """
+        Wakeup / repaint / overlay / settings-write counters, used to check the
+        idle CPU/battery footprint. Read them with `Ikiflow_ctl.py stats`.
+        """
+        sampler = self.sampler.stats()
+        return {
+            "low_power": not self.render.any_visible(),
+            "wakeups_per_min": round(self.tick_meter.per_minute() + sampler["wakeups_per_min"]
+                                     + sampler["hook_events_per_min"], 2),
+            "tick": {"wakeups": self.tick_meter.total,
+                     "wakeups_per_min": round(self.tick_meter.per_minute(), 2)},
+            "sampler": sampler,
+            "render": self.render.stats(),
+            "overlay": self.overlay.stats(),
+            "warmup": self.warmup.stats(),
+            "audio": self._sound_engine.cues.stats() if self._sound_engine else None,
+            "settings": {**self.floater.stats(), **get_config().stats()},
+        }
+
     def trigger_quick_start(self, app_name):
         # Stop monitor while dialog is open
-        self.context_timer.stop()
+        self.sampler.set_demand("autostart", None)
         
         try:
             # 1. Set Cooldown IMMEDIATELY
@@ -199,66 +285,71 @@ class MainWindow(QMainWindow):
             
         finally:
             # 3. CRITICAL: Always restart monitoring, even if errors occur
-            self.context_timer.start(3000)
+            self.update_context_polling()
 
     def start_timer_direct(self, mode, tasks):
         """Used by Quick Start: Opens Main Window + Clean Widget"""
         
         # 1. Setup Widget (Text is hidden by the component update above)
         self.floater.set_session_data(mode, tasks)
-        self.floater.show()
-        self.floater.setWindowState(Qt.WindowNoState)
-        self.floater.raise_()
         
-        # 2. Setup Timer Engine
+        # 2. Start the session (floater + tracking follow the transition)
         mins = self.input_focus.value()
-        self.total_time = mins * 60
-        self.time_left = self.total_time
-        
-        self.is_break = False
-        self.is_running = True
-        self.session_app_data = {} 
+        self.session.start(mins * 60, self.input_break.value() * 60)
         
         # 3. OPEN MAIN WINDOW (The Interface you want)
-        self.stack.setCurrentIndex(1) # Switch stack to Active Timer View
         self.showNormal()             # Make sure window is visible (not minimized)
         self.activateWindow()         # Bring it to the front
         
-        # 4. Go!
-        self.timer.start(1000)
+        # 4. Go! (start cue follows the transition)
         self.update_display()
-        self.sound_engine.play_sound("start")
+
+    def show_sound_menu(self):
+        # Built-in noise colours (tick = current) + a custom file
+        from Ikiflow_audio import NOISE_COLORS
+        menu = QMenu(self)
+        for color in NOISE_COLORS:
+            action = menu.addAction(f"{color.title()} Noise")
+            action.setCheckable(True)
+            action.setChecked(self.sound_engine.builtin == color)
+            action.triggered.connect(lambda checked=False, c=color: self.choose_noise(c))
+        menu.addSeparator()
+        menu.addAction("Custom File...").triggered.connect(self.browse_noise_file)
+        menu.exec(self.btn_browse.mapToGlobal(QPoint(0, self.btn_browse.height())))
+
+    def choose_noise(self, color):
+        get_config().set("noise_color", color)
+        self.switch_sound(lambda: self.sound_engine.load_noise(color))
 
     def browse_noise_file(self):
-        # Open File Dialog (WAV only for now to ensure compatibility)
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Background Noise", "", "Audio Files (*.wav)")
+        # Streamed playback (Ikiflow_audio.AmbientPlayer): compressed formats are fine
+        from Ikiflow_audio import AMBIENT_FILTER
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Background Noise", "", AMBIENT_FILTER)
         
         if file_path:
-            # 1. Stop current sound if playing
-            was_playing = self.btn_ambient.isChecked()
-            self.sound_engine.stop()
-            
-            # 2. Load new sound
-            self.sound_engine.load_sound(file_path)
-            
-            # 3. Resume if it was already on
-            if was_playing:
-                self.sound_engine.play()
+            self.switch_sound(lambda: self.sound_engine.load_sound(file_path))
+
+    def switch_sound(self, load):
+        # 1. Stop current sound if playing
+        was_playing = self.btn_ambient.isChecked()
+        self.sound_engine.stop()
+        
+        # 2. Load new sound
+        load()
+        
+        # 3. Resume if it was already on
+        if was_playing:
+            self.sound_engine.play()
 
     def init_ui(self):
-        root_widget = QWidget()
+        root_widget = ShadowHost(20) # Paints the card's cached nine-slice shadow
         self.setCentralWidget(root_widget)
         root_layout = QVBoxLayout(root_widget)
         root_layout.setContentsMargins(10, 10, 10, 10) 
 
         self.card = QFrame()
         self.card.setObjectName("MainCard")
-        self.card.setStyleSheet("QFrame#MainCard { background-color: #FFFFFF; border-radius: 20px; border: 1px solid #E0E0E0; }")
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setYOffset(5)
-        shadow.setColor(QColor(0, 0, 0, 40))
-        self.card.setGraphicsEffect(shadow)
+        root_widget.card = self.card
         
         card_layout = QVBoxLayout(self.card)
         card_layout.setContentsMargins(20, 15, 20, 25)
@@ -347,6 +438,7 @@ class MainWindow(QMainWindow):
     def mouseReleaseEvent(self, event): self.dragging = False
 
     def open_feedback_dialog(self):
+        from Ikiflow_feedback import FeedbackDialog  # pulls in requests
         dlg = FeedbackDialog(self)
         dlg.exec()
 
@@ -356,31 +448,22 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(0,0,0,0)
         
         self.tabs = QTabWidget()
-        self.settings_tab = SettingsTab()
-        
-        # ... (Connect your settings signals here as before) ...
-        self.settings_tab.widget_style_updated.connect(self.floater.update_config)
-        self.settings_tab.widget_props_updated.connect(self.floater.apply_settings)
-        self.settings_tab.preview_toggled.connect(self.toggle_preview)
-        self.settings_tab.overlay_text_updated.connect(self.overlay.set_message)
-        self.settings_tab.feedback_clicked.connect(self.open_feedback_dialog)
+        self.settings_tab = None  # Built the first time the tab is opened
         
         # ONLY TWO TABS NOW (Distraction Free)
         self.tabs.addTab(self.create_timer_tab(), "Timer")
-        self.tabs.addTab(self.settings_tab, "Settings")
+        self.tabs.addTab(QWidget(), "Settings")  # Empty placeholder until then
+        self.tabs.currentChanged.connect(self.ensure_settings_tab)
         
         # --- ACTION BUTTONS ---
         action_layout = QHBoxLayout()
         
         # 1. Analyzer Button (Small Notebook Icon)
         btn_analyze = QPushButton("📊") # Or use an icon
+        btn_analyze.setObjectName("AnalyzeButton")
         btn_analyze.setFixedSize(50, 50)
         btn_analyze.setToolTip("Open Reflection Journal")
         btn_analyze.setCursor(Qt.PointingHandCursor)
-        btn_analyze.setStyleSheet("""
-            QPushButton { background: #F1F2F6; border-radius: 12px; font-size: 20px; border: none; }
-            QPushButton:hover { background: #DFE6E9; }
-        """)
         btn_analyze.clicked.connect(self.open_analyzer)
         
         # 2. Start Button (Big)
@@ -403,6 +486,7 @@ class MainWindow(QMainWindow):
             # Create it if it doesn't exist, or just show it
             if not hasattr(self, 'analyzer_window') or self.analyzer_window is None:
                 print("DEBUG: Initializing AnalyzerWindow...")
+                from Ikiflow_analyzer import AnalyzerWindow
                 self.analyzer_window = AnalyzerWindow()
             
             print("DEBUG: Showing AnalyzerWindow...")
@@ -435,25 +519,19 @@ class MainWindow(QMainWindow):
         
         # 1. The Toggle Button
         self.btn_ambient = QPushButton("Turn On Noise")
+        self.btn_ambient.setObjectName("NoiseToggle")
         self.btn_ambient.setCursor(Qt.PointingHandCursor)
         self.btn_ambient.setCheckable(True)
         self.btn_ambient.setFixedWidth(140)
-        self.btn_ambient.setStyleSheet("""
-            QPushButton { color: #636E72; background: transparent; border: 1px solid #DFE6E9; border-radius: 15px; padding: 5px; font-weight: bold; }
-            QPushButton:checked { background-color: #E17055; color: white; border: none; }
-        """)
         self.btn_ambient.clicked.connect(self.toggle_ambient)
         
         # 2. The Browse Button [...]
         self.btn_browse = QPushButton("...")
+        self.btn_browse.setObjectName("NoiseBrowse")
         self.btn_browse.setCursor(Qt.PointingHandCursor)
         self.btn_browse.setFixedSize(30, 30)
-        self.btn_browse.setToolTip("Select custom .wav file")
-        self.btn_browse.setStyleSheet("""
-            QPushButton { color: #636E72; background: transparent; border: 1px solid #DFE6E9; border-radius: 15px; font-weight: bold; }
-            QPushButton:hover { background-color: #DFE6E9; }
-        """)
-        self.btn_browse.clicked.connect(self.browse_noise_file)
+        self.btn_browse.setToolTip("Noise colour, or a custom audio file (wav, mp3, ogg, flac, m4a...)")
+        self.btn_browse.clicked.connect(self.show_sound_menu)
         
         noise_layout.addWidget(self.btn_ambient)
         noise_layout.addSpacing(5)
@@ -484,6 +562,23 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.btn_stop)
         return page
 
+    def ensure_settings_tab(self, index):
+        """Swap the placeholder for the real SettingsTab on first visit."""
+        if self.settings_tab is not None or self.tabs.tabText(index) != "Settings":
+            return
+        self.settings_tab = SettingsTab()
+        self.settings_tab.preview_toggled.connect(self.toggle_preview)
+        self.settings_tab.overlay_text_updated.connect(self.overlay.set_message)
+        self.settings_tab.feedback_clicked.connect(self.open_feedback_dialog)
+
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, self.settings_tab, "Settings")
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
     def create_timer_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -512,51 +607,41 @@ class MainWindow(QMainWindow):
         return tab
 
     def toggle_preview(self):
+        # The floater already follows the settings (store at startup, preview after)
         if self.floater.isVisible(): self.floater.hide()
-        else:
-            self.floater.show()
-            self.settings_tab.emit_design_update() # Sync current design
+        else: self.floater.show()
 
     # --- Tracking Function ---
 
-    def track_current_app(self):
-        # 1. Get Title
-        title = get_active_window_title()
-        app_name = title
-
-        # --- SMART GROUPING LOGIC ---
-        # 1. Adobe Illustrator / Photoshop Files (e.g. "Logo.ai @ 50%...")
-        if any(x in title for x in [".ai @", "(RGB/Preview)", "(CMYK/Preview)", "Adobe Illustrator"]):
-            app_name = "Adobe Illustrator"
-        elif any(x in title for x in [".psd @", "(RGB/8)", "(CMYK/8)", "Adobe Photoshop"]):
-            app_name = "Adobe Photoshop"
-        # 2. Browsers (Clean up tabs)
-        elif " - Google Chrome" in title:
-            app_name = "Google Chrome"
-        elif " - Microsoft Edge" in title:
-            app_name = "Microsoft Edge"
-        # 3. Code Editors
-        elif "Visual Studio Code" in title:
-            app_name = "Visual Studio Code"
-        # 4. Filter your own app
-        elif "Ikiflow" in title:
-            app_name = "Focus Timer"
-        # 5. Fallback: Clean standard " - " suffixes
-        elif " - " in title:
-            # Check if the suffix looks like an app name (usually the last part)
-            parts = title.split(" - ")
-            if len(parts) > 1:
-                potential_app = parts[-1]
-                # Avoid splitting filenames that use hyphens
-                if len(potential_app) < 40: 
-                    app_name = potential_app
-
-        # --- RECORD DATA ---
-        # Add exactly 1 second
-        if app_name in self.session_app_data:
-            self.session_app_data[app_name] += 1
-        else:
-            self.session_app_data[app_name] = 1
+    def start_tracking(self):
+        self.is_tracking = True
+        self.track_app = None
+        self.track_mark = time.monotonic()
+        # Samples on window/title changes only (1s polling without the hook);
+        # time is charged by elapsed monotonic time either way
+        self.sampler.set_demand("tracker", 1000, events=True)
+        self.sampler.poll() # Attribute from the very first second
+
+    def stop_tracking(self):
+        # Flush the time since the last sample before going quiet
+        if self.is_tracking and self.track_app is not None:
+            self.session_app_data.add(self.track_app, time.monotonic() - self.track_mark)
+        self.is_tracking = False
+        self.track_app = None
+        self.sampler.set_demand("tracker", None)
+
+    def track_current_app(self, sample):
+        if not self.is_tracking: return
+
+        # 1. Elapsed time belongs to the app of the previous sample
+        now = time.monotonic()
+        if self.track_app is not None:
+            # --- RECORD DATA --- (sketch caps the number of keys)
+            self.session_app_data.add(self.track_app, now - self.track_mark)
+
+        # 2. Classify the new sample (exe is the grouping key, titles only as fallback)
+        self.track_app = self.window_provider.classify(sample)
+        self.track_mark = now
         
     # --- Toggle_ambient ---
 
@@ -572,133 +657,227 @@ class MainWindow(QMainWindow):
         if self.is_running: return
         
         # --- DIRECT START (No Intent Dialog) ---
-        
-        # 1. Get Duration directly from the inputs
-        mins = self.input_focus.value()
-        self.total_time = mins * 60
-        self.time_left = self.total_time
-        
-        # 2. Reset State
-        self.is_break = False
-        self.is_running = True
-        self.session_app_data = {} 
-        
-        # 3. Configure Floater (Default Mode)
+        self.start_focus(self.input_focus.value())
+
+    def start_focus(self, mins):
+        # 1. Configure Floater (Default Mode)
         # We set a generic task name since we skipped the input step
         self.floater.set_session_data("Free", [])
-        self.floater.show()
-        # We do NOT hide the main window anymore, per your request
-        # self.hide() 
         
-        # 4. Switch Main Window to Active View (The 3rd screen)
-        self.stack.setCurrentIndex(1) 
+        # 2. Start the session (break length from the input)
+        # (stack switch, floater, tracking and wakeups follow the transition)
+        self.session.start(mins * 60, self.input_break.value() * 60)
         
-        # 5. Start Engine
-        self.timer.start(1000)
         self.update_display()
-        self.sound_engine.play_sound("start")
 
     def toggle_pause(self):
         if not self.is_running: return
         
         if self.is_paused:
-            self.is_paused = False
-            self.timer.start(1000)
-            self.btn_pause.setText("Pause")
-            self.action_pause.setText("Pause Timer")
-            self.lbl_status.setText("Focus Mode Active")
+            self.session.resume()
         else:
-            self.is_paused = True
-            self.timer.stop()
-            self.btn_pause.setText("Resume")
-            self.action_pause.setText("Resume Timer")
-            self.lbl_status.setText("Session Paused")
+            self.session.pause()
 
     def start_actual_break(self):
         print("DEBUG: Break Button Clicked!") # Check your terminal for this
         
         try:
-            # 1. Calculate stats
-            planned_mins = self.input_focus.value()
-            elapsed_seconds = self.total_time 
-            actual_mins = elapsed_seconds // 60
-            
-            # 2. Try to save (The likely crash point)
-            # We wrap this so if it fails, the break still starts!
-            try:
-                self.history_manager.save_session(
-                    duration_planned=planned_mins,
-                    duration_actual=actual_mins,
-                    break_duration=self.input_break.value(),
-                    status="Completed",
-                    app_data=getattr(self, 'session_app_data', {}) 
-                )
-            except Exception as e:
-                print(f"WARNING: Could not save history, but continuing break. Error: {e}")
+            self.session.take_break(self.input_break.value() * 60)
+        except Exception as main_e:
+            print(f"CRITICAL ERROR in start_actual_break: {main_e}")
 
-            # 3. UI Updates (The part you want to see)
-            self.is_break = True
-            
-            # Stop noise safely
-            if hasattr(self, 'sound_engine'):
-                self.sound_engine.stop()
+    def save_session_log(self, status):
+        # 1. Stats come from folding the event log (pauses + check-in wait excluded)
+        events = list(self.session.log.events)
+        totals = fold_events(events)
+        planned_mins = int(totals["planned_s"]) // 60
+        actual_mins = int(totals["focus_s"]) // 60
+
+        if status == "Skipped" and actual_mins < 1:
+            return
+
+        # 2. Try to save (The likely crash point)
+        # We wrap this so if it fails, the break still starts!
+        try:
+            self.history_manager.save_session(
+                duration_planned=planned_mins,
+                duration_actual=actual_mins,
+                break_duration=self.input_break.value(),
+                status=status,
+                app_data=self.session_app_data.as_dict(),
+                events=events
+                # FUTURE: You can pass self.floater.current_task here to save the Task Name too!
+            )
+        except Exception as e:
+            print(f"WARNING: Could not save history, but continuing. Error: {e}")
+    
+    def stop_timer(self):
+        self.session.stop()
+
+    # --- REMOTE COMMANDS (Ikiflow_ipc) ---
+
+    def handle_command(self, command):
+        """One command from another launch or the control client -> reply dict."""
+        cmd = command.get("cmd")
+        if cmd == "show":
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+        elif cmd == "start":
+            if self.is_running:
+                return {"ok": False, "error": "a session is already running", **self.status()}
+            mins = command.get("minutes", self.input_focus.value())
+            if type(mins) is not int or not 1 <= mins <= 180:  # no bools, floats, strings
+                return {"ok": False, "error": "minutes must be 1-180"}
+            self.start_focus(mins)
+        elif cmd == "pause":
+            if not self.session.can(PAUSE):
+                return {"ok": False, "error": f"can't pause while {self.session.state}", **self.status()}
+            self.session.pause()
+        elif cmd == "resume":
+            if not self.session.can(RESUME):
+                return {"ok": False, "error": f"can't resume while {self.session.state}", **self.status()}
+            self.session.resume()
+        elif cmd == "stop":
+            self.stop_timer()
+        elif cmd == "stats":
+            return {"ok": True, **self.get_wakeup_stats()}
+        elif cmd != "status":
+            return {"ok": False, "error": f"unknown command: {cmd}"}
+        return {"ok": True, **self.status()}
+
+    def status(self):
+        """Machine-readable snapshot (for the control client / status bars)."""
+        running = self.is_running
+        return {
+            "state": self.session.state,
+            "phase": self.session.phase,
+            "remaining_s": self.countdown.remaining_seconds() if running else 0,
+            "total_s": int(self.countdown.total) if running else 0,
+            "app": self.track_app if self.is_tracking else None,
+        }
+
+    # --- SESSION OBSERVER ---
+
+    @property
+    def is_running(self): return self.session.state != IDLE
+
+    @property
+    def is_paused(self): return self.session.state == PAUSED
+
+    @property
+    def is_break(self): return self.session.phase == BREAK
+
+    def on_session_transition(self, t):
+        """MainWindow is one subscriber of the session machine (floater + overlay are others)."""
+        if t.new == FOCUS:
+            if t.event in (START, EXPIRE): # Fresh focus block (first one or loop after a break)
+                self.session_app_data = AppUsageSketch()
+            self.start_tracking()
+            self.update_context_polling() # Paused while the session runs
+
+            self.stack.setCurrentIndex(1)
+            self.lbl_status.setText("Focus Mode Active")
+            self.set_status_mode(FOCUS)
+            self.btn_pause.setText("Pause")
+            self.action_pause.setText("Pause Timer")
+            self.action_pause.setEnabled(True)
+
+            # Restart Sound if "Noise On" was active before the break
+            if t.event == EXPIRE and self.btn_ambient.isChecked():
+                self.sound_engine.play()
+
+        elif t.new == PAUSED:
+            self.stop_tracking()
+            self.btn_pause.setText("Resume")
+            self.action_pause.setText("Resume Timer")
+            self.lbl_status.setText("Session Paused")
+
+        elif t.new == CHECKIN:
+            # --- FIX: DO NOT SAVE HERE ---
+            # We just show the check-in. We wait for the user to 
+            # click "Start Break" or "Stop" before saving.
+            self.stop_tracking()
+            self.stop_audio()
             
-            if hasattr(self, 'btn_ambient'):
+            # Bring window to front so they see the check-in
+            self.setWindowState(Qt.WindowNoState)
+            self.show()
+            self.raise_()
+            self.activateWindow()
+
+        elif t.new == BREAK:
+            if t.event == TAKE_BREAK:
+                self.save_session_log("Completed")
+
+                # Stop noise safely
+                self.stop_audio()
                 self.btn_ambient.setChecked(False)
                 self.btn_ambient.setText("Turn On Noise")
 
-            # Setup Timer for Break
-            mins = self.input_break.value()
-            self.total_time = mins * 60
-            self.time_left = self.total_time
-
-            # Visuals
+            self.btn_pause.setText("Pause")
+            self.action_pause.setText("Pause Timer")
             self.lbl_status.setText("Break Time")
-            self.lbl_status.setStyleSheet("color: #00B894; font-size: 18px; font-weight: bold; background: transparent; border: none;")
+            self.set_status_mode(BREAK)
 
-            # 4. SWITCH OVERLAY
-            self.overlay.show_break_mode()
-            self.timer.start(1000)
-            
-        except Exception as main_e:
-            print(f"CRITICAL ERROR in start_actual_break: {main_e}")
-    
-    def stop_timer(self):
+        elif t.new == IDLE:
+            self.stop_tracking()
+            if t.data["phase"] in (FOCUS, CHECKIN):
+                self.save_session_log("Skipped")
 
-        # --- NEW: Stop Tracking ---
-        # self.tracker_timer.stop()
-
-        if self.is_running and not self.is_break:
-            elapsed_seconds = self.total_time - self.time_left
-            actual_mins = elapsed_seconds // 60
-            planned_mins = self.total_time // 60
-
-            if actual_mins >= 1:
-                self.history_manager.save_session(
-                    duration_planned=planned_mins,
-                    duration_actual=actual_mins,
-                    break_duration=self.input_break.value(),
-                    status="Skipped",
-                    app_data=self.session_app_data  # <--- PASS DATA HERE
-                    # FUTURE: You can pass self.floater.current_task here to save the Task Name too!
-                )
-    # ---------------------------
-
-        self.timer.stop()
-        self.is_running = False
-        self.is_paused = False
-        self.is_break = False
-        
-        self.floater.hide()
-        self.overlay.hide()
-        self.stack.setCurrentIndex(0)
-        self.action_pause.setEnabled(False)
-        self.action_pause.setText("Pause Timer")
+            self.stack.setCurrentIndex(0)
+            self.update_context_polling()
+            self.action_pause.setEnabled(False)
+            self.action_pause.setText("Pause Timer")
+
+        # Wakeups only while a countdown is actually running
+        if self.session.state in (FOCUS, BREAK):
+            self.sync_countdown()
+            self.schedule_tick()
+        else:
+            self.timer.stop()
+        self.update_tray_tooltip()
+
+        # Last: the transition is fully applied even if audio is broken
+        self.play_cue(t)
+
+    def set_status_mode(self, mode):
+        # Colour/size follow the [mode] property in the theme; re-polish just the label
+        if self.lbl_status.property("mode") == mode: return
+        self.lbl_status.setProperty("mode", mode)
+        self.lbl_status.style().unpolish(self.lbl_status)
+        self.lbl_status.style().polish(self.lbl_status)
+
+    def play_cue(self, t):
+        # Start of every focus block, check-in, break, and a manual stop
+        if t.new == FOCUS and t.event in (START, EXPIRE): name = "start"
+        elif t.new == CHECKIN: name = "checkin"
+        elif t.new == BREAK and t.event == TAKE_BREAK: name = "break"
+        elif t.new == IDLE: name = "end"
+        else: return
+
+        if self._sound_engine is None:
+            # Before the warmup queue: don't import QtMultimedia inside the transition
+            QTimer.singleShot(0, lambda: self.play_cue_now(name))
+        else:
+            self.play_cue_now(name)
+
+    def play_cue_now(self, name):
+        try:
+            self.sound_engine.play_sound(name)
+        except Exception as e:
+            print(f"Warning: could not play '{name}' cue: {e}")
+
+    def stop_audio(self):
+        # Nothing to stop if the engine was never built (and don't build it to find out)
+        if self._sound_engine is not None:
+            self._sound_engine.stop()
 
     # ---------- New Functions ----------
 
     def check_for_updates(self):
         print("Checking for updates...")
+        from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
         self.nam = QNetworkAccessManager(self)
         self.nam.finished.connect(self.handle_update_response)
         
@@ -707,6 +886,7 @@ class MainWindow(QMainWindow):
         self.nam.get(QNetworkRequest(QUrl(url_str)))
 
     def handle_update_response(self, reply):
+        from PySide6.QtNetwork import QNetworkReply
         if reply.error() == QNetworkReply.NoError:
             # Get version from GitHub
             remote_version = reply.readAll().data().decode('utf-8').strip()
@@ -743,152 +923,123 @@ class MainWindow(QMainWindow):
             release_url = f"https://github.com/designswithharshit/Ikiflow/releases/download/v{new_ver}/Ikiflow.exe"
             QDesktopServices.openUrl(QUrl(release_url))
 
+    def sync_countdown(self):
+        self.total_time = int(self.countdown.total)
+        self.time_left = self.countdown.remaining_seconds()
+
+    def schedule_tick(self):
+        # Wake just after the next second boundary of the deadline. With nothing
+        # on screen (tray only) the next meaningful event is the next minute of
+        # the tray tooltip -- the session/break end always falls on one too.
+        step = 1 if self.render.any_visible() else 60
+        self.timer.start(self.countdown.ms_to_next(step))
+
+    def on_visibility_changed(self):
+        # Window shown/hidden: catch up right away and re-arm at the new rate
+        if self.session.state in (FOCUS, BREAK):
+            self.timer.stop()
+            self.tick()
+
+    def update_tray_tooltip(self):
+        if self.session.state in (FOCUS, BREAK):
+            mins = math.ceil(self.time_left / 60)
+            label = "Break" if self.is_break else "Focus"
+            text = f"Ikiflow - {label}: {mins} min left"
+        elif self.is_paused:
+            text = "Ikiflow - Paused"
+        else:
+            text = "Ikiflow"
+        if text != self.tray_text:
+            self.tray_text = text
+            self.tray_icon.setToolTip(text)
+
     def tick(self):
-        self.time_left -= 1
-        self.update_display()
+        self.tick_meter.hit()
+        # 00:00 -> check-in, or end of break -> next focus block
+        self.session.poll()
 
-        # 2. THE FIX: Record exactly 1 second of data right now
-        if not self.is_break and self.time_left > 0:
-            self.track_current_app()
+        # Remaining time comes from the deadline, so a late wake can't slow us down
+        self.sync_countdown()
+        self.update_display()
+        self.update_tray_tooltip()
 
         if self.is_break:
             # Break Logic
-            self.overlay.update_state(self.time_left, self.total_time)
-            
-            # FIX 2: Auto-End Break -> Start Focus (Loop)
-            if self.time_left <= 0:
-                self.is_break = False
-                self.overlay.hide()
-                
-                # Reset Focus Timer
-                mins = self.input_focus.value()
-                self.total_time = mins * 60
-                self.time_left = self.total_time
-                
-                # Update Status
-                self.lbl_status.setText("Focus Mode Active")
-                self.lbl_status.setStyleSheet("color: #636E72; font-size: 16px; font-weight: 600; background: transparent; border: none;")
-                
-                # Show Floater
-                self.floater.show()
-                
-                # Restart Sound if "Noise On" was active
-                if self.btn_ambient.isChecked():
-                     self.sound_engine.play()
+            self.render.set("overlay", (self.time_left, self.total_time))
 
-        else:
+        elif self.session.state == FOCUS:
             # Focus Logic
             pct = 0
             if self.total_time > 0: 
                 pct = int(((self.total_time - self.time_left) / self.total_time) * 100)
             
-            self.floater.time_lbl.setText(self.format_time(self.time_left))
-            self.floater.bar.setValue(100 - pct)
-            
-            # End of Focus -> Show Check-In
-            if self.time_left <= 0:
-                self.timer.stop()
-                
-                # --- FIX: DO NOT SAVE HERE ---
-                # We just show the check-in. We wait for the user to 
-                # click "Start Break" or "Stop" before saving.
-                # -----------------------------
-                
-                self.floater.hide()
-                self.overlay.show_checkin()
-                self.sound_engine.stop()
-                
-                # Bring window to front so they see the check-in
-                self.setWindowState(Qt.WindowNoState)
-                self.show()
-                self.raise_()
-                self.activateWindow()
+            self.render.set("floater", (self.format_time(self.time_left), 100 - pct))
 
-    def extend_session(self, minutes):
-        self.overlay.hide()
-        self.is_break = False
-
-        # Add time
-        self.time_left += (minutes * 60)
-        self.total_time += (minutes * 60)
-
-        # FIX 1: Force show normal before starting to ensure it's not minimized
-        self.floater.setWindowState(Qt.WindowNoState)
-        self.floater.show()
-        self.floater.raise_()
-        self.floater.activateWindow()
+        # Keep waking once per displayed second until 00:00
+        if self.session.state in (FOCUS, BREAK) and not self.timer.isActive():
+            self.schedule_tick()
 
-        self.timer.start(1000)
-        self.floater.show()
+    def extend_session(self, minutes):
+        # Counts from now if we were already at 00:00; floater + overlay follow
+        self.session.extend(minutes * 60)
 
     def update_display(self):
-        self.lbl_big_timer.setText(self.format_time(self.time_left))
+        # Skipped while hidden to tray; catches up when the window is shown
+        self.render.set("timer", self.format_time(self.time_left))
 
     def format_time(self, seconds):
         mins, secs = divmod(seconds, 60)
         return f"{mins:02d}:{secs:02d}"
 
-def check_single_instance():
-    """Check if another instance is already running and handle it appropriately."""
-    socket = QLocalSocket()
-    socket.connectToServer("Ikiflow_SingleInstance")
-    
-    if socket.waitForConnected(500):  # Wait 500ms for connection
-        # Another instance is running, bring it to front
-        socket.write(b"SHOW_WINDOW")
-        socket.flush()
-        socket.waitForBytesWritten(1000)
-        socket.disconnectFromServer()
-        return False  # Don't start a new instance
-    
-    # No other instance running, start the server
-    server = QLocalServer()
-    server.listen("Ikiflow_SingleInstance")
-    return True, server
+# --- 6. STARTUP ---
 
-if __name__ == "__main__":
-    # Check for single instance
-    result = check_single_instance()
-    if not result:
-        sys.exit(0)  # Another instance is already running
-    
-    is_single_instance, local_server = result
-    
-    app = QApplication(sys.argv)
+def launch(command, argv, hook=None):
+    """
+    Everything between "nobody answered command" (section 0) and app.exec().
+    hook(phase) runs after each step; the startup bench stamps them.
+    Returns (app, window), or exits if another launch turned out to be the instance.
+    """
+    hook = hook or (lambda phase: None)
+    app = QApplication(argv)
     
-    # --- IMPORTANT: This allows QSettings to work globally ---
+    # --- Org/app names (used by the legacy QSettings import in Ikiflow_config) ---
     app.setOrganizationName("DesignWithHarshit")
     app.setApplicationName("Ikiflow")
     app.setQuitOnLastWindowClosed(False)
-    app.setStyleSheet(STYLESHEET)
-    
+    apply_theme(app) # Base sheet + object-name rules, parsed once
+    hook("qapplication")
+
+    # Later launches / the control client talk to us through this. Claim the
+    # name before the (slow) window build so a second launch can't slip in
+    command_server = CommandServer(parent=app)
+    if not command_server.listen():
+        if command_server.in_use:
+            # Another launch won the race since section 0: it's the instance
+            code = forward(command)
+            if code is not None:
+                sys.exit(code)
+        print(f"Warning: single-instance server failed: {command_server.server.errorString()}")
+    hook("server")
+
     window = MainWindow()
-    
-# --- CONTEXT AWARENESS LOGIC ---
-
-    # 3. Handle Single Instance Wake-up Calls
-    def handle_show_request(socket):
-        data = socket.readAll().data().decode()
-        if data == "SHOW_WINDOW" and window is not None:
-            window.showNormal() 
-            window.raise_()
-            window.activateWindow()
-        socket.disconnectFromServer()
-
-    def handle_new_connection():
-        socket = local_server.nextPendingConnection()
-        if socket:
-            socket.readyRead.connect(lambda: handle_show_request(socket))
-            
-    local_server.newConnection.connect(handle_new_connection)
+    window.command_server = command_server
+    command_server.handler = window.handle_command
+    hook("main_window_init")
 
-    # 4. STARTUP LOGIC
-    if "--silent" in sys.argv:
+    if "--silent" in argv:
         print("Ikiflow started in silent mode (System Tray)")
         # Do not show window
     else:
         window.showNormal()
         window.raise_()
         window.activateWindow()
-    
-    sys.exit(app.exec())
\ No newline at end of file
+
+    # First launch with --start N: nobody to forward to, run it ourselves
+    if command["cmd"] == "start":
+        QTimer.singleShot(0, lambda: window.handle_command(command))
+    return app, window
+
+if __name__ == "__main__":
+    # Nobody answered COMMAND (see section 0): we are the instance
+    app, window = launch(COMMAND, sys.argv)
+    sys.exit(app.exec())